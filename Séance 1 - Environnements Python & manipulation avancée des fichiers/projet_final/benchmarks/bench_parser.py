@@ -0,0 +1,118 @@
+"""
+Micro-benchmark de l'analyse des lignes de journal.
+
+Compare parse_log_entry (une ligne, un dict) avec LogParser (analyse ligne à
+ligne et par lots) et affiche le débit en lignes par seconde.
+
+Usage:
+    python benchmarks/bench_parser.py --lines 1000000 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.logs import LOG_LEVELS, LogParser, parse_log_entry  # noqa: E402
+
+
+def generate_lines(count: int, seed: int = 42) -> list[str]:
+    """
+    Génère des lignes de journal réalistes (dont ~2 % de lignes invalides).
+    
+    Args:
+        count: Nombre de lignes
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Liste de lignes
+    """
+    rng = random.Random(seed)
+    levels = ['INFO'] * 6 + ['DEBUG'] * 8 + ['WARNING'] * 3 + ['ERROR', 'CRITICAL']
+    messages = [
+        "Connexion utilisateur id={}",
+        "Requête GET /api/v1/items/{} traitée en 12 ms",
+        "Cache miss pour la clé session:{}",
+        "Échec d'écriture sur le disque (tentative {})",
+    ]
+    lines = []
+    for i in range(count):
+        if rng.random() < 0.02:
+            lines.append(f"    at module.function(file.py:{i})")
+            continue
+        lines.append(
+            f"[2025-09-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}] "
+            f"{rng.choice(levels)}: {rng.choice(messages).format(i)}"
+        )
+    return lines
+
+
+def legacy_classify(lines: list[str]) -> list[str]:
+    """Classement ligne à ligne avec parse_log_entry (référence)."""
+    results = []
+    for line in lines:
+        parsed = parse_log_entry(line)
+        if parsed and parsed['level'] in LOG_LEVELS:
+            results.append(parsed['level'])
+        else:
+            results.append('OTHER')
+    return results
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Retourne le meilleur temps d'exécution (en secondes) sur `repeat` essais."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de l'analyse des logs")
+    parser.add_argument('--lines', type=int, default=500_000, help="Nombre de lignes")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'essais")
+    args = parser.parse_args()
+    
+    lines = generate_lines(args.lines)
+    raw_lines = [line.encode('utf-8') for line in lines]
+    log_parser = LogParser()
+    
+    # Vérification préalable : les résultats doivent être identiques
+    legacy = [parse_log_entry(line) for line in lines]
+    fast = log_parser.parse_many(lines)
+    assert all(
+        (a is None and b is None) or (a is not None and b is not None and tuple(a.values()) == b)
+        for a, b in zip(legacy, fast)
+    ), "LogParser.parse_many diverge de parse_log_entry"
+    assert legacy_classify(lines) == log_parser.classify_many(lines)
+    assert log_parser.classify_many(lines) == log_parser.classify_many_bytes(raw_lines)
+    
+    cases: list[tuple[str, Callable[[], object]]] = [
+        ("parse_log_entry (dict par ligne)", lambda: [parse_log_entry(line) for line in lines]),
+        ("LogParser.parse (ligne à ligne)", lambda: [log_parser.parse(line) for line in lines]),
+        ("LogParser.parse_many (lot)", lambda: log_parser.parse_many(lines)),
+        ("classement via parse_log_entry", lambda: legacy_classify(lines)),
+        ("LogParser.level_of (ligne à ligne)", lambda: [log_parser.level_of(line) for line in lines]),
+        ("LogParser.classify_many (lot)", lambda: log_parser.classify_many(lines)),
+        ("LogParser.classify_many_bytes (octets)", lambda: log_parser.classify_many_bytes(raw_lines)),
+    ]
+    
+    print(f"📏 {len(lines):,} lignes, meilleur de {args.repeat} essai(s)")
+    reference = None
+    for name, func in cases:
+        elapsed = best_time(func, args.repeat)
+        rate = len(lines) / elapsed
+        if reference is None or name.startswith("classement"):
+            reference = rate
+        print(f"   {name:<38} {rate:>14,.0f} lignes/s  (x{rate / reference:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,23 @@ Point d'entrée principal du projet.
 """
 
 import argparse
+import cProfile
 import sys
 from pathlib import Path
-from typing import Optional
-import re
+from typing import Collection, Iterator, NamedTuple, Optional
 import pandas as pd
 
 from utils.io import (
     read_csv,
+    infer_csv_dtypes,
+    iter_csv_chunks,
     write_csv,
-    read_log_file,
+    TableWriter,
+    TABLE_FORMATS,
+    COMPRESSION_CHOICES,
+    BufferedLineWriters,
+    is_compressed,
+    prefetch_line_blocks,
     write_text_file,
     get_all_log_files,
 )
@@ -21,61 +28,169 @@ from utils.paths import (
     validate_input_path,
     get_output_dir,
 )
+from utils.logs import (
+    DECODE_ERROR_POLICIES,
+    LOG_LEVELS,
+    iter_records_from_blocks,
+)
+from utils.parallel import ChunkResult, classify_logs_parallel
+from utils.checkpoint import CheckpointStore, complete_lines_end
+from utils.dedup import FingerprintIndex, row_fingerprints
+from utils.schema import SCHEMAS, CsvSchema, resolve_schema
+from utils.stats import StreamingStats
+from utils.log_index import LogIndex, build_log_index
+from utils.partitions import PARTITION_GRANULARITIES, partition_key
+from utils.follow import FollowOptions, follow_logs
+from utils.console import echo, set_quiet
+from utils.metrics import disable_metrics, enable_metrics, stage
 
 
-def parse_log_entry(log_line: str) -> dict[str, str] | None:
-    """
-    Parse une ligne de journal au format [TIMESTAMP] LEVEL: MESSAGE.
+# Registre des points de reprise du mode incrémental (dans le répertoire de sortie)
+CHECKPOINT_FILENAME = ".organize_logs.checkpoints.json"
+
+# Nombre maximal de partitions ouvertes simultanément en écriture
+PARTITION_MAX_OPEN = 128
+
+
+class ReaderOptions(NamedTuple):
+    """Options de lecture des journaux communes aux variantes de organize_logs."""
+    keep_levels: Optional[Collection[str]] = None
+    encoding_errors: str = 'replace'
+    io_threads: int = 4
     
-    Args:
-        log_line: Ligne du journal
+    def iter_files(
+        self,
+        log_files: list[Path],
+        ranges: dict[Path, tuple[int, int]] | None = None,
+    ) -> Iterator[tuple[Path, Iterator[tuple[str, str]]]]:
+        """
+        Lignes (niveau, texte) conservées de chaque fichier, dans l'ordre.
+        
+        Les fichiers sont lus et décompressés en avance dans io_threads threads.
+        """
+        sources = [
+            (log_file, *(ranges[log_file] if ranges is not None else (0, None)))
+            for log_file in log_files
+        ]
+        for log_file, blocks in prefetch_line_blocks(sources, self.io_threads):
+            yield log_file, iter_records_from_blocks(
+                blocks, keep=self.keep_levels, errors=self.encoding_errors,
+                source=str(log_file),
+            )
+
+
+class OutputOptions(NamedTuple):
+    """Format d'export des données CSV nettoyées."""
+    fmt: str = 'csv'
+    compression: Optional[str] = None
+    row_group_size: Optional[int] = None
     
-    Returns:
-        Dictionnaire avec 'timestamp', 'level', 'message' ou None si format invalide
-    """
-    # Pattern: [YYYY-MM-DD HH:MM:SS] LEVEL: MESSAGE
-    pattern = r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]\s+(\w+):\s+(.*)'
-    match = re.match(pattern, log_line)
+    def path_in(self, output_dir: Path) -> Path:
+        """Chemin du fichier nettoyé (data_cleaned.csv, .parquet ou .feather)."""
+        return output_dir / f"data_cleaned{TABLE_FORMATS[self.fmt]}"
     
-    if match:
-        return {
-            'timestamp': match.group(1),
-            'level': match.group(2),
-            'message': match.group(3),
-        }
-    return None
+    def writer(self, output_file: Path) -> TableWriter:
+        """Écrivain par blocs dans ce format."""
+        return TableWriter(output_file, self.fmt, self.compression, self.row_group_size)
 
 
-def clean_csv_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_csv_data(
+    df: pd.DataFrame,
+    index: Optional[FingerprintIndex] = None,
+) -> pd.DataFrame:
     """
     Nettoie les données CSV : suppression des doublons, valeurs nulles, etc.
     
+    Les doublons sont détectés par empreinte de ligne (64 bits) : avec un
+    index persistant, les lignes déjà vues lors d'exécutions précédentes
+    sont également supprimées.
+    
     Args:
         df: DataFrame à nettoyer
+        index: Empreintes des lignes déjà vues (complété au passage) ; par
+            défaut, seuls les doublons internes à df sont supprimés
     
     Returns:
         DataFrame nettoyé
     """
-    print("  → Suppression des lignes vides...")
-    df = df.dropna(how='all')
+    with stage('clean_csv_data') as s:
+        s.add_items(len(df))
+        
+        echo("  → Suppression des lignes vides...")
+        df = df.dropna(how='all')
+        
+        echo("  → Suppression des doublons...")
+        if index is None:
+            index = FingerprintIndex()
+        df = df[index.filter_new(row_fingerprints(df))]
+        
+        echo("  → Réinitialisation de l'index...")
+        df = df.reset_index(drop=True)
+    
+    return df
+
+
+def clean_csv_chunk(df: pd.DataFrame, index: FingerprintIndex) -> pd.DataFrame:
+    """
+    Nettoie un bloc de CSV comme clean_csv_data, en mode par blocs.
     
-    print("  → Suppression des doublons...")
-    df = df.drop_duplicates()
+    Les doublons sont recherchés parmi les empreintes des blocs précédents
+    (index, complété au passage) : seule la première occurrence est gardée.
     
-    print("  → Réinitialisation de l'index...")
-    df = df.reset_index(drop=True)
+    Args:
+        df: Bloc à nettoyer
+        index: Empreintes des lignes déjà vues
     
-    return df
+    Returns:
+        Bloc nettoyé
+    """
+    with stage('clean_csv_chunk') as s:
+        s.add_items(len(df))
+        df = df.dropna(how='all')
+        return df[index.filter_new(row_fingerprints(df))]
 
 
-def organize_logs(logs_dir: Path | str, output_dir: Path) -> None:
+def organize_logs(
+    logs_dir: Path | str,
+    output_dir: Path,
+    stream: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+    keep_levels: Optional[Collection[str]] = None,
+    encoding_errors: str = 'replace',
+    compression: Optional[str] = None,
+    io_threads: int = 4,
+    partition: Optional[str] = None,
+) -> None:
     """
     Réorganise les fichiers journaux par niveau (INFO, WARNING, ERROR, DEBUG).
     
     Args:
         logs_dir: Répertoire contenant les logs
         output_dir: Répertoire de sortie
+        stream: Si True, chaque ligne est écrite directement dans le fichier
+            de son niveau (mémoire bornée) au lieu d'être accumulée ;
+            les fichiers produits sont identiques octet pour octet
+        workers: Nombre de processus ; au-delà de 1, les fichiers (et les
+            gros fichiers, par tranches) sont classés en parallèle puis
+            fusionnés dans l'ordre d'entrée
+        incremental: Si True, seuls les octets ajoutés depuis l'exécution
+            précédente sont lus (points de reprise dans CHECKPOINT_FILENAME)
+            et les logs organisés existants sont complétés
+        keep_levels: Niveaux à conserver (None = tous) ; les autres lignes
+            sont classées sur les octets bruts sans jamais être décodées
+        encoding_errors: Politique pour les octets UTF-8 invalides
+            (voir DECODE_ERROR_POLICIES) ; seule la ligne concernée est touchée
+        compression: 'gz', 'bz2' ou 'xz' pour compresser les logs organisés
+            (info.log.gz...) ; None pour du texte brut
+        io_threads: Nombre de fichiers lus et décompressés simultanément
+        partition: 'day' ou 'hour' pour ranger les lignes par niveau et par
+            tranche de temps (level=ERROR/date=2024-11-03/hour=14.log, voir
+            utils.partitions) au lieu d'un fichier par niveau
     """
+    if partition is not None and partition not in PARTITION_GRANULARITIES:
+        raise ValueError(f"Partitionnement inconnu : {partition}")
+    
     logs_path = Path(logs_dir)
     validate_input_path(logs_path, must_exist=True)
     
@@ -83,98 +198,602 @@ def organize_logs(logs_dir: Path | str, output_dir: Path) -> None:
     log_files = get_all_log_files(logs_path)
     
     if not log_files:
-        print(f"⚠️  Aucun fichier .log trouvé dans {logs_path}")
+        echo(f"⚠️  Aucun fichier .log trouvé dans {logs_path}")
         return
     
-    # Dictionnaire pour stocker les logs par niveau
-    logs_by_level: dict[str, list[str]] = {
-        'INFO': [],
-        'DEBUG': [],
-        'WARNING': [],
-        'ERROR': [],
-        'OTHER': [],
-    }
+    echo(f"📋 Traitement de {len(log_files)} fichier(s) journal...")
+    logs_output_dir = output_dir / "logs_organized"
     
-    print(f"📋 Traitement de {len(log_files)} fichier(s) journal...")
+    # Plages d'octets à lire par fichier (None = fichiers entiers)
+    ranges: dict[Path, tuple[int, int]] | None = None
+    store: CheckpointStore | None = None
+    append = False
+    if incremental:
+        store = CheckpointStore(output_dir / CHECKPOINT_FILENAME)
+        ranges = _plan_incremental_ranges(log_files, store)
+        # Premier passage incrémental (aucun point de reprise) : les logs
+        # organisés d'une exécution précédente sont réécrits, pas complétés
+        append = len(store) > 0
     
-    # Traiter chaque fichier
+    reader = ReaderOptions(keep_levels, encoding_errors, io_threads)
+    with stage('organize_logs') as s:
+        size_before = _directory_size(logs_output_dir) if s.enabled else 0
+        if partition:
+            counts = _organize_logs_partitioned(
+                log_files, logs_output_dir, partition, workers, ranges, reader, compression, append,
+            )
+        elif workers > 1:
+            counts = _organize_logs_parallel(
+                log_files, logs_output_dir, workers, stream, ranges, reader, compression, append,
+            )
+        elif stream:
+            counts = _organize_logs_streaming(log_files, logs_output_dir, ranges, reader, compression, append)
+        else:
+            counts = _organize_logs_in_memory(log_files, logs_output_dir, ranges, reader, compression, append)
+        s.add_items(sum(counts.values()))
+        if s.enabled:
+            s.add_bytes_read(_bytes_to_read(log_files, ranges))
+            s.add_bytes_written(_directory_size(logs_output_dir) - size_before)
+    
+    if store is not None and ranges is not None:
+        for log_file, (_, end) in ranges.items():
+            store.update(log_file, end)
+        store.save()
+
+
+def _plan_incremental_ranges(
+    log_files: list[Path],
+    store: CheckpointStore,
+) -> dict[Path, tuple[int, int]]:
+    """
+    Calcule, pour chaque fichier, la plage d'octets ajoutée depuis le dernier passage.
+    
+    La fin de plage s'arrête à la dernière ligne complète : une ligne en
+    cours d'écriture sera lue au passage suivant. Un fichier compressé est
+    traité d'un bloc : relu en entier s'il a changé, ignoré sinon.
+    
+    Args:
+        log_files: Fichiers journaux
+        store: Registre des points de reprise
+    
+    Returns:
+        Dictionnaire fichier → (début, fin)
+    """
+    ranges = {}
     for log_file in log_files:
-        print(f"   Lecture : {log_file.name}")
-        lines = read_log_file(log_file)
-        
-        for line in lines:
-            parsed = parse_log_entry(line)
-            if parsed:
-                level = parsed['level']
-                if level in logs_by_level:
-                    logs_by_level[level].append(line)
-                else:
-                    logs_by_level['OTHER'].append(line)
-            else:
-                logs_by_level['OTHER'].append(line)
+        start = store.resume_offset(log_file)
+        size = log_file.stat().st_size
+        if is_compressed(log_file):
+            ranges[log_file] = (size, size) if start == size else (0, size)
+            continue
+        end = complete_lines_end(log_file, size)
+        ranges[log_file] = (start, max(start, end))
+    return ranges
+
+
+def _level_output_file(
+    logs_output_dir: Path,
+    level: str,
+    compression: Optional[str] = None,
+) -> Path:
+    """Chemin du fichier de sortie d'un niveau (info.log, info.log.gz...)."""
+    suffix = f".{compression}" if compression else ""
+    return logs_output_dir / f"{level.lower()}.log{suffix}"
+
+
+def _print_reading(log_file: Path, ranges: dict[Path, tuple[int, int]] | None) -> None:
+    """Affiche le fichier en cours de lecture (et la plage lue en mode incrémental)."""
+    if ranges is None:
+        echo(f"   Lecture : {log_file.name}")
+    else:
+        start, end = ranges[log_file]
+        echo(f"   Lecture : {log_file.name} (+{end - start} octet(s))")
+
+
+def _organize_logs_in_memory(
+    log_files: list[Path],
+    logs_output_dir: Path,
+    ranges: dict[Path, tuple[int, int]] | None = None,
+    reader: ReaderOptions = ReaderOptions(),
+    compression: Optional[str] = None,
+    append: bool = False,
+) -> dict[str, int]:
+    """
+    Variante de organize_logs qui accumule les lignes avant de les écrire.
+    
+    Args:
+        log_files: Fichiers journaux à traiter, dans l'ordre
+        logs_output_dir: Répertoire des logs organisés
+        ranges: Plages d'octets à lire (mode incrémental) ou None
+        reader: Options de lecture (niveaux conservés, politique de décodage)
+        compression: Compression des fichiers produits ('gz', 'bz2', 'xz' ou None)
+        append: Si True, les logs organisés existants sont complétés au lieu
+            d'être réécrits
+    """
+    # Dictionnaire pour stocker les logs par niveau
+    logs_by_level: dict[str, list[str]] = {level: [] for level in LOG_LEVELS}
+    
+    # Traiter chaque fichier
+    for log_file, records in reader.iter_files(log_files, ranges):
+        _print_reading(log_file, ranges)
+        for level, line in records:
+            logs_by_level[level].append(line)
     
     # Écrire les logs organisés
-    print("✍️  Écriture des logs organisés...")
-    logs_output_dir = output_dir / "logs_organized"
+    echo("✍️  Écriture des logs organisés...")
     logs_output_dir.mkdir(parents=True, exist_ok=True)
     
     for level, entries in logs_by_level.items():
         if entries:
-            output_file = logs_output_dir / f"{level.lower()}.log"
+            output_file = _level_output_file(logs_output_dir, level, compression)
             content = '\n'.join(entries) + '\n'
-            write_text_file(content, output_file, append=False)
-            print(f"   → {level}.log : {len(entries)} entrée(s)")
+            write_text_file(content, output_file, append=append)
+            echo(f"   → {level}.log : {len(entries)} entrée(s)")
+    
+    return {level: len(entries) for level, entries in logs_by_level.items()}
+
+
+def _organize_logs_streaming(
+    log_files: list[Path],
+    logs_output_dir: Path,
+    ranges: dict[Path, tuple[int, int]] | None = None,
+    reader: ReaderOptions = ReaderOptions(),
+    compression: Optional[str] = None,
+    append: bool = False,
+) -> dict[str, int]:
+    """
+    Variante de organize_logs à mémoire bornée.
+    
+    Les lignes sont lues une à une et routées vers un fichier tamponné par
+    niveau : seuls les tampons d'écriture restent en mémoire, quelle que soit
+    la taille des journaux.
+    
+    Args:
+        log_files: Fichiers journaux à traiter, dans l'ordre
+        logs_output_dir: Répertoire des logs organisés
+        ranges: Plages d'octets à lire (mode incrémental) ou None
+        reader: Options de lecture (niveaux conservés, politique de décodage)
+        compression: Compression des fichiers produits ('gz', 'bz2', 'xz' ou None)
+        append: Si True, les logs organisés existants sont complétés au lieu
+            d'être réécrits
+    """
+    echo("✍️  Écriture des logs organisés (streaming)...")
+    
+    writers = BufferedLineWriters(
+        logs_output_dir, append=append, compression=compression,
+    )
+    with writers:
+        for log_file, records in reader.iter_files(log_files, ranges):
+            _print_reading(log_file, ranges)
+            for level, line in records:
+                writers.write(level.lower(), line)
+    
+    counts = {level: writers.counts.get(level.lower(), 0) for level in LOG_LEVELS}
+    for level in LOG_LEVELS:
+        if counts[level]:
+            echo(f"   → {level}.log : {counts[level]} entrée(s)")
+    return counts
+
+
+def _organize_logs_parallel(
+    log_files: list[Path],
+    logs_output_dir: Path,
+    workers: int,
+    stream: bool,
+    ranges: dict[Path, tuple[int, int]] | None = None,
+    reader: ReaderOptions = ReaderOptions(),
+    compression: Optional[str] = None,
+    append: bool = False,
+) -> dict[str, int]:
+    """
+    Variante de organize_logs répartie sur un pool de processus.
+    
+    Chaque processus classe une tranche de fichier ; les blocs obtenus sont
+    fusionnés dans l'ordre des fichiers et des tranches, ce qui garantit la
+    même sortie que le traitement séquentiel.
+    
+    Args:
+        log_files: Fichiers journaux à traiter, dans l'ordre
+        logs_output_dir: Répertoire des logs organisés
+        workers: Nombre de processus
+        stream: Si True, les blocs sont écrits au fil de l'eau
+        ranges: Plages d'octets à lire (mode incrémental) ou None
+        reader: Options de lecture (niveaux conservés, politique de décodage)
+        compression: Compression des fichiers produits ('gz', 'bz2', 'xz' ou None)
+        append: Si True, les logs organisés existants sont complétés au lieu
+            d'être réécrits
+    """
+    echo(f"⚙️  Classement parallèle sur {workers} processus...")
+    results = classify_logs_parallel(
+        log_files, workers, ranges=ranges,
+        keep=reader.keep_levels, errors=reader.encoding_errors,
+    )
+    def announce(results: Iterator[ChunkResult]) -> Iterator[ChunkResult]:
+        current = None
+        for result in results:
+            if result.chunk.path != current:
+                current = result.chunk.path
+                _print_reading(current, ranges)
+            yield result
+    
+    if stream:
+        writers = BufferedLineWriters(logs_output_dir, append=append, compression=compression)
+        with writers:
+            for result in announce(results):
+                for level, block in result.blocks.items():
+                    writers.write_block(level.lower(), block, result.counts[level])
+        counts = {level: writers.counts.get(level.lower(), 0) for level in LOG_LEVELS}
+    else:
+        blocks_by_level: dict[str, list[str]] = {level: [] for level in LOG_LEVELS}
+        counts = dict.fromkeys(LOG_LEVELS, 0)
+        for result in announce(results):
+            for level, block in result.blocks.items():
+                blocks_by_level[level].append(block)
+                counts[level] += result.counts[level]
+        
+        echo("✍️  Écriture des logs organisés...")
+        logs_output_dir.mkdir(parents=True, exist_ok=True)
+        for level, blocks in blocks_by_level.items():
+            if blocks:
+                output_file = _level_output_file(logs_output_dir, level, compression)
+                write_text_file(''.join(blocks), output_file, append=append)
+    
+    for level in LOG_LEVELS:
+        if counts[level]:
+            echo(f"   → {level}.log : {counts[level]} entrée(s)")
+    return counts
+
+
+def _organize_logs_partitioned(
+    log_files: list[Path],
+    logs_output_dir: Path,
+    partition: str,
+    workers: int = 1,
+    ranges: dict[Path, tuple[int, int]] | None = None,
+    reader: ReaderOptions = ReaderOptions(),
+    compression: Optional[str] = None,
+    append: bool = False,
+) -> dict[str, int]:
+    """
+    Variante de organize_logs qui range les lignes par niveau et par tranche de temps.
+    
+    Les lignes sont routées au fil de l'eau vers le fichier de leur
+    partition (au plus PARTITION_MAX_OPEN fichiers ouverts) ; dans chaque
+    partition, l'ordre des lignes est celui des fichiers d'entrée.
+    
+    Args:
+        log_files: Fichiers journaux à traiter, dans l'ordre
+        logs_output_dir: Répertoire des logs organisés
+        partition: Granularité ('day' ou 'hour')
+        workers: Nombre de processus de classement (1 = séquentiel)
+        ranges: Plages d'octets à lire (mode incrémental) ou None
+        reader: Options de lecture (niveaux conservés, politique de décodage)
+        compression: Compression des fichiers produits ('gz', 'bz2', 'xz' ou None)
+        append: Si True, les logs organisés existants sont complétés au lieu
+            d'être réécrits
+    """
+    granularity = 'heure' if partition == 'hour' else 'jour'
+    echo(f"✍️  Écriture des logs organisés (partitions par {granularity})...")
+    
+    writers = BufferedLineWriters(
+        logs_output_dir, append=append, compression=compression,
+        max_open=PARTITION_MAX_OPEN,
+    )
+    with writers:
+        for level, line in _iter_classified_lines(log_files, workers, ranges, reader):
+            writers.write(partition_key(level, line, partition), line)
+    
+    counts = dict.fromkeys(LOG_LEVELS, 0)
+    partitions = dict.fromkeys(LOG_LEVELS, 0)
+    for key, count in writers.counts.items():
+        level = key.split('/', 1)[0][len('level='):]
+        counts[level] += count
+        partitions[level] += 1
+    for level in LOG_LEVELS:
+        if counts[level]:
+            echo(f"   → level={level} : {counts[level]} entrée(s) dans {partitions[level]} partition(s)")
+    return counts
+
+
+def _iter_classified_lines(
+    log_files: list[Path],
+    workers: int,
+    ranges: dict[Path, tuple[int, int]] | None,
+    reader: ReaderOptions,
+) -> Iterator[tuple[str, str]]:
+    """Lignes (niveau, texte) dans l'ordre des fichiers, classées sur place ou par un pool de processus."""
+    if workers <= 1:
+        for log_file, records in reader.iter_files(log_files, ranges):
+            _print_reading(log_file, ranges)
+            yield from records
+        return
+    
+    echo(f"⚙️  Classement parallèle sur {workers} processus...")
+    results = classify_logs_parallel(
+        log_files, workers, ranges=ranges,
+        keep=reader.keep_levels, errors=reader.encoding_errors,
+    )
+    current = None
+    for result in results:
+        if result.chunk.path != current:
+            current = result.chunk.path
+            _print_reading(current, ranges)
+        # Dans une tranche, les lignes d'un niveau restent dans leur ordre
+        for level, block in result.blocks.items():
+            for line in block.split('\n')[:-1]:
+                yield level, line
+
+
+def follow_organized_logs(
+    logs_dir: Path | str,
+    output_dir: Path,
+    options: FollowOptions = FollowOptions(),
+    keep_levels: Optional[Collection[str]] = None,
+    encoding_errors: str = 'replace',
+    compression: Optional[str] = None,
+    partition: Optional[str] = None,
+) -> None:
+    """
+    Suit les journaux et complète les logs organisés au fil de l'eau (--follow).
+    
+    La lecture reprend aux points de reprise du mode incrémental et s'arrête
+    proprement sur Ctrl+C ou SIGTERM (voir utils.follow).
+    
+    Args:
+        logs_dir: Répertoire des journaux bruts
+        output_dir: Répertoire de sortie (logs_organized et points de reprise)
+        options: Latence maximale, taille des lots, intervalle de scrutation
+        keep_levels: Niveaux à conserver (None = tous)
+        encoding_errors: Politique pour les octets UTF-8 invalides
+        compression: Compression des logs organisés ('gz', 'bz2', 'xz' ou None)
+        partition: Partitionnement des logs organisés ('day', 'hour' ou None)
+    """
+    echo(
+        f"👀 Suivi de {logs_dir} (latence max {options.max_latency} s, "
+        f"lots de {options.batch_size} lignes) — Ctrl+C pour arrêter"
+    )
+    with stage('follow_logs') as s:
+        counts = follow_logs(
+            logs_dir, output_dir / "logs_organized", output_dir / CHECKPOINT_FILENAME, options,
+            keep_levels=keep_levels, encoding_errors=encoding_errors,
+            compression=compression, partition=partition,
+        )
+        s.add_items(sum(counts.values()))
+    
+    echo("⏹️  Suivi arrêté")
+    for level in LOG_LEVELS:
+        if counts[level]:
+            echo(f"   → {level} : {counts[level]} entrée(s) ajoutée(s)")
+
+
+def index_logs(output_dir: Path) -> None:
+    """
+    Construit l'index inversé des logs organisés, utilisé par la commande query.
+    
+    Args:
+        output_dir: Répertoire de sortie (contenant logs_organized)
+    """
+    logs_output_dir = output_dir / "logs_organized"
+    if not logs_output_dir.is_dir():
+        echo(f"⚠️  Aucun log organisé à indexer dans {output_dir}")
+        return
+    
+    echo("🔎 Indexation des logs organisés...")
+    stats = build_log_index(logs_output_dir)
+    echo(
+        f"   → {stats['lines']} ligne(s), {stats['terms']} mot(s) distinct(s), "
+        f"index de {stats['bytes']} octet(s)"
+    )
+
+
+def _bytes_to_read(log_files: list[Path], ranges: dict[Path, tuple[int, int]] | None) -> int:
+    """Nombre d'octets (sur disque) lus par organize_logs."""
+    if ranges is not None:
+        return sum(max(0, end - start) for start, end in ranges.values())
+    return sum(log_file.stat().st_size for log_file in log_files)
 
 
-def process_csv(csv_path: Path | str, output_dir: Path) -> None:
+def _directory_size(directory: Path) -> int:
+    """Taille totale des fichiers d'un répertoire et de ses sous-répertoires (0 s'il n'existe pas)."""
+    if not directory.is_dir():
+        return 0
+    return sum(path.stat().st_size for path in directory.rglob('*') if path.is_file())
+
+
+def process_csv(
+    csv_path: Path | str,
+    output_dir: Path,
+    chunksize: Optional[int] = None,
+    dedup_index: Optional[Path | str] = None,
+    schema: Optional[CsvSchema] = None,
+    output_format: str = 'csv',
+    table_compression: Optional[str] = None,
+    row_group_size: Optional[int] = None,
+) -> None:
     """
     Traite le fichier CSV : nettoyage et export.
     
     Args:
         csv_path: Chemin du fichier CSV
         output_dir: Répertoire de sortie
+        chunksize: Si renseigné, traite le CSV par blocs de chunksize lignes
+            (mémoire bornée, même résultat)
+        dedup_index: Fichier .npy des empreintes de lignes déjà exportées ;
+            les lignes vues lors d'exécutions précédentes sont supprimées
+        schema: Schéma des colonnes : le CSV est typé dès la lecture
+            (entiers, décimaux, dates, booléens, catégories)
+        output_format: Format des données nettoyées ('csv', 'parquet' ou
+            'feather') ; le fichier est data_cleaned.<format>
+        table_compression: Codec de compression Parquet/Feather
+        row_group_size: Nombre de lignes par groupe de lignes Parquet ou par lot Feather
     """
     csv_file = validate_input_path(csv_path, must_exist=True)
+    index = FingerprintIndex(dedup_index)
+    
+    echo("📊 Traitement du CSV...")
+    if schema is not None:
+        echo(f"   Schéma : {schema.name}")
     
-    print("📊 Traitement du CSV...")
+    output = OutputOptions(output_format, table_compression, row_group_size)
+    with stage('process_csv') as s:
+        if chunksize:
+            raw_count = _process_csv_chunked(csv_file, output_dir, chunksize, index, schema, output)
+        else:
+            raw_count = _process_csv_in_memory(csv_file, output_dir, index, schema, output)
+        
+        if dedup_index is not None:
+            index.save()
+            echo(f"   → Index de dédoublonnage : {len(index)} empreinte(s)")
+        
+        s.add_items(raw_count)
+        if s.enabled:
+            s.add_bytes_read(csv_file.stat().st_size)
+            s.add_bytes_written(
+                output.path_in(output_dir).stat().st_size
+                + (output_dir / "data_stats.txt").stat().st_size
+            )
+
+
+def _process_csv_in_memory(
+    csv_file: Path,
+    output_dir: Path,
+    index: FingerprintIndex,
+    schema: Optional[CsvSchema],
+    output: OutputOptions,
+) -> int:
+    """
+    Variante en mémoire de process_csv : tout le CSV est chargé d'un coup.
     
+    Returns:
+        Nombre de lignes lues
+    """
     # Lire le CSV
-    print(f"   Lecture : {csv_file.name}")
-    df = read_csv(csv_file)
-    print(f"   Données initiales : {len(df)} lignes, {len(df.columns)} colonnes")
+    echo(f"   Lecture : {csv_file.name}")
+    df = read_csv(csv_file, schema)
+    echo(f"   Données initiales : {len(df)} lignes, {len(df.columns)} colonnes")
     
     # Nettoyer
-    print("🧹 Nettoyage des données...")
-    df_clean = clean_csv_data(df)
-    print(f"   Après nettoyage : {len(df_clean)} lignes")
+    echo("🧹 Nettoyage des données...")
+    df_clean = clean_csv_data(df, index)
+    echo(f"   Après nettoyage : {len(df_clean)} lignes")
     
     # Exporter
-    print("💾 Export des données...")
-    output_file = output_dir / "data_cleaned.csv"
-    write_csv(df_clean, output_file, index=False)
-    print(f"   → Exporté vers : {output_file.name}")
+    echo("💾 Export des données...")
+    output_file = output.path_in(output_dir)
+    write_csv(
+        df_clean, output_file, index=False,
+        fmt=output.fmt, compression=output.compression, row_group_size=output.row_group_size,
+    )
+    echo(f"   → Exporté vers : {output_file.name}")
     
     # Générer des statistiques
-    stats_file = output_dir / "data_stats.txt"
+    stats = StreamingStats()
+    stats.update(df_clean)
+    _write_csv_stats(
+        csv_file, output_dir / "data_stats.txt",
+        len(df), len(df_clean), list(df_clean.columns), stats.describe(),
+    )
+    return len(df)
+
+
+def _process_csv_chunked(
+    csv_file: Path,
+    output_dir: Path,
+    chunksize: int,
+    index: FingerprintIndex,
+    schema: Optional[CsvSchema],
+    output: OutputOptions,
+) -> int:
+    """
+    Variante par blocs de process_csv : lecture, nettoyage et export bloc par bloc.
+    
+    Sans schéma, un premier passage fixe le type de chaque colonne pour que
+    tous les blocs soient lus (et réécrits) exactement comme en une seule
+    lecture ; avec un schéma, les types sont déjà connus.
+    
+    Returns:
+        Nombre de lignes lues
+    """
+    echo(f"   Lecture par blocs de {chunksize} lignes : {csv_file.name}")
+    if schema is None:
+        chunks = iter_csv_chunks(csv_file, chunksize, dtype=infer_csv_dtypes(csv_file, chunksize))
+    else:
+        chunks = iter_csv_chunks(csv_file, chunksize, schema=schema)
+    
+    echo("🧹 Nettoyage et export des données...")
+    output_file = output.path_in(output_dir)
+    raw_count = clean_count = 0
+    columns: list[str] = []
+    stats = StreamingStats()
+    
+    with output.writer(output_file) as writer:
+        for chunk in chunks:
+            chunk_clean = clean_csv_chunk(chunk, index)
+            writer.write(chunk_clean)
+            stats.update(chunk_clean)
+            raw_count += len(chunk)
+            clean_count += len(chunk_clean)
+            columns = list(chunk_clean.columns)
+    
+    echo(f"   Données initiales : {raw_count} lignes, {len(columns)} colonnes")
+    echo(f"   Après nettoyage : {clean_count} lignes")
+    echo(f"   → Exporté vers : {output_file.name}")
+    
+    _write_csv_stats(
+        csv_file, output_dir / "data_stats.txt",
+        raw_count, clean_count, columns, stats.describe(),
+    )
+    return raw_count
+
+
+def _write_csv_stats(
+    csv_file: Path,
+    stats_file: Path,
+    raw_count: int,
+    clean_count: int,
+    columns: list[str],
+    summary: pd.DataFrame,
+) -> None:
+    """Écrit le fichier de statistiques du traitement CSV."""
     stats_content = f"""=== Statistiques du traitement ===
 
 Fichier source: {csv_file.name}
-Nombre de lignes (brut): {len(df)}
-Nombre de lignes (nettoyé): {len(df_clean)}
-Nombre de colonnes: {len(df_clean.columns)}
-Colonnes: {', '.join(df_clean.columns)}
+Nombre de lignes (brut): {raw_count}
+Nombre de lignes (nettoyé): {clean_count}
+Nombre de colonnes: {len(columns)}
+Colonnes: {', '.join(columns)}
 
 Résumé numérique:
-{df_clean.describe().to_string()}
+{summary.to_string()}
 """
     write_text_file(stats_content, stats_file)
-    print(f"   → Statistiques : {stats_file.name}")
+    echo(f"   → Statistiques : {stats_file.name}")
 
 
 def main(
     input_csv: str,
     logs_dir: str,
     output_dir: str,
+    stream: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+    keep_levels: Optional[Collection[str]] = None,
+    encoding_errors: str = 'replace',
+    compression: Optional[str] = None,
+    io_threads: int = 4,
+    partition: Optional[str] = None,
+    follow: bool = False,
+    follow_options: FollowOptions = FollowOptions(),
+    chunksize: Optional[int] = None,
+    dedup_index: Optional[str] = None,
+    schema: str = 'auto',
+    output_format: str = 'csv',
+    table_compression: Optional[str] = None,
+    row_group_size: Optional[int] = None,
+    index: bool = False,
+    metrics_out: Optional[str] = None,
+    profile_out: Optional[str] = None,
+    quiet: bool = False,
 ) -> int:
     """
     Fonction principale.
@@ -183,41 +802,115 @@ def main(
         input_csv: Chemin du fichier CSV d'entrée
         logs_dir: Répertoire des logs
         output_dir: Répertoire de sortie
+        stream: Si True, réorganise les logs en mode streaming (mémoire bornée)
+        workers: Nombre de processus pour la réorganisation des logs
+        incremental: Si True, ne traite que les lignes ajoutées aux logs
+        keep_levels: Niveaux de logs à conserver (None = tous)
+        encoding_errors: Politique pour les octets UTF-8 invalides des logs
+        compression: Compression des logs organisés ('gz', 'bz2', 'xz' ou None)
+        io_threads: Nombre de fichiers journaux lus/décompressés simultanément
+        partition: 'day' ou 'hour' pour partitionner les logs organisés par
+            niveau et tranche de temps (None = un fichier par niveau)
+        follow: Si True, continue ensuite à suivre les journaux et complète
+            les logs organisés au fil de l'eau (jusqu'à Ctrl+C / SIGTERM)
+        follow_options: Latence maximale, taille des lots et intervalle de
+            scrutation du mode suivi
+        chunksize: Nombre de lignes par bloc pour traiter le CSV (None = en mémoire)
+        dedup_index: Fichier .npy d'empreintes pour dédoublonner entre exécutions
+        schema: Schéma du CSV ('auto' = détecté d'après l'en-tête, 'none' ou
+            nom d'un schéma de utils.schema.SCHEMAS)
+        output_format: Format des données nettoyées ('csv', 'parquet', 'feather')
+        table_compression: Codec de compression Parquet/Feather
+        row_group_size: Nombre de lignes par groupe de lignes Parquet ou par lot Feather
+        index: Si True, construit l'index inversé des logs organisés
+            (recherche avec la commande query)
+        metrics_out: Fichier JSON des mesures par étape (durée, CPU, débit,
+            octets lus/écrits, mémoire) ; None pour ne rien mesurer
+        profile_out: Fichier de profil cProfile (à lire avec pstats) ; None
+            pour ne pas profiler
+        quiet: Si True, n'affiche que les erreurs
     
     Returns:
         Code de sortie (0 = succès)
     """
+    set_quiet(quiet)
+    recorder = enable_metrics() if metrics_out else None
+    profiler = cProfile.Profile() if profile_out else None
+    if profiler is not None:
+        profiler.enable()
+    
+    exit_code = 2
     try:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        print("=" * 60)
-        print("🚀 Démarrage du traitement")
-        print("=" * 60)
+        echo("=" * 60)
+        echo("🚀 Démarrage du traitement")
+        echo("=" * 60)
         
         # Traiter le CSV
-        process_csv(input_csv, output_path)
+        process_csv(
+            input_csv, output_path,
+            chunksize=chunksize, dedup_index=dedup_index,
+            schema=resolve_schema(schema, input_csv),
+            output_format=output_format, table_compression=table_compression,
+            row_group_size=row_group_size,
+        )
         
-        print()
+        echo()
         
         # Réorganiser les logs
-        organize_logs(logs_dir, output_path)
+        organize_logs(
+            logs_dir, output_path,
+            stream=stream, workers=workers, incremental=incremental or follow,
+            keep_levels=keep_levels, encoding_errors=encoding_errors,
+            compression=compression, io_threads=io_threads, partition=partition,
+        )
         
-        print()
-        print("=" * 60)
-        print("✅ Traitement terminé avec succès !")
-        print(f"📁 Résultats dans : {output_path}")
-        print("=" * 60)
+        # Indexer les logs organisés (les fichiers compressés ne sont pas indexables)
+        if index and compression:
+            echo("⚠️  Index ignoré : les logs organisés compressés ne sont pas indexables")
+        elif index and follow:
+            echo("⚠️  Index ignoré : il ne serait pas tenu à jour en mode suivi")
+        elif index:
+            index_logs(output_path)
         
-        return 0
+        # Suivre les journaux au fil de l'eau, à partir des points de reprise
+        if follow:
+            echo()
+            follow_organized_logs(
+                logs_dir, output_path, follow_options,
+                keep_levels=keep_levels, encoding_errors=encoding_errors,
+                compression=compression, partition=partition,
+            )
+        
+        echo()
+        echo("=" * 60)
+        echo("✅ Traitement terminé avec succès !")
+        echo(f"📁 Résultats dans : {output_path}")
+        echo("=" * 60)
+        
+        exit_code = 0
     
     except FileNotFoundError as e:
         print(f"❌ Erreur : {e}", file=sys.stderr)
-        return 1
+        exit_code = 1
     
     except Exception as e:
         print(f"❌ Erreur inattendue : {e}", file=sys.stderr)
-        return 2
+        exit_code = 2
+    
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_out)
+            echo(f"🔬 Profil : {profile_out} (python -m pstats {profile_out})")
+        if recorder is not None:
+            recorder.save(metrics_out, exit_code=exit_code)
+            disable_metrics()
+            echo(f"📈 Mesures : {metrics_out}")
+    
+    return exit_code
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -229,6 +922,21 @@ def parse_arguments() -> argparse.Namespace:
 Exemples:
   python src/main.py --input data/data.csv --logs raw_logs --out output
   python src/main.py -i data.csv -l logs -o results
+  python src/main.py -i data.csv -l logs -o results --stream
+  python src/main.py -i data.csv -l logs -o results --workers 8
+  python src/main.py -i data.csv -l logs -o results --incremental
+  python src/main.py -i data.csv -l logs -o results --follow --max-latency 0.5
+  python src/main.py -i data.csv -l logs -o results --levels INFO,WARNING,ERROR
+  python src/main.py -i data.csv -l logs -o results --compress gz
+  python src/main.py -i data.csv -l logs -o results --partition hour
+  python src/main.py -i data.csv -l logs -o results --chunksize 100000
+  python src/main.py -i data.csv -l logs -o results --dedup-index results/dedup_index.npy
+  python src/main.py -i data.csv -l logs -o results --schema none
+  python src/main.py -i data.csv -l logs -o results --format parquet --table-compression zstd
+  python src/main.py -i data.csv -l logs -o results --metrics-out metrics.json --quiet
+  python src/main.py -i data.csv -l logs -o results --profile profile.pstats
+  python src/main.py -i data.csv -l logs -o results --index
+  python src/main.py query -o results timeout auth --level ERROR
         """,
     )
     
@@ -253,14 +961,289 @@ Exemples:
         help="Répertoire de sortie pour les résultats",
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help="Réorganise les logs en streaming (mémoire constante, même résultat)",
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help="Nombre de processus pour classer les logs (défaut : 1)",
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="Ne lit que les lignes ajoutées depuis la dernière exécution",
+    )
+    
+    parser.add_argument(
+        '--follow', '-f',
+        action='store_true',
+        help="Continue à suivre les journaux et complète les logs organisés au fil de l'eau (Ctrl+C pour arrêter)",
+    )
+    
+    parser.add_argument(
+        '--max-latency',
+        type=float,
+        default=FollowOptions().max_latency,
+        help="Mode suivi : délai maximal en secondes avant l'écriture d'une ligne lue (défaut : 1)",
+    )
+    
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=FollowOptions().batch_size,
+        help="Mode suivi : nombre de lignes au-delà duquel les sorties sont vidées (défaut : 10000)",
+    )
+    
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=FollowOptions().poll_interval,
+        help="Mode suivi : intervalle de scrutation du répertoire en secondes (défaut : 0.5)",
+    )
+    
+    parser.add_argument(
+        '--levels',
+        type=str,
+        default=None,
+        help="Niveaux de logs à conserver, séparés par des virgules (défaut : tous)",
+    )
+    
+    parser.add_argument(
+        '--encoding-errors',
+        choices=DECODE_ERROR_POLICIES,
+        default='replace',
+        help="Traitement des octets UTF-8 invalides dans les logs (défaut : replace)",
+    )
+    
+    parser.add_argument(
+        '--compress',
+        choices=COMPRESSION_CHOICES,
+        default=None,
+        help="Compresse les logs organisés (info.log.gz, ...)",
+    )
+    
+    parser.add_argument(
+        '--io-threads',
+        type=int,
+        default=4,
+        help="Nombre de fichiers journaux lus/décompressés en parallèle (défaut : 4)",
+    )
+    
+    parser.add_argument(
+        '--partition',
+        choices=PARTITION_GRANULARITIES,
+        default=None,
+        help="Partitionne les logs organisés par niveau et par jour ou heure (level=ERROR/date=.../hour=14.log)",
+    )
+    
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=None,
+        help="Traite le CSV par blocs de N lignes (mémoire bornée, même résultat)",
+    )
+    
+    parser.add_argument(
+        '--dedup-index',
+        type=str,
+        default=None,
+        help="Index .npy des lignes déjà exportées (dédoublonnage entre exécutions)",
+    )
+    
+    parser.add_argument(
+        '--schema',
+        choices=('auto', 'none', *SCHEMAS),
+        default='auto',
+        help="Schéma de typage du CSV (défaut : auto, détecté d'après l'en-tête)",
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=tuple(TABLE_FORMATS),
+        default='csv',
+        help="Format des données nettoyées (défaut : csv ; parquet/feather nécessitent pyarrow)",
+    )
+    
+    parser.add_argument(
+        '--table-compression',
+        type=str,
+        default=None,
+        help="Compression parquet (snappy, zstd, gzip...) ou feather (lz4, zstd, none)",
+    )
+    
+    parser.add_argument(
+        '--row-group-size',
+        type=int,
+        default=None,
+        help="Nombre de lignes par groupe de lignes Parquet ou par lot Feather (1 048 576 par défaut)",
+    )
+    
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help="Indexe les logs organisés pour la commande query (logs non compressés)",
+    )
+    
+    parser.add_argument(
+        '--metrics-out',
+        type=str,
+        default=None,
+        help="Fichier JSON des mesures par étape (durée, CPU, débit, octets, mémoire)",
+    )
+    
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help="Enregistre un profil cProfile de l'exécution dans ce fichier",
+    )
+    
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help="N'affiche que les erreurs",
+    )
+    
     return parser.parse_args()
 
 
+def query_logs(
+    output_dir: str,
+    terms: list[str],
+    levels: Optional[Collection[str]] = None,
+    match_any: bool = False,
+    limit: Optional[int] = None,
+) -> int:
+    """
+    Affiche les lignes des logs organisés qui contiennent des mots, via l'index.
+    
+    Args:
+        output_dir: Répertoire de sortie d'un traitement lancé avec --index
+        terms: Mots recherchés (tous, ou l'un d'eux si match_any)
+        levels: Niveaux à conserver (None = tous)
+        match_any: Si True, une ligne contenant l'un des mots suffit
+        limit: Nombre maximal de lignes affichées (None = toutes)
+    
+    Returns:
+        Code de sortie (0 = succès)
+    """
+    try:
+        index = LogIndex(Path(output_dir) / "logs_organized")
+        found = 0
+        for path, line in index.search(terms, levels=levels, match_any=match_any, limit=limit):
+            print(f"{path.relative_to(index.directory).as_posix()}: {line}")
+            found += 1
+        echo(f"🔎 {found} ligne(s) trouvée(s)", file=sys.stderr)
+        return 0
+    
+    except FileNotFoundError as e:
+        print(f"❌ Erreur : {e}", file=sys.stderr)
+        return 1
+    
+    except Exception as e:
+        print(f"❌ Erreur : {e}", file=sys.stderr)
+        return 2
+
+
+def parse_query_arguments(argv: list[str]) -> argparse.Namespace:
+    """Parse les arguments de la commande query."""
+    parser = argparse.ArgumentParser(
+        prog="main.py query",
+        description="Recherche dans les logs organisés à l'aide de l'index (--index).",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples:
+  python src/main.py query -o results timeout auth
+  python src/main.py query -o results paiement refusé --level ERROR,WARNING
+  python src/main.py query -o results --level ERROR --limit 20
+  python src/main.py query -o results id=12281 session:852 --any
+        """,
+    )
+    
+    parser.add_argument(
+        'terms',
+        nargs='*',
+        help="Mots recherchés (une ligne doit tous les contenir, sauf avec --any)",
+    )
+    
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        required=True,
+        help="Répertoire de sortie du traitement indexé",
+    )
+    
+    parser.add_argument(
+        '--level',
+        type=str,
+        default=None,
+        help="Niveaux recherchés, séparés par des virgules (défaut : tous)",
+    )
+    
+    parser.add_argument(
+        '--any',
+        action='store_true',
+        help="Retient les lignes contenant au moins un des mots",
+    )
+    
+    parser.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=None,
+        help="Nombre maximal de lignes affichées",
+    )
+    
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help="N'affiche que les lignes trouvées et les erreurs",
+    )
+    
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    if sys.argv[1:2] == ['query']:
+        args = parse_query_arguments(sys.argv[2:])
+        set_quiet(args.quiet)
+        sys.exit(query_logs(
+            output_dir=args.out,
+            terms=args.terms,
+            levels=[lvl.strip() for lvl in args.level.upper().split(',')] if args.level else None,
+            match_any=args.any,
+            limit=args.limit,
+        ))
+    
     args = parse_arguments()
     exit_code = main(
         input_csv=args.input,
         logs_dir=args.logs,
         output_dir=args.out,
+        stream=args.stream,
+        workers=args.workers,
+        incremental=args.incremental,
+        keep_levels=[lvl.strip() for lvl in args.levels.upper().split(',')] if args.levels else None,
+        encoding_errors=args.encoding_errors,
+        compression=args.compress,
+        io_threads=args.io_threads,
+        partition=args.partition,
+        follow=args.follow,
+        follow_options=FollowOptions(args.max_latency, args.batch_size, args.poll_interval),
+        chunksize=args.chunksize,
+        dedup_index=args.dedup_index,
+        schema=args.schema,
+        output_format=args.format,
+        table_compression=args.table_compression,
+        row_group_size=args.row_group_size,
+        index=args.index,
+        metrics_out=args.metrics_out,
+        profile_out=args.profile,
+        quiet=args.quiet,
     )
     sys.exit(exit_code)
@@ -11,11 +11,89 @@ from .paths import (
 )
 from .io import (
     read_csv,
+    iter_csv_chunks,
+    infer_csv_dtypes,
     write_csv,
+    read_table,
+    TableWriter,
+    TABLE_FORMATS,
     read_log_file,
+    iter_log_file,
+    iter_log_line_blocks,
+    split_block,
+    prefetch_line_blocks,
+    open_file,
+    is_compressed,
+    COMPRESSION_CHOICES,
+    BufferedLineWriters,
     write_text_file,
     get_all_log_files,
 )
+from .logs import (
+    LOG_LEVELS,
+    LogEntry,
+    LogParser,
+    DEFAULT_PARSER,
+    DECODE_ERROR_POLICIES,
+    iter_log_records,
+    iter_records_from_blocks,
+    parse_log_entry,
+    classify_log_line,
+)
+from .parallel import (
+    plan_log_chunks,
+    classify_logs_parallel,
+)
+from .checkpoint import (
+    FileCheckpoint,
+    CheckpointStore,
+)
+from .dedup import (
+    FingerprintIndex,
+    row_fingerprints,
+)
+from .schema import (
+    ColumnSpec,
+    CsvSchema,
+    CLIENTS_SCHEMA,
+    SCHEMAS,
+    apply_schema,
+    detect_schema,
+    resolve_schema,
+)
+from .stats import (
+    QuantileSketch,
+    StreamingStats,
+)
+from .log_index import (
+    LogIndex,
+    build_log_index,
+    tokenize,
+)
+from .partitions import (
+    PARTITION_GRANULARITIES,
+    Partition,
+    partition_key,
+    iter_partitions,
+    read_partitioned_logs,
+)
+from .follow import (
+    FollowOptions,
+    LogFollower,
+    follow_logs,
+)
+from .metrics import (
+    MetricsRecorder,
+    enable_metrics,
+    disable_metrics,
+    stage,
+    measure_iter,
+)
+from .console import (
+    echo,
+    set_quiet,
+    is_quiet,
+)
 
 __all__ = [
     "get_project_root",
@@ -24,8 +102,64 @@ __all__ = [
     "get_output_dir",
     "validate_input_path",
     "read_csv",
+    "iter_csv_chunks",
+    "infer_csv_dtypes",
     "write_csv",
+    "read_table",
+    "TableWriter",
+    "TABLE_FORMATS",
     "read_log_file",
+    "iter_log_file",
+    "iter_log_line_blocks",
+    "split_block",
+    "prefetch_line_blocks",
+    "open_file",
+    "is_compressed",
+    "COMPRESSION_CHOICES",
+    "BufferedLineWriters",
     "write_text_file",
     "get_all_log_files",
+    "LOG_LEVELS",
+    "LogEntry",
+    "LogParser",
+    "DEFAULT_PARSER",
+    "DECODE_ERROR_POLICIES",
+    "iter_log_records",
+    "iter_records_from_blocks",
+    "parse_log_entry",
+    "classify_log_line",
+    "plan_log_chunks",
+    "classify_logs_parallel",
+    "FileCheckpoint",
+    "CheckpointStore",
+    "FingerprintIndex",
+    "row_fingerprints",
+    "ColumnSpec",
+    "CsvSchema",
+    "CLIENTS_SCHEMA",
+    "SCHEMAS",
+    "apply_schema",
+    "detect_schema",
+    "resolve_schema",
+    "QuantileSketch",
+    "StreamingStats",
+    "LogIndex",
+    "build_log_index",
+    "tokenize",
+    "PARTITION_GRANULARITIES",
+    "Partition",
+    "partition_key",
+    "iter_partitions",
+    "read_partitioned_logs",
+    "FollowOptions",
+    "LogFollower",
+    "follow_logs",
+    "MetricsRecorder",
+    "enable_metrics",
+    "disable_metrics",
+    "stage",
+    "measure_iter",
+    "echo",
+    "set_quiet",
+    "is_quiet",
 ]
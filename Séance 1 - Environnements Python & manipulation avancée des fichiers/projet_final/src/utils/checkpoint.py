@@ -0,0 +1,199 @@
+"""
+Points de reprise pour la lecture incrémentale des fichiers journaux.
+
+Pour chaque fichier, on mémorise (inode, taille, offset, empreinte de la
+dernière ligne lue). Une nouvelle exécution ne lit alors que les octets
+ajoutés depuis, tout en détectant la rotation et la troncature.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+
+# Nombre maximal d'octets relus pour calculer l'empreinte de la dernière ligne
+TAIL_WINDOW = 64 * 1024
+
+
+class FileCheckpoint(NamedTuple):
+    """État de lecture d'un fichier journal."""
+    inode: int
+    size: int
+    offset: int
+    last_line_hash: str
+
+
+def tail_hash(filepath: Path | str, offset: int) -> str:
+    """
+    Calcule l'empreinte de la ligne qui se termine à l'offset donné.
+    
+    La ligne est lue à rebours depuis offset jusqu'au '\\n' précédent, dans la
+    limite de TAIL_WINDOW octets.
+    
+    Args:
+        filepath: Chemin du fichier
+        offset: Position juste après la dernière ligne lue
+    
+    Returns:
+        Empreinte hexadécimale (chaîne vide si offset vaut 0)
+    """
+    if offset <= 0:
+        return ""
+    start = max(0, offset - TAIL_WINDOW)
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        tail = f.read(offset - start)
+    line_start = tail.rfind(b'\n', 0, len(tail) - 1) + 1
+    return hashlib.blake2b(tail[line_start:], digest_size=16).hexdigest()
+
+
+def complete_lines_end(filepath: Path | str, size: int) -> int:
+    """
+    Retourne la position juste après le dernier '\\n' du fichier.
+    
+    Une dernière ligne sans '\\n' est probablement en cours d'écriture : elle
+    sera lue à l'exécution suivante.
+    
+    Args:
+        filepath: Chemin du fichier
+        size: Taille du fichier à considérer
+    
+    Returns:
+        Offset de fin de la dernière ligne complète (0 si aucune)
+    """
+    position = size
+    with open(filepath, 'rb') as f:
+        while position > 0:
+            start = max(0, position - TAIL_WINDOW)
+            f.seek(start)
+            block = f.read(position - start)
+            index = block.rfind(b'\n')
+            if index >= 0:
+                return start + index + 1
+            position = start
+    return 0
+
+
+class CheckpointStore:
+    """
+    Registre persistant (JSON) des points de reprise, par chemin de fichier.
+    
+    Exemple:
+        store = CheckpointStore(output_dir / ".checkpoints.json")
+        start = store.resume_offset(log_file)
+        ...
+        store.update(log_file, end)
+        store.save()
+    """
+    
+    def __init__(self, filepath: Path | str) -> None:
+        """
+        Args:
+            filepath: Fichier JSON de stockage (créé au premier save)
+        
+        Raises:
+            ValueError: Si le fichier existe mais n'est pas un JSON valide
+        """
+        self.filepath = Path(filepath)
+        self._entries: dict[str, FileCheckpoint] = {}
+        
+        if self.filepath.exists():
+            try:
+                raw = json.loads(self.filepath.read_text(encoding='utf-8'))
+                self._entries = {
+                    key: FileCheckpoint(**value) for key, value in raw.items()
+                }
+            except (json.JSONDecodeError, TypeError) as e:
+                raise ValueError(f"Fichier de reprise invalide {self.filepath} : {e}")
+    
+    def __len__(self) -> int:
+        """Nombre de fichiers ayant un point de reprise."""
+        return len(self._entries)
+    
+    def get(self, filepath: Path | str) -> FileCheckpoint | None:
+        """Retourne le point de reprise d'un fichier, s'il existe."""
+        return self._entries.get(self._key(filepath))
+    
+    def resume_offset(self, filepath: Path | str) -> int:
+        """
+        Détermine à partir de quel octet relire un fichier.
+        
+        Le fichier est relu depuis le début si :
+        - il est inconnu ;
+        - son inode a changé (rotation) et aucun autre fichier suivi n'avait
+          cet inode (sinon on reprend là où ce fichier renommé s'était arrêté) ;
+        - il est plus court que l'offset mémorisé (troncature) ;
+        - la ligne qui précède l'offset a changé (fichier réécrit).
+        
+        Args:
+            filepath: Chemin du fichier journal
+        
+        Returns:
+            Offset de reprise
+        """
+        path = Path(filepath)
+        stat = path.stat()
+        checkpoint = self.get(path)
+        
+        if checkpoint is None or checkpoint.inode != stat.st_ino:
+            checkpoint = self._find_by_inode(stat.st_ino)
+            if checkpoint is None:
+                return 0
+        
+        if stat.st_size < checkpoint.offset:
+            return 0
+        if tail_hash(path, checkpoint.offset) != checkpoint.last_line_hash:
+            return 0
+        return checkpoint.offset
+    
+    def update(self, filepath: Path | str, offset: int) -> None:
+        """
+        Enregistre la position atteinte dans un fichier.
+        
+        Args:
+            filepath: Chemin du fichier journal
+            offset: Position juste après la dernière ligne traitée
+        """
+        path = Path(filepath)
+        stat = path.stat()
+        self._entries[self._key(path)] = FileCheckpoint(
+            inode=stat.st_ino,
+            size=stat.st_size,
+            offset=offset,
+            last_line_hash=tail_hash(path, offset),
+        )
+    
+    def forget(self, filepath: Path | str) -> None:
+        """Supprime le point de reprise d'un fichier (archivé, supprimé...)."""
+        self._entries.pop(self._key(filepath), None)
+    
+    def save(self) -> None:
+        """
+        Écrit le registre de façon atomique (fichier temporaire puis renommage).
+        
+        Raises:
+            IOError: En cas d'erreur d'écriture
+        """
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.filepath.with_name(self.filepath.name + ".tmp")
+        content = json.dumps(
+            {key: value._asdict() for key, value in self._entries.items()},
+            indent=2,
+        )
+        try:
+            tmp_path.write_text(content, encoding='utf-8')
+            os.replace(tmp_path, self.filepath)
+        except OSError as e:
+            raise IOError(f"Erreur lors de l'écriture des points de reprise : {e}")
+    
+    def _find_by_inode(self, inode: int) -> FileCheckpoint | None:
+        for checkpoint in self._entries.values():
+            if checkpoint.inode == inode:
+                return checkpoint
+        return None
+    
+    @staticmethod
+    def _key(filepath: Path | str) -> str:
+        return str(Path(filepath).resolve())
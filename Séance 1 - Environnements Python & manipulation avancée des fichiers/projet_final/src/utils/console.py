@@ -0,0 +1,30 @@
+"""
+Affichage de la progression, désactivable (mode silencieux).
+
+Les messages de progression passent par echo() plutôt que print() : en mode
+silencieux (--quiet), ils ne sont ni mis en forme par le terminal ni écrits,
+ce qui évite leur coût dans les boucles. Les erreurs restent affichées avec
+print(..., file=sys.stderr).
+"""
+
+from typing import Any
+
+
+_quiet = False
+
+
+def set_quiet(quiet: bool = True) -> None:
+    """Active (ou désactive) le mode silencieux."""
+    global _quiet
+    _quiet = quiet
+
+
+def is_quiet() -> bool:
+    """Indique si le mode silencieux est actif."""
+    return _quiet
+
+
+def echo(*values: Any, **kwargs: Any) -> None:
+    """Affiche un message de progression (comme print), sauf en mode silencieux."""
+    if not _quiet:
+        print(*values, **kwargs)
@@ -0,0 +1,173 @@
+"""
+Dédoublonnage des lignes d'un DataFrame par empreintes de 64 bits.
+
+Chaque ligne est réduite à une empreinte (pd.util.hash_pandas_object). Un
+FingerprintIndex mémorise les empreintes déjà vues, éventuellement sur
+disque : les doublons sont détectés d'un bloc à l'autre et d'une exécution à
+l'autre sans conserver les lignes elles-mêmes (8 octets par ligne unique).
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+# Au-delà de 2**53, les flottants ne représentent plus exactement tous les entiers
+FLOAT_EXACT_INT_MAX = 2 ** 53
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    Calcule l'empreinte de 64 bits de chaque ligne d'un DataFrame.
+    
+    Les colonnes entières sont hachées telles quelles, jamais converties en
+    flottants (les identifiants au-delà de 2**53 restent distincts). Une
+    colonne flottante dont toutes les valeurs non nulles sont entières et
+    comprises dans ±2**53 est hachée comme une colonne entière : une même
+    ligne garde la même empreinte que sa colonne ait été lue comme entière
+    ou, un autre jour, comme flottante à cause d'une valeur manquante. Dans
+    les autres colonnes flottantes, -0.0 est haché comme 0.0 et tous les NaN
+    ont la même empreinte.
+    
+    Args:
+        df: DataFrame dont les lignes sont à hacher
+    
+    Returns:
+        Tableau uint64 d'une empreinte par ligne
+    """
+    normalized = df.copy(deep=False)
+    for column, dtype in df.dtypes.items():
+        if dtype.kind != 'f':
+            continue
+        values = df[column]
+        present = values.dropna()
+        if ((present == np.floor(present)) & (present.abs() <= FLOAT_EXACT_INT_MAX)).all():
+            normalized[column] = values.astype('Int64')
+        else:
+            normalized[column] = values.where(values.notna(), np.nan) + 0.0
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+
+class FingerprintIndex:
+    """
+    Ensemble d'empreintes de lignes déjà rencontrées, sauvegardable en .npy.
+    
+    Les empreintes sont rangées dans quelques tableaux triés de tailles
+    croissantes, fusionnés au fil des ajouts : la recherche se fait par
+    dichotomie et l'empreinte mémoire reste de 8 octets par ligne unique.
+    
+    Avec des empreintes de 64 bits, la probabilité qu'une ligne nouvelle soit
+    prise pour un doublon reste négligeable (~3e-4 pour 100 millions de
+    lignes uniques).
+    
+    Exemple:
+        index = FingerprintIndex(output_dir / "dedup_index.npy")
+        df = df[index.filter_new(row_fingerprints(df))]
+        index.save()
+    """
+    
+    def __init__(self, filepath: Optional[Path | str] = None) -> None:
+        """
+        Args:
+            filepath: Fichier .npy de stockage (chargé s'il existe, créé au
+                premier save) ; None pour un index uniquement en mémoire
+        
+        Raises:
+            ValueError: Si le fichier existe mais n'est pas un index valide
+        """
+        self.filepath = Path(filepath) if filepath is not None else None
+        self._levels: list[np.ndarray] = []
+        
+        if self.filepath is not None and self.filepath.exists():
+            try:
+                stored = np.load(self.filepath, allow_pickle=False)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"Index de dédoublonnage invalide {self.filepath} : {e}")
+            if stored.dtype != np.uint64 or stored.ndim != 1:
+                raise ValueError(f"Index de dédoublonnage invalide {self.filepath}")
+            if len(stored):
+                self._levels.append(np.unique(stored))
+    
+    def __len__(self) -> int:
+        return sum(len(level) for level in self._levels)
+    
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Indique, pour chaque empreinte, si elle figure déjà dans l'index.
+        
+        Args:
+            fingerprints: Tableau uint64 d'empreintes
+        
+        Returns:
+            Tableau de booléens de même longueur
+        """
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for level in self._levels:
+            positions = np.searchsorted(level, fingerprints)
+            positions[positions == len(level)] = 0
+            found |= level[positions] == fingerprints
+        return found
+    
+    def add(self, fingerprints: np.ndarray) -> None:
+        """
+        Ajoute des empreintes à l'index.
+        
+        Args:
+            fingerprints: Tableau uint64 d'empreintes (doublons acceptés)
+        """
+        new = np.unique(np.asarray(fingerprints, dtype=np.uint64))
+        self._append(new[~self.contains(new)])
+    
+    def filter_new(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Sélectionne les lignes jamais vues et les ajoute à l'index.
+        
+        Une ligne est conservée si son empreinte est absente de l'index et
+        n'apparaît pas plus tôt dans le même lot (comme drop_duplicates).
+        
+        Args:
+            fingerprints: Empreintes des lignes, dans l'ordre
+        
+        Returns:
+            Masque booléen des lignes à conserver
+        """
+        first = ~pd.Series(fingerprints).duplicated(keep='first').to_numpy()
+        keep = first & ~self.contains(fingerprints)
+        self._append(np.sort(fingerprints[keep]))
+        return keep
+    
+    def save(self) -> None:
+        """
+        Écrit l'index de façon atomique (fichier temporaire puis renommage).
+        
+        Raises:
+            ValueError: Si l'index n'a pas de fichier de stockage
+            IOError: En cas d'erreur d'écriture
+        """
+        if self.filepath is None:
+            raise ValueError("Index de dédoublonnage sans fichier de stockage")
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        merged = self._levels[0] if len(self._levels) == 1 else np.unique(
+            np.concatenate(self._levels or [np.empty(0, dtype=np.uint64)])
+        )
+        self._levels = [merged] if len(merged) else []
+        tmp_path = self.filepath.with_name(self.filepath.name + ".tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, merged, allow_pickle=False)
+            os.replace(tmp_path, self.filepath)
+        except OSError as e:
+            raise IOError(f"Erreur lors de l'écriture de l'index de dédoublonnage : {e}")
+    
+    def _append(self, new: np.ndarray) -> None:
+        # new : empreintes triées, uniques et absentes de l'index
+        if not len(new):
+            return
+        self._levels.append(new)
+        # Fusion façon « compteur binaire » : chaque niveau fait plus du double
+        # du suivant, il y a donc O(log n) niveaux à interroger
+        while len(self._levels) > 1 and len(self._levels[-2]) <= 2 * len(self._levels[-1]):
+            last = self._levels.pop()
+            self._levels[-1] = np.union1d(self._levels[-1], last)
@@ -0,0 +1,368 @@
+"""
+Suivi continu d'un répertoire de journaux (mode --follow).
+
+Les fichiers .log sont suivis comme avec `tail -F` : les lignes ajoutées
+sont lues dès leur écriture, classées par niveau et ajoutées aux logs
+organisés. Le pipeline asyncio comporte deux tâches reliées par une file
+bornée :
+
+- la lecture : à chaque changement signalé par watchfiles (s'il est
+  installé) ou, à défaut, toutes les `poll_interval` secondes, les octets
+  ajoutés à chaque fichier sont lus (dans un thread) et classés ;
+- l'écriture : les lignes sont écrites au fil de l'eau et les fichiers de
+  sortie vidés dès que `batch_size` lignes attendent ou qu'une ligne attend
+  depuis `max_latency` secondes.
+
+Les points de reprise (ceux de --incremental) sont enregistrés après chaque
+vidage : un arrêt (Ctrl+C, SIGTERM) ou un plantage ne perd aucune ligne, au
+pire quelques lignes sont réécrites au redémarrage. Un fichier renommé
+(rotation) est lu jusqu'au bout avant de passer au nouveau fichier ; un
+fichier tronqué est relu depuis le début.
+
+Exemple:
+    follow_logs('raw_logs', 'output/logs_organized', 'output/.checkpoints.json')
+"""
+
+import asyncio
+import contextlib
+import os
+import signal
+from pathlib import Path
+from typing import Any, BinaryIO, Collection, NamedTuple, Optional
+
+from .checkpoint import CheckpointStore
+from .io import BufferedLineWriters, split_block
+from .logs import LOG_LEVELS, iter_records_from_blocks
+from .metrics import stage
+from .partitions import partition_key
+
+
+# Nombre maximal d'octets lus par fichier à chaque passage (1 Mio)
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Nombre maximal de lots en attente d'écriture
+MAX_PENDING_BATCHES = 64
+
+# Nombre maximal de fichiers de sortie ouverts simultanément
+MAX_OPEN_OUTPUTS = 128
+
+
+class FollowOptions(NamedTuple):
+    """Réglages du mode suivi."""
+    max_latency: float = 1.0
+    batch_size: int = 10_000
+    poll_interval: float = 0.5
+
+
+class _Batch(NamedTuple):
+    """Lignes classées lues dans un fichier, et position atteinte."""
+    path: Path
+    inode: int
+    offset: int
+    records: list[tuple[str, str]]
+
+
+class _TailedFile:
+    """Fichier suivi : descripteur ouvert, position de la dernière ligne complète lue."""
+    
+    def __init__(self, path: Path, offset: int) -> None:
+        self.path = path
+        self.handle: BinaryIO = open(path, 'rb')
+        self.inode = os.fstat(self.handle.fileno()).st_ino
+        self.handle.seek(offset)
+        self.offset = offset
+        self._partial = b''
+    
+    def read_lines(self, max_bytes: int = READ_CHUNK_SIZE, final: bool = False) -> tuple[list[bytes], bool]:
+        """
+        Lit les lignes complètes ajoutées depuis la lecture précédente.
+        
+        Args:
+            max_bytes: Nombre maximal d'octets lus
+            final: Si True (fichier renommé ou supprimé), une dernière ligne
+                sans '\\n' est aussi retournée
+        
+        Returns:
+            Lignes brutes, et True s'il reste peut-être des octets à lire
+        """
+        data = self.handle.read(max_bytes)
+        more = len(data) == max_bytes
+        data = self._partial + data
+        cut = len(data) if final and not more else data.rfind(b'\n') + 1
+        self._partial = data[cut:]
+        self.offset += cut
+        return (split_block(data[:cut]) if cut else []), more
+    
+    def rewind(self) -> None:
+        """Reprend la lecture au début (fichier tronqué)."""
+        self.handle.seek(0)
+        self.offset = 0
+        self._partial = b''
+    
+    def close(self) -> None:
+        self.handle.close()
+
+
+class LogFollower:
+    """
+    Pipeline de suivi d'un répertoire de journaux.
+    
+    Exemple:
+        follower = LogFollower('raw_logs', 'output/logs_organized', store)
+        asyncio.run(follower.run())
+    """
+    
+    def __init__(
+        self,
+        logs_dir: Path | str,
+        logs_output_dir: Path | str,
+        store: CheckpointStore,
+        options: FollowOptions = FollowOptions(),
+        keep_levels: Optional[Collection[str]] = None,
+        encoding_errors: str = 'replace',
+        compression: Optional[str] = None,
+        partition: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            logs_dir: Répertoire des journaux bruts suivis (fichiers .log)
+            logs_output_dir: Répertoire des logs organisés (complétés)
+            store: Points de reprise (lus au démarrage, mis à jour à chaque vidage)
+            options: Latence maximale, taille des lots, intervalle de scrutation
+            keep_levels: Niveaux à conserver (None = tous)
+            encoding_errors: Politique pour les octets UTF-8 invalides
+            compression: Compression des logs organisés ('gz', 'bz2', 'xz' ou None)
+            partition: 'day' ou 'hour' pour des logs partitionnés (voir
+                utils.partitions), None pour un fichier par niveau
+        """
+        self.logs_dir = Path(logs_dir)
+        self.store = store
+        self.options = options
+        self.keep_levels = keep_levels
+        self.encoding_errors = encoding_errors
+        self.partition = partition
+        self.counts = dict.fromkeys(LOG_LEVELS, 0)
+        self.writers = BufferedLineWriters(
+            logs_output_dir, append=True, compression=compression, max_open=MAX_OPEN_OUTPUTS,
+        )
+        self._files: dict[Path, _TailedFile] = {}
+        self._started = False
+        self._stop = asyncio.Event()
+        self._changed = asyncio.Event()
+        # Position écrite (non encore vidée) par fichier : (inode, offset)
+        self._unflushed: dict[Path, tuple[int, int]] = {}
+        self._pending = 0
+        self._error: Optional[Exception] = None
+    
+    def stop(self) -> None:
+        """Demande l'arrêt : les lignes déjà lues sont écrites avant de s'arrêter."""
+        self._stop.set()
+        self._changed.set()
+    
+    async def run(self) -> None:
+        """Suit les journaux jusqu'à l'appel de stop()."""
+        batches: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_BATCHES)
+        tasks = [asyncio.create_task(self._read(batches))]
+        watcher = self._watch()
+        if watcher is not None:
+            tasks.append(asyncio.create_task(watcher))
+        try:
+            await self._write(batches)
+            if self._error is not None:
+                raise self._error
+        finally:
+            self._stop.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._flush()
+            self.writers.close()
+            for tailed in self._files.values():
+                tailed.close()
+    
+    async def _read(self, batches: asyncio.Queue) -> None:
+        """Tâche de lecture : produit des lots jusqu'à l'arrêt, puis None."""
+        try:
+            while not self._stop.is_set():
+                self._changed.clear()
+                found, more = await asyncio.to_thread(self._scan)
+                for batch in found:
+                    await batches.put(batch)
+                if not more:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._changed.wait(), self.options.poll_interval)
+        except Exception as e:
+            # Transmise par run() une fois les lignes déjà lues écrites
+            self._error = e
+        await batches.put(None)
+    
+    async def _write(self, batches: asyncio.Queue) -> None:
+        """Tâche d'écriture : écrit les lots et vide les sorties (latence, taille de lot)."""
+        loop = asyncio.get_running_loop()
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                batch = await asyncio.wait_for(batches.get(), timeout)
+            except asyncio.TimeoutError:
+                # La plus ancienne ligne en attente a atteint la latence maximale
+                self._flush()
+                deadline = None
+                continue
+            if batch is None:
+                return
+            
+            for level, line in batch.records:
+                key = partition_key(level, line, self.partition) if self.partition else level.lower()
+                self.writers.write(key, line)
+                self.counts[level] += 1
+            self._unflushed[batch.path] = (batch.inode, batch.offset)
+            self._pending += len(batch.records)
+            if deadline is None:
+                deadline = loop.time() + self.options.max_latency
+            if self._pending >= self.options.batch_size or loop.time() >= deadline:
+                self._flush()
+                deadline = None
+    
+    def _scan(self) -> tuple[list[_Batch], bool]:
+        """
+        Lit les octets ajoutés à chaque fichier (exécuté dans un thread).
+        
+        Returns:
+            Lots lus, et True si un fichier a encore des octets à lire
+        """
+        batches: list[_Batch] = []
+        more = False
+        current: dict[int, Path] = {}
+        for path in sorted(self.logs_dir.glob('*.log')):
+            with contextlib.suppress(FileNotFoundError):
+                current[path.stat().st_ino] = path
+        
+        # Fichiers renommés (rotation) ou supprimés : lus jusqu'au bout puis fermés
+        for path, tailed in list(self._files.items()):
+            renamed = current.get(tailed.inode)
+            if renamed == path:
+                continue
+            if renamed is not None and renamed not in self._files:
+                # Renommé en un autre .log : suivi sous son nouveau nom
+                self._files[renamed] = self._files.pop(path)
+                tailed.path = renamed
+                continue
+            batches.extend(self._drain(tailed))
+            tailed.close()
+            del self._files[path]
+        
+        for inode, path in current.items():
+            tailed = self._files.get(path)
+            try:
+                if tailed is None:
+                    # Au démarrage, reprise aux points enregistrés ; ensuite, un
+                    # nouveau fichier est lu depuis le début
+                    start = self.store.resume_offset(path) if not self._started else 0
+                    tailed = self._files[path] = _TailedFile(path, start)
+                elif path.stat().st_size < tailed.offset:
+                    tailed.rewind()
+            except FileNotFoundError:  # supprimé depuis le parcours du répertoire
+                continue
+            lines, has_more = tailed.read_lines()
+            more = more or has_more
+            if lines or has_more:
+                batches.append(self._batch(tailed, lines))
+        self._started = True
+        return batches, more
+    
+    def _drain(self, tailed: _TailedFile) -> list[_Batch]:
+        batches = []
+        while True:
+            lines, more = tailed.read_lines(final=True)
+            if lines:
+                batches.append(self._batch(tailed, lines))
+            if not more:
+                return batches
+    
+    def _batch(self, tailed: _TailedFile, lines: list[bytes]) -> _Batch:
+        records = list(iter_records_from_blocks(
+            [lines], keep=self.keep_levels, errors=self.encoding_errors, source=str(tailed.path),
+        ))
+        return _Batch(tailed.path, tailed.inode, tailed.offset, records)
+    
+    def _flush(self) -> None:
+        """Vide les sorties puis enregistre les points de reprise correspondants."""
+        if not self._unflushed:
+            return
+        with stage('follow_logs.flush') as s:
+            self.writers.flush()
+            for path, (inode, offset) in self._unflushed.items():
+                with contextlib.suppress(FileNotFoundError):
+                    # Un fichier déjà remplacé (rotation) n'a plus de point de reprise utile
+                    if path.stat().st_ino == inode:
+                        self.store.update(path, offset)
+            self.store.save()
+            s.add_items(self._pending)
+        self._unflushed = {}
+        self._pending = 0
+    
+    def _watch(self) -> Any:
+        """Tâche de notification (watchfiles), ou None : simple scrutation périodique."""
+        try:
+            import watchfiles
+        except ImportError:
+            return None
+        
+        async def watch() -> None:
+            async for _ in watchfiles.awatch(self.logs_dir, stop_event=self._stop):
+                self._changed.set()
+        
+        return watch()
+
+
+def follow_logs(
+    logs_dir: Path | str,
+    logs_output_dir: Path | str,
+    checkpoint_file: Path | str,
+    options: FollowOptions = FollowOptions(),
+    keep_levels: Optional[Collection[str]] = None,
+    encoding_errors: str = 'replace',
+    compression: Optional[str] = None,
+    partition: Optional[str] = None,
+    duration: Optional[float] = None,
+) -> dict[str, int]:
+    """
+    Suit un répertoire de journaux jusqu'à Ctrl+C / SIGTERM (ou `duration`).
+    
+    Args:
+        logs_dir: Répertoire des journaux bruts
+        logs_output_dir: Répertoire des logs organisés
+        checkpoint_file: Registre des points de reprise (partagé avec --incremental)
+        options: Latence maximale, taille des lots, intervalle de scrutation
+        keep_levels: Niveaux à conserver (None = tous)
+        encoding_errors: Politique pour les octets UTF-8 invalides
+        compression: Compression des logs organisés
+        partition: Partitionnement des logs organisés ('day', 'hour' ou None)
+        duration: Durée maximale du suivi en secondes (None = illimitée)
+    
+    Returns:
+        Nombre de lignes écrites par niveau
+    """
+    async def main() -> dict[str, int]:
+        follower = LogFollower(
+            logs_dir, logs_output_dir, CheckpointStore(checkpoint_file), options,
+            keep_levels, encoding_errors, compression, partition,
+        )
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, follower.stop)
+            except (NotImplementedError, RuntimeError):  # Windows : KeyboardInterrupt
+                pass
+        if duration is not None:
+            loop.call_later(duration, follower.stop)
+        try:
+            await follower.run()
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                with contextlib.suppress(NotImplementedError, RuntimeError):
+                    loop.remove_signal_handler(sig)
+        return follower.counts
+    
+    return asyncio.run(main())
@@ -2,18 +2,95 @@
 Utilitaires pour la lecture et l'écriture de fichiers.
 """
 
+import bz2
 import csv
+import gzip
+import io
+import lzma
+import mmap
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, BinaryIO, Iterable, Iterator, Optional, TextIO
+import numpy as np
 import pandas as pd
 
+from .metrics import count, measure_iter, stage
+from .schema import CsvSchema, apply_schema, read_options
 
-def read_csv(filepath: Path | str) -> pd.DataFrame:
+
+# Taille du tampon des fichiers de sortie en mode streaming (1 Mio)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Taille des blocs découpés en lignes par le lecteur mmap (8 Mio)
+READ_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Formats de compression reconnus (suffixe → module de la bibliothèque standard)
+COMPRESSION_CODECS = {
+    '.gz': gzip,
+    '.bz2': bz2,
+    '.xz': lzma,
+}
+
+# Noms de compression acceptés en option (ex. --compress gz)
+COMPRESSION_CHOICES = tuple(suffix.lstrip('.') for suffix in COMPRESSION_CODECS)
+
+# Formats de sortie des tableaux (option --format) et extension associée
+TABLE_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+TABLE_SUFFIXES = {suffix: fmt for fmt, suffix in TABLE_FORMATS.items()}
+
+# Lignes par groupe de lignes Parquet ou par lot Feather (défaut de pyarrow)
+ROW_GROUP_SIZE = 1024 * 1024
+
+# Fichiers journaux reconnus, compressés ou non
+LOG_FILE_PATTERNS = ('*.log',) + tuple(f'*.log{suffix}' for suffix in COMPRESSION_CODECS)
+
+
+def is_compressed(filepath: Path | str) -> bool:
+    """Indique si un fichier est compressé (d'après son extension)."""
+    return Path(filepath).suffix.lower() in COMPRESSION_CODECS
+
+
+def open_file(filepath: Path | str, mode: str = 'r', encoding: Optional[str] = None) -> IO[Any]:
+    """
+    Ouvre un fichier, en le (dé)compressant à la volée selon son extension.
+    
+    Les fichiers .gz, .bz2 et .xz sont lus et écrits en flux avec les modules
+    gzip, bz2 et lzma ; les autres fichiers sont ouverts avec open().
+    
+    Args:
+        filepath: Chemin du fichier
+        mode: Mode d'ouverture ('r', 'w', 'a', éventuellement avec 'b')
+        encoding: Encodage en mode texte
+    
+    Returns:
+        Objet fichier
+    """
+    path = Path(filepath)
+    codec = COMPRESSION_CODECS.get(path.suffix.lower())
+    if codec is None:
+        return open(path, mode, encoding=encoding)
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+    if codec is gzip:
+        # Niveau 6 : bien plus rapide que le niveau 9 par défaut, pour un gain quasi identique
+        return gzip.open(path, mode, compresslevel=6, encoding=encoding)
+    return codec.open(path, mode, encoding=encoding)
+
+
+def read_csv(filepath: Path | str, schema: Optional[CsvSchema] = None) -> pd.DataFrame:
     """
     Lit un fichier CSV et retourne un DataFrame pandas.
     
     Args:
         filepath: Chemin du fichier CSV
+        schema: Schéma des colonnes ; s'il est fourni, le fichier est lu avec
+            son séparateur et ses colonnes sont typées (voir utils.schema)
     
     Returns:
         DataFrame contenant les données CSV
@@ -28,33 +105,438 @@ def read_csv(filepath: Path | str) -> pd.DataFrame:
         raise FileNotFoundError(f"Fichier CSV non trouvé : {path}")
     
     try:
-        df = pd.read_csv(path)
+        with stage('io.read_csv') as s:
+            if schema is not None:
+                df = apply_schema(pd.read_csv(path, **read_options(schema)), schema)
+            else:
+                df = pd.read_csv(path)
+            s.add_items(len(df))
+            s.add_bytes_read(path.stat().st_size)
         return df
     except pd.errors.ParserError as e:
         raise pd.errors.ParserError(f"Erreur lors de la lecture du CSV : {e}")
 
 
-def write_csv(df: pd.DataFrame, filepath: Path | str, index: bool = False) -> None:
+def infer_csv_dtypes(filepath: Path | str, chunksize: int) -> dict[str, Any]:
     """
-    Écrit un DataFrame pandas dans un fichier CSV.
+    Détermine le type de chaque colonne d'un CSV en le parcourant par blocs.
+    
+    Les types inférés bloc par bloc sont fusionnés comme le ferait une lecture
+    complète : entiers et flottants (ou valeurs manquantes) donnent des
+    flottants, booléens et valeurs manquantes des booléens nullables, toute
+    autre combinaison donne des chaînes. Relire le fichier par blocs avec ces
+    types produit donc les mêmes valeurs que read_csv.
+    
+    Args:
+        filepath: Chemin du fichier CSV
+        chunksize: Nombre de lignes par bloc
+    
+    Returns:
+        Dictionnaire colonne → type (à passer à iter_csv_chunks)
+    
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+        pd.errors.ParserError: Si le CSV est mal formaté
+    """
+    kinds: dict[str, Any] = {}
+    with stage('io.infer_csv_dtypes') as s:
+        for chunk in iter_csv_chunks(filepath, chunksize):
+            for column, dtype in chunk.dtypes.items():
+                kind = _chunk_column_kind(chunk[column], dtype)
+                previous = kinds.get(column)
+                kinds[column] = kind if previous is None else _merge_kinds(previous, kind)
+            s.add_items(len(chunk))
+    return {column: _CSV_KIND_DTYPES.get(kind, kind) for column, kind in kinds.items()}
+
+
+# Type de lecture des classes de colonnes propres à infer_csv_dtypes
+_CSV_KIND_DTYPES: dict[Any, Any] = {
+    'null': np.dtype('float64'),
+    'bool': np.dtype('bool'),
+    'boolean': 'boolean',
+}
+
+
+def _chunk_column_kind(values: pd.Series, dtype: Any) -> Any:
+    # Classe d'une colonne dans un bloc : 'null' (entièrement vide), 'bool',
+    # 'boolean' (booléens et valeurs manquantes), un type numérique ou str
+    if len(values) and values.isna().all():
+        return 'null'
+    if dtype.kind == 'b':
+        return 'bool'
+    if dtype.kind in 'iuf':
+        return dtype
+    if pd.api.types.infer_dtype(values, skipna=True) == 'boolean':
+        return 'boolean'
+    return str
+
+
+def _merge_kinds(previous: Any, kind: Any) -> Any:
+    # Classe d'une colonne vue comme `previous` puis comme `kind`
+    if previous == kind:
+        return previous
+    if 'null' in (previous, kind):
+        other = kind if previous == 'null' else previous
+        if other in ('bool', 'boolean'):
+            return 'boolean'
+        if getattr(other, 'kind', None) in ('i', 'u'):
+            return np.dtype('float64')
+        return other
+    if {previous, kind} == {'bool', 'boolean'}:
+        return 'boolean'
+    if getattr(previous, 'kind', None) in ('i', 'u', 'f') and getattr(kind, 'kind', None) in ('i', 'u', 'f'):
+        return np.dtype('float64')
+    return str
+
+
+def iter_csv_chunks(
+    filepath: Path | str,
+    chunksize: int,
+    dtype: Optional[dict[str, Any]] = None,
+    schema: Optional[CsvSchema] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV par blocs de lignes.
+    
+    Args:
+        filepath: Chemin du fichier CSV
+        chunksize: Nombre de lignes par bloc
+        dtype: Types des colonnes (voir infer_csv_dtypes) ; sans eux, chaque
+            bloc infère ses propres types
+        schema: Schéma des colonnes (remplace dtype) : chaque bloc est typé
+            de la même façon par apply_schema
+    
+    Yields:
+        DataFrame de chaque bloc, dans l'ordre du fichier
+    
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+        pd.errors.ParserError: Si le CSV est mal formaté
+    """
+    path = Path(filepath)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier CSV non trouvé : {path}")
+    
+    try:
+        chunks = _read_csv_chunks(path, chunksize, dtype, schema)
+        yield from measure_iter('io.iter_csv_chunks', chunks, bytes_read=path.stat().st_size)
+    except pd.errors.ParserError as e:
+        raise pd.errors.ParserError(f"Erreur lors de la lecture du CSV : {e}")
+
+
+def _read_csv_chunks(
+    path: Path,
+    chunksize: int,
+    dtype: Optional[dict[str, Any]],
+    schema: Optional[CsvSchema],
+) -> Iterator[pd.DataFrame]:
+    if schema is not None:
+        with pd.read_csv(path, chunksize=chunksize, **read_options(schema)) as reader:
+            for chunk in reader:
+                yield apply_schema(chunk, schema)
+        return
+    with pd.read_csv(path, chunksize=chunksize, dtype=dtype) as reader:
+        yield from reader
+
+
+def write_csv(
+    df: pd.DataFrame,
+    filepath: Path | str,
+    index: bool = False,
+    append: bool = False,
+    fmt: str = 'csv',
+    compression: Optional[str] = None,
+    row_group_size: Optional[int] = None,
+) -> None:
+    """
+    Écrit un DataFrame pandas dans un fichier CSV (ou Parquet/Feather).
     
     Args:
         df: DataFrame à écrire
         filepath: Chemin de destination
         index: Si True, inclut l'index dans le fichier
+        append: Si True, ajoute les lignes (sans en-tête) à la fin du fichier
+            (CSV uniquement ; utiliser TableWriter pour écrire par blocs)
+        fmt: Format de sortie ('csv', 'parquet' ou 'feather')
+        compression: Codec des formats colonnes (voir TableWriter)
+        row_group_size: Nombre de lignes par groupe de lignes Parquet
+            (ROW_GROUP_SIZE par défaut)
     
     Raises:
+        ValueError: Si le format est inconnu ou ne permet pas l'ajout
+        ImportError: Si pyarrow n'est pas installé (Parquet/Feather)
         IOError: En cas d'erreur d'écriture
     """
+    if fmt != 'csv':
+        if append:
+            raise ValueError(f"Ajout impossible en format {fmt} : utiliser TableWriter")
+        with TableWriter(filepath, fmt, compression, row_group_size, index=index) as writer:
+            writer.write(df)
+        return
+    if compression is not None:
+        raise ValueError("La compression ne s'applique qu'aux formats parquet et feather")
+    
     path = Path(filepath)
     path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        df.to_csv(path, index=index)
+        with stage('io.write_csv') as s:
+            size_before = path.stat().st_size if s.enabled and append and path.exists() else 0
+            df.to_csv(path, index=index, mode='a' if append else 'w', header=not append)
+            if s.enabled:
+                s.add_items(len(df))
+                s.add_bytes_written(path.stat().st_size - size_before)
     except IOError as e:
         raise IOError(f"Erreur lors de l'écriture du CSV : {e}")
 
 
+class TableWriter:
+    """
+    Écriture d'un DataFrame par blocs successifs en CSV, Parquet ou Feather.
+    
+    En Parquet et en Feather (format Arrow IPC), les blocs sont accumulés
+    jusqu'à row_group_size lignes puis écrits en groupes de lignes (lots en
+    Feather) de cette taille : seul le dernier, écrit à la fermeture, peut
+    être plus petit, et les blocs vides n'en créent pas. Le schéma Arrow est
+    fixé par le premier bloc : les blocs suivants y sont convertis (en
+    Feather, les colonnes catégorielles sont stockées en texte).
+    
+    Exemple:
+        with TableWriter(output_dir / "data.parquet", 'parquet') as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+    
+    def __init__(
+        self,
+        filepath: Path | str,
+        fmt: str = 'csv',
+        compression: Optional[str] = None,
+        row_group_size: Optional[int] = None,
+        index: bool = False,
+    ) -> None:
+        """
+        Args:
+            filepath: Chemin de destination (remplacé s'il existe)
+            fmt: Format de sortie ('csv', 'parquet' ou 'feather')
+            compression: Codec Parquet ('snappy' par défaut, 'zstd', 'gzip',
+                'brotli', 'lz4', 'none') ou Feather ('lz4' par défaut,
+                'zstd', 'none') ; non disponible en CSV
+            row_group_size: Nombre de lignes par groupe de lignes Parquet ou
+                par lot Feather (ROW_GROUP_SIZE par défaut)
+            index: Si True, inclut l'index du DataFrame
+        
+        Raises:
+            ValueError: Si le format, la compression ou row_group_size est
+                invalide
+            ImportError: Si pyarrow n'est pas installé (Parquet/Feather)
+        """
+        if fmt not in TABLE_FORMATS:
+            raise ValueError(f"Format de sortie inconnu : {fmt}")
+        if fmt == 'csv' and compression is not None:
+            raise ValueError("La compression ne s'applique qu'aux formats parquet et feather")
+        if row_group_size is not None and row_group_size <= 0:
+            raise ValueError(f"Taille de groupe de lignes invalide : {row_group_size}")
+        if fmt != 'csv':
+            _require_pyarrow()
+        self.path = Path(filepath)
+        self.fmt = fmt
+        self.compression = compression
+        self.row_group_size = row_group_size or ROW_GROUP_SIZE
+        self.index = index
+        self.rows = 0
+        self._started = False
+        self._schema: Any = None
+        self._writer: Any = None
+        self._sink: Any = None
+        # Tables Arrow en attente d'un groupe de lignes complet
+        self._pending: list[Any] = []
+        self._pending_rows = 0
+    
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Ajoute les lignes d'un DataFrame au fichier.
+        
+        Args:
+            df: Bloc à écrire (mêmes colonnes que les blocs précédents)
+        
+        Raises:
+            IOError: En cas d'erreur d'écriture
+        """
+        try:
+            with stage('io.TableWriter') as s:
+                if self.fmt == 'csv':
+                    # Le premier bloc, même vide, écrit l'en-tête
+                    size_before = self.path.stat().st_size if s.enabled and self._started else 0
+                    write_csv(df, self.path, index=self.index, append=self._started)
+                    if s.enabled:
+                        s.add_bytes_written(self.path.stat().st_size - size_before)
+                else:
+                    self._write_arrow(df)
+                s.add_items(len(df))
+        except OSError as e:
+            raise IOError(f"Erreur lors de l'écriture de {self.path.name} : {e}")
+        self._started = True
+        self.rows += len(df)
+    
+    def close(self) -> None:
+        """Écrit le dernier groupe de lignes, termine le fichier (pied de page Parquet/Feather) et le ferme."""
+        if self._writer is None:
+            return
+        with stage('io.TableWriter') as s:
+            try:
+                self._flush_arrow(complete_only=False)
+            finally:
+                writer, self._writer = self._writer, None
+                self._pending, self._pending_rows = [], 0
+                writer.close()
+                sink, self._sink = self._sink, None
+                if sink is not None:
+                    sink.close()
+            if s.enabled:
+                s.add_bytes_written(self.path.stat().st_size)
+    
+    def _write_arrow(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        
+        if self._writer is None:
+            self._schema = _arrow_schema(df, self.fmt, self.index)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                
+                self._writer = pq.ParquetWriter(
+                    self.path, self._schema, compression=self.compression or 'snappy',
+                )
+            else:
+                import pyarrow.ipc as ipc
+                
+                codec = self.compression or 'lz4'
+                options = ipc.IpcWriteOptions(compression=None if codec == 'none' else codec)
+                self._sink = pa.OSFile(str(self.path), 'wb')
+                self._writer = ipc.new_file(self._sink, self._schema, options=options)
+        
+        # Le premier bloc, même vide, fixe le schéma ; les suivants vides
+        # ne produiraient que des groupes de lignes vides
+        if df.empty:
+            return
+        self._pending.append(pa.Table.from_pandas(df, schema=self._schema, preserve_index=self.index))
+        self._pending_rows += len(df)
+        if self._pending_rows >= self.row_group_size:
+            self._flush_arrow(complete_only=True)
+    
+    def _flush_arrow(self, complete_only: bool) -> None:
+        # Écrit les tables en attente : les groupes complets seulement, ou
+        # tout (fermeture) ; le reste attend les blocs suivants
+        import pyarrow as pa
+        
+        if not self._pending_rows:
+            return
+        table = pa.concat_tables(self._pending)
+        size = self._pending_rows
+        if complete_only:
+            size -= size % self.row_group_size
+        rest = table.slice(size)
+        if self.fmt == 'parquet':
+            self._writer.write_table(table.slice(0, size), row_group_size=self.row_group_size)
+        else:
+            # Un lot Feather ne couvre qu'un morceau de table : morceaux regroupés d'abord
+            table = table.slice(0, size).combine_chunks()
+            self._writer.write_table(table, max_chunksize=self.row_group_size)
+        self._pending = [rest] if len(rest) else []
+        self._pending_rows -= size
+    
+    def __enter__(self) -> "TableWriter":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_table(
+    filepath: Path | str,
+    columns: Optional[list[str]] = None,
+    dtype: Optional[dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Relit un fichier écrit par write_csv / TableWriter, d'après son extension.
+    
+    Parquet et Feather conservent les types et ne lisent que les colonnes
+    demandées ; un CSV est analysé avec les types fournis.
+    
+    Args:
+        filepath: Fichier .csv, .parquet ou .feather
+        columns: Colonnes à lire (toutes par défaut), dans cet ordre
+        dtype: Types à appliquer aux colonnes (dates comprises)
+    
+    Returns:
+        DataFrame
+    
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+        ValueError: Si l'extension n'est pas reconnue
+        ImportError: Si pyarrow n'est pas installé (Parquet/Feather)
+    """
+    path = Path(filepath)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier non trouvé : {path}")
+    
+    fmt = TABLE_SUFFIXES.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Format de fichier non reconnu : {path.name}")
+    
+    with stage('io.read_table') as s:
+        if fmt == 'csv':
+            dtype = dtype or {}
+            dates = [column for column, kind in dtype.items() if pd.api.types.is_datetime64_any_dtype(kind)]
+            df = pd.read_csv(
+                path,
+                usecols=columns,
+                dtype={column: kind for column, kind in dtype.items() if column not in dates},
+                parse_dates=dates,
+            )
+        else:
+            _require_pyarrow()
+            reader = pd.read_parquet if fmt == 'parquet' else pd.read_feather
+            df = reader(path, columns=columns)
+        
+        if columns is not None:
+            df = df[columns]
+        if dtype:
+            df = df.astype(dtype)
+        s.add_items(len(df))
+        s.add_bytes_read(path.stat().st_size)
+    return df
+
+
+def _arrow_schema(df: pd.DataFrame, fmt: str, index: bool) -> Any:
+    # Une colonne texte entièrement vide dans le premier bloc serait typée
+    # « null » par Arrow : on la type en texte pour accepter les blocs suivants.
+    # Un fichier Feather n'admet qu'un dictionnaire par colonne pour tous les
+    # lots : les catégories (propres à chaque bloc) y sont stockées en texte.
+    import pyarrow as pa
+    
+    schema = pa.Schema.from_pandas(df, preserve_index=index)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+        elif fmt == 'feather' and pa.types.is_dictionary(field.type):
+            schema = schema.set(i, field.with_type(field.type.value_type))
+    return schema
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Les formats parquet et feather nécessitent pyarrow "
+            "(uv pip install -e '.[columnar]')"
+        )
+
+
 def read_log_file(filepath: Path | str) -> list[str]:
     """
     Lit un fichier journal ligne par ligne.
@@ -74,17 +556,433 @@ def read_log_file(filepath: Path | str) -> list[str]:
         raise FileNotFoundError(f"Fichier journal non trouvé : {path}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            lines = [line.rstrip('\n') for line in f]
+        with stage('io.read_log_file') as s:
+            with open_file(path, 'r', encoding='utf-8') as f:
+                lines = [line.rstrip('\n') for line in f]
+            s.add_items(len(lines))
+            s.add_bytes_read(path.stat().st_size)
         return lines
     except Exception as e:
         raise IOError(f"Erreur lors de la lecture du fichier journal : {e}")
 
 
+class _BoundedReader(io.RawIOBase):
+    """Flux binaire en lecture seule limité à un nombre d'octets donné."""
+    
+    def __init__(self, raw: BinaryIO, limit: int) -> None:
+        self._raw = raw
+        self._remaining = limit
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer: Any) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._raw.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def iter_log_file(
+    filepath: Path | str,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Itère sur les lignes d'un fichier journal sans le charger en mémoire.
+    
+    Produit exactement les mêmes lignes que read_log_file, une par une.
+    Avec start/end, seule la plage d'octets [start, end[ est lue (bornes
+    alignées sur des débuts de ligne), pour la lecture incrémentale. Un
+    fichier compressé est toujours lu en entier (voir iter_log_line_blocks).
+    
+    Args:
+        filepath: Chemin du fichier journal
+        start: Offset de départ en octets
+        end: Offset de fin en octets (None = fin du fichier)
+    
+    Yields:
+        Lignes du fichier (sans caractères newline)
+    
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+    """
+    path = Path(filepath)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier journal non trouvé : {path}")
+    
+    try:
+        if is_compressed(path):
+            if _compressed_range_is_empty(path, start, end):
+                return
+            start, end = 0, None
+        
+        if start == 0 and end is None:
+            with open_file(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    yield line.rstrip('\n')
+            return
+        
+        with open(path, 'rb') as raw:
+            raw.seek(start)
+            if end is not None:
+                raw = _BoundedReader(raw, end - start)
+            with io.TextIOWrapper(io.BufferedReader(raw), encoding='utf-8') as f:
+                for line in f:
+                    yield line.rstrip('\n')
+    except Exception as e:
+        raise IOError(f"Erreur lors de la lecture du fichier journal : {e}")
+
+
+def iter_log_line_blocks(
+    filepath: Path | str,
+    start: int = 0,
+    end: Optional[int] = None,
+    block_size: int = READ_BLOCK_SIZE,
+) -> Iterator[list[bytes]]:
+    """
+    Découpe un fichier journal en lignes brutes (bytes), bloc par bloc.
+    
+    Le fichier est projeté en mémoire (mmap) et découpé par blocs alignés
+    sur les fins de ligne : aucun décodage n'est effectué et seul le bloc
+    courant est copié en mémoire. Les fins de ligne suivent la même règle
+    qu'open() en mode texte ('\\n', '\\r\\n' et '\\r' seul).
+    
+    Un fichier compressé (.gz, .bz2, .xz) est décompressé en flux. Ses
+    offsets portent sur les octets compressés et seules deux plages ont un
+    sens : (0, taille) ou end=None pour tout lire, et une plage vide
+    (start >= end) pour ne rien lire.
+    
+    Args:
+        filepath: Chemin du fichier journal
+        start: Offset de départ en octets (début de ligne)
+        end: Offset de fin en octets (None = fin du fichier)
+        block_size: Taille approximative d'un bloc en octets
+    
+    Yields:
+        Listes de lignes brutes, sans caractères de fin de ligne
+    
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+    """
+    path = Path(filepath)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier journal non trouvé : {path}")
+    
+    if is_compressed(path):
+        if not _compressed_range_is_empty(path, start, end):
+            blocks = _iter_compressed_line_blocks(path, block_size)
+            yield from measure_iter('io.iter_log_line_blocks', blocks, bytes_read=path.stat().st_size)
+        return
+    
+    size = path.stat().st_size
+    stop = size if end is None else min(end, size)
+    if start >= stop:
+        return
+    blocks = _iter_mapped_line_blocks(path, start, stop, block_size)
+    yield from measure_iter('io.iter_log_line_blocks', blocks, bytes_read=stop - start)
+
+
+def _iter_mapped_line_blocks(path: Path, start: int, stop: int, block_size: int) -> Iterator[list[bytes]]:
+    """Projette un fichier en mémoire et découpe [start, stop[ en blocs de lignes brutes."""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = start
+            while position < stop:
+                block_end = min(position + block_size, stop)
+                if block_end < stop:
+                    newline = mm.find(b'\n', block_end - 1, stop)
+                    block_end = stop if newline < 0 else newline + 1
+                
+                block = mm[position:block_end]
+                position = block_end
+                yield split_block(block)
+
+
+def _compressed_range_is_empty(path: Path, start: int, end: Optional[int]) -> bool:
+    """
+    Valide une plage de lecture sur un fichier compressé.
+    
+    Raises:
+        ValueError: Si la plage désigne une partie seulement du fichier
+    """
+    if end is not None and start >= end:
+        return True
+    if start != 0:
+        raise ValueError(f"Lecture partielle impossible sur un fichier compressé : {path}")
+    return False
+
+
+def _iter_compressed_line_blocks(path: Path, block_size: int) -> Iterator[list[bytes]]:
+    """Décompresse un fichier en flux et le découpe en blocs de lignes brutes."""
+    try:
+        with open_file(path, 'rb') as f:
+            pending = b''
+            while True:
+                data = f.read(block_size)
+                if not data:
+                    break
+                data = pending + data
+                cut = data.rfind(b'\n') + 1
+                if cut:
+                    yield split_block(data[:cut])
+                pending = data[cut:]
+            if pending:
+                yield split_block(pending)
+    except (OSError, EOFError, lzma.LZMAError) as e:
+        raise IOError(f"Erreur lors de la décompression de {path.name} : {e}")
+
+
+def split_block(block: bytes) -> list[bytes]:
+    """
+    Découpe un bloc d'octets (aligné sur une fin de ligne) en lignes brutes.
+    
+    Args:
+        block: Bloc lu d'un fichier journal, terminé par une fin de ligne
+            (sauf en fin de fichier)
+    
+    Returns:
+        Lignes sans leur fin de ligne ('\n', '\r\n' ou '\r' seul)
+    """
+    lines = block.split(b'\n')
+    if block.endswith(b'\n'):
+        lines.pop()
+    if b'\r' in block:
+        lines = _split_carriage_returns(lines)
+    return lines
+
+
+def prefetch_line_blocks(
+    sources: Iterable[tuple[Path, int, Optional[int]]],
+    threads: int = 4,
+    max_pending_blocks: int = 4,
+) -> Iterator[tuple[Path, Iterator[list[bytes]]]]:
+    """
+    Lit (et décompresse) plusieurs fichiers en parallèle dans des threads.
+    
+    Chaque fichier est découpé par iter_log_line_blocks dans un thread ; zlib,
+    bz2 et lzma libèrent le GIL pendant la décompression, ce qui permet de
+    décompresser plusieurs fichiers à la fois. Les fichiers sont restitués
+    dans l'ordre d'entrée, et au plus `max_pending_blocks` blocs attendent
+    par fichier en cours : la mémoire reste bornée.
+    
+    Args:
+        sources: Tuples (chemin, début, fin) comme pour iter_log_line_blocks
+        threads: Nombre de fichiers lus simultanément
+        max_pending_blocks: Nombre de blocs mis en attente par fichier
+    
+    Yields:
+        Tuples (chemin, itérateur de blocs de lignes brutes), dans l'ordre ;
+        chaque itérateur doit être consommé avant de passer au suivant
+    """
+    sources = list(sources)
+    if threads <= 1:
+        for path, start, end in sources:
+            yield path, iter_log_line_blocks(path, start, end)
+        return
+    
+    stop = threading.Event()
+    done = object()
+    
+    def produce(path: Path, start: int, end: Optional[int], out: queue.Queue) -> None:
+        try:
+            for block in iter_log_line_blocks(path, start, end):
+                while not stop.is_set():
+                    try:
+                        out.put(block, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            item: Any = done
+        except BaseException as e:  # transmis au consommateur
+            item = e
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def consume(out: queue.Queue) -> Iterator[list[bytes]]:
+        while True:
+            item = out.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        try:
+            queues = []
+            for path, start, end in sources:
+                out: queue.Queue = queue.Queue(maxsize=max_pending_blocks)
+                executor.submit(produce, path, start, end, out)
+                queues.append((path, out))
+            for path, out in queues:
+                yield path, consume(out)
+        finally:
+            stop.set()
+
+
+def _split_carriage_returns(lines: list[bytes]) -> list[bytes]:
+    """Applique la règle des fins de ligne universelles ('\\r\\n' et '\\r' seul)."""
+    result: list[bytes] = []
+    for line in lines:
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        if b'\r' in line:
+            result.extend(line.split(b'\r'))
+        else:
+            result.append(line)
+    return result
+
+
+class BufferedLineWriters:
+    """
+    Ensemble de fichiers de sortie tamponnés, ouverts à la demande.
+    
+    Chaque clé correspond à un fichier `<clé>.log` dans le répertoire cible
+    (une clé peut contenir des sous-répertoires : "level=ERROR/date=..."). Un
+    fichier n'est créé qu'à la première ligne écrite, comme le ferait
+    write_text_file avec le contenu complet.
+    
+    Avec max_open, le nombre de fichiers ouverts simultanément est borné : le
+    plus ancien est fermé au besoin puis rouvert en ajout s'il resert.
+    
+    Exemple:
+        with BufferedLineWriters(output_dir) as writers:
+            writers.write('info', line)
+    """
+    
+    def __init__(
+        self,
+        directory: Path | str,
+        suffix: str = ".log",
+        buffer_size: int = WRITE_BUFFER_SIZE,
+        append: bool = False,
+        compression: Optional[str] = None,
+        max_open: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            directory: Répertoire des fichiers de sortie
+            suffix: Extension ajoutée à chaque clé
+            buffer_size: Taille du tampon d'écriture de chaque fichier
+            append: Si True, ajoute à la fin des fichiers existants
+            compression: 'gz', 'bz2' ou 'xz' pour compresser les sorties
+                (l'extension correspondante est ajoutée au suffixe)
+            max_open: Nombre maximal de fichiers ouverts (None = sans limite)
+        """
+        if compression is not None:
+            if compression not in COMPRESSION_CHOICES:
+                raise ValueError(f"Compression inconnue : {compression}")
+            suffix = f"{suffix}.{compression}"
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.buffer_size = buffer_size
+        self.append = append
+        self.max_open = max_open
+        self.counts: dict[str, int] = {}
+        self._handles: dict[str, TextIO] = {}
+        self._initial_sizes: dict[str, int] = {}
+    
+    def write(self, key: str, line: str) -> None:
+        """
+        Écrit une ligne (suivie d'un newline) dans le fichier associé à la clé.
+        
+        Args:
+            key: Nom du fichier de sortie (sans suffixe)
+            line: Ligne à écrire, sans newline
+        """
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._open(key)
+        handle.write(line)
+        handle.write('\n')
+        self.counts[key] += 1
+    
+    def write_block(self, key: str, block: str, count: int) -> None:
+        """
+        Écrit un bloc de lignes déjà terminées par un newline.
+        
+        Args:
+            key: Nom du fichier de sortie (sans suffixe)
+            block: Lignes concaténées, chacune suivie de '\\n'
+            count: Nombre de lignes contenues dans le bloc
+        """
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._open(key)
+        handle.write(block)
+        self.counts[key] += count
+    
+    def flush(self) -> None:
+        """Vide les tampons des fichiers ouverts (les lignes écrites deviennent lisibles)."""
+        for handle in self._handles.values():
+            handle.flush()
+    
+    def path_for(self, key: str) -> Path:
+        """Retourne le chemin du fichier associé à une clé."""
+        return self.directory / f"{key}{self.suffix}"
+    
+    def close(self) -> None:
+        """Vide les tampons et ferme tous les fichiers ouverts."""
+        handles, self._handles = self._handles, {}
+        if not handles:
+            return
+        with stage('io.BufferedLineWriters') as s:
+            for handle in handles.values():
+                handle.close()
+            if s.enabled:
+                # Tous les fichiers écrits, y compris ceux déjà fermés (max_open)
+                s.add_items(sum(self.counts.values()))
+                s.add_bytes_written(sum(
+                    self.path_for(key).stat().st_size - size for key, size in self._initial_sizes.items()
+                ))
+    
+    def _open(self, key: str) -> TextIO:
+        if self.max_open is not None and len(self._handles) >= self.max_open:
+            oldest = next(iter(self._handles))
+            self._handles.pop(oldest).close()
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Un fichier déjà écrit (puis fermé pour respecter max_open) est complété
+        reopened = key in self.counts
+        mode = 'a' if self.append or reopened else 'w'
+        if not reopened:
+            self._initial_sizes[key] = path.stat().st_size if self.append and path.exists() else 0
+        try:
+            if is_compressed(path):
+                handle = open_file(path, mode, encoding='utf-8')
+            else:
+                handle = open(path, mode, encoding='utf-8', buffering=self.buffer_size)
+        except IOError as e:
+            raise IOError(f"Erreur lors de l'écriture du fichier : {e}")
+        self._handles[key] = handle
+        self.counts.setdefault(key, 0)
+        return handle
+    
+    def __enter__(self) -> "BufferedLineWriters":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
 def write_text_file(content: str, filepath: Path | str, append: bool = False) -> None:
     """
     Écrit du contenu texte dans un fichier.
     
+    Le fichier est compressé si son extension est .gz, .bz2 ou .xz.
+    
     Args:
         content: Contenu à écrire
         filepath: Chemin de destination
@@ -97,22 +995,28 @@ def write_text_file(content: str, filepath: Path | str, append: bool = False) ->
     path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        mode = 'a' if append else 'w'
-        with open(path, mode, encoding='utf-8') as f:
-            f.write(content)
+        with stage('io.write_text_file') as s:
+            size_before = path.stat().st_size if s.enabled and append and path.exists() else 0
+            mode = 'a' if append else 'w'
+            with open_file(path, mode, encoding='utf-8') as f:
+                f.write(content)
+            if s.enabled:
+                s.add_items(content.count('\n'))
+                s.add_bytes_written(path.stat().st_size - size_before)
     except IOError as e:
         raise IOError(f"Erreur lors de l'écriture du fichier : {e}")
 
 
 def get_all_log_files(logs_dir: Path | str) -> list[Path]:
     """
-    Récupère tous les fichiers .log d'un répertoire.
+    Récupère tous les fichiers .log d'un répertoire, y compris les journaux
+    compressés (.log.gz, .log.bz2, .log.xz).
     
     Args:
         logs_dir: Répertoire contenant les logs
     
     Returns:
-        Liste de chemins des fichiers .log triés
+        Liste de chemins des fichiers journaux triés
     
     Raises:
         NotADirectoryError: Si le chemin n'est pas un répertoire
@@ -122,5 +1026,7 @@ def get_all_log_files(logs_dir: Path | str) -> list[Path]:
     if not logs_path.is_dir():
         raise NotADirectoryError(f"Le chemin n'est pas un répertoire : {logs_path}")
     
-    log_files = sorted(logs_path.glob("*.log"))
+    log_files = sorted(
+        path for pattern in LOG_FILE_PATTERNS for path in logs_path.glob(pattern)
+    )
     return log_files
@@ -0,0 +1,529 @@
+"""
+Index inversé des logs organisés (mot → lignes qui le contiennent).
+
+Chaque message est découpé en mots (minuscules, 2 caractères au moins) ; un
+mot renvoie à la liste triée des positions des lignes qui le contiennent,
+une position combinant le numéro du fichier et l'offset de la ligne dans ce
+fichier. Les listes sont stockées par écarts successifs en entiers de
+longueur variable (7 bits par octet) : quelques octets par occurrence.
+
+La construction est un tri externe : les occurrences sont triées par lots
+de RUN_MAX_POSTINGS (fichiers temporaires), puis les lots sont fusionnés
+mot par mot, au plus RUN_MERGE_FAN_IN à la fois ; la mémoire et le nombre
+de fichiers ouverts ne dépendent pas du volume des journaux.
+
+Les mots sont rangés dans l'ordre dans une table binaire ; seul le premier
+mot de chaque bloc de TERMS_BLOCK_SIZE entrées est chargé. Une recherche
+lit le bloc du mot demandé et sa liste, puis se positionne directement sur
+les lignes trouvées, sans relire les journaux.
+
+Exemple:
+    build_log_index(output_dir / 'logs_organized')
+    index = LogIndex(output_dir / 'logs_organized')
+    for path, line in index.search(['timeout', 'auth'], levels=['ERROR']):
+        print(path.name, line)
+"""
+
+import bisect
+import heapq
+import itertools
+import json
+import os
+import re
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Collection, Iterable, Iterator, Optional
+import numpy as np
+
+from .logs import DEFAULT_PARSER
+from .metrics import stage
+
+
+# Répertoire de l'index, à l'intérieur du répertoire des logs organisés
+INDEX_DIRNAME = '.index'
+
+# Fichiers de l'index : description (JSON), table des mots triée et listes de positions
+META_FILENAME = 'index.json'
+TERMS_FILENAME = 'terms.bin'
+POSTINGS_FILENAME = 'postings.bin'
+
+INDEX_VERSION = 1
+
+# Occurrences triées en mémoire avant d'être écrites dans un lot
+# temporaire (12 octets chacune, soit environ 50 Mo)
+RUN_MAX_POSTINGS = 4_000_000
+
+# Lots fusionnés à la fois (autant de fichiers ouverts) ; au-delà, la fusion
+# se fait en plusieurs passes par lots intermédiaires
+RUN_MERGE_FAN_IN = 64
+
+# Entrées de la table des mots par bloc (un mot par bloc gardé en mémoire)
+TERMS_BLOCK_SIZE = 128
+
+# Position d'une ligne = (numéro de fichier << OFFSET_BITS) | offset
+OFFSET_BITS = 40
+
+_TOKEN_RE = re.compile(r'\w{2,}')
+
+# Entrée d'un lot : longueur du mot, lignes, dernière position, octets des écarts
+_RUN_ENTRY = struct.Struct('<IQQQ')
+
+# Entrée de la table des mots : longueur du mot, début et octets de sa liste, lignes
+_TERM_ENTRY = struct.Struct('<IQQQ')
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Découpe un texte en mots indexables (minuscules, sans doublon).
+    
+    Args:
+        text: Message ou terme de recherche
+    
+    Returns:
+        Mots dans leur ordre d'apparition
+    """
+    return list(dict.fromkeys(_TOKEN_RE.findall(text.lower())))
+
+
+def build_log_index(logs_output_dir: Path | str) -> dict[str, int]:
+    """
+    Construit (ou reconstruit) l'index des fichiers .log d'un répertoire.
+    
+    Les sous-répertoires (logs partitionnés level=.../date=...) sont
+    parcourus. Seuls les fichiers non compressés sont indexés : une recherche doit
+    pouvoir se positionner directement sur une ligne. L'index est écrit de
+    façon atomique dans INDEX_DIRNAME.
+    
+    Args:
+        logs_output_dir: Répertoire des logs organisés (info.log, error.log...)
+    
+    Returns:
+        Statistiques : fichiers, lignes, mots distincts, occurrences, octets
+    
+    Raises:
+        IOError: En cas d'erreur d'écriture de l'index
+    """
+    directory = Path(logs_output_dir)
+    log_files = sorted(
+        path for path in directory.rglob('*.log')
+        if INDEX_DIRNAME not in path.relative_to(directory).parts
+    )
+    
+    index_dir = directory / INDEX_DIRNAME
+    index_dir.mkdir(parents=True, exist_ok=True)
+    files: list[dict[str, Any]] = []
+    lines = 0
+    with stage('index_logs') as s, tempfile.TemporaryDirectory(dir=index_dir, prefix='runs.') as runs_dir:
+        runs: list[Path] = []
+        term_ids: dict[str, int] = {}
+        ids = array('I')
+        positions = array('Q')
+        
+        def flush_run() -> None:
+            # Les lots couvrent des positions croissantes : leur ordre est celui des lignes
+            if positions:
+                runs.append(Path(runs_dir) / f'{len(runs)}.run')
+                _write_run(runs[-1], term_ids, ids, positions)
+                term_ids.clear()
+                del ids[:], positions[:]
+        
+        for file_id, log_file in enumerate(log_files):
+            stat = log_file.stat()
+            files.append({'name': log_file.relative_to(directory).as_posix(), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+            base = file_id << OFFSET_BITS
+            offset = 0
+            with open(log_file, 'rb') as f:
+                for raw in f:
+                    line = raw.rstrip(b'\r\n').decode('utf-8', errors='replace')
+                    entry = DEFAULT_PARSER.parse(line)
+                    for token in tokenize(entry[2] if entry else line):
+                        ids.append(term_ids.setdefault(token, len(term_ids)))
+                        positions.append(base + offset)
+                    offset += len(raw)
+                    lines += 1
+                    if len(positions) >= RUN_MAX_POSTINGS:
+                        flush_run()
+        flush_run()
+        
+        stats = _merge_runs(_reduce_runs(runs, Path(runs_dir)), index_dir, files)
+        s.add_items(lines)
+        s.add_bytes_read(sum(entry['size'] for entry in files))
+        s.add_bytes_written(stats['bytes'])
+    
+    return {'files': len(files), 'lines': lines, **stats}
+
+
+class LogIndex:
+    """
+    Index inversé chargé depuis le disque, pour les recherches.
+    
+    Les listes de positions ne sont lues qu'à la demande ; les fichiers
+    indexés ne sont ouverts que pour lire les lignes trouvées.
+    """
+    
+    def __init__(self, logs_output_dir: Path | str) -> None:
+        """
+        Args:
+            logs_output_dir: Répertoire des logs organisés
+        
+        Raises:
+            FileNotFoundError: Si l'index n'a pas été construit
+            ValueError: Si l'index est invalide ou ne correspond plus aux
+                fichiers (logs réécrits depuis sa construction)
+        """
+        self.directory = Path(logs_output_dir)
+        index_dir = self.directory / INDEX_DIRNAME
+        meta_path = index_dir / META_FILENAME
+        if not meta_path.exists():
+            raise FileNotFoundError(
+                f"Index introuvable dans {self.directory} (relancez le traitement avec --index)"
+            )
+        try:
+            content = json.loads(meta_path.read_text(encoding='utf-8'))
+        except ValueError as e:
+            raise ValueError(f"Index invalide {meta_path} : {e}")
+        if content.get('version') != INDEX_VERSION:
+            raise ValueError(f"Version d'index non prise en charge : {meta_path}")
+        
+        self.files = [self.directory / entry['name'] for entry in content['files']]
+        self._terms_path = index_dir / TERMS_FILENAME
+        self._postings_path = index_dir / POSTINGS_FILENAME
+        # Premier mot et position de chaque bloc de la table des mots
+        self._block_terms = [term for term, _ in content['blocks']]
+        self._block_offsets = [offset for _, offset in content['blocks']] + [content['terms_size']]
+        # Écriture interrompue entre les fichiers : la description ne
+        # correspond pas aux données
+        for path, size in ((self._terms_path, content['terms_size']), (self._postings_path, content['postings_size'])):
+            if not path.exists() or path.stat().st_size != size:
+                raise ValueError(f"Index incomplet dans {self.directory} (relancez le traitement avec --index)")
+        
+        for path, entry in zip(self.files, content['files']):
+            stat = path.stat() if path.exists() else None
+            if stat is None or (stat.st_size, stat.st_mtime_ns) != (entry['size'], entry['mtime_ns']):
+                raise ValueError(
+                    f"Index obsolète : {path.name} a changé depuis sa construction "
+                    "(relancez le traitement avec --index)"
+                )
+    
+    def lookup(self, token: str) -> np.ndarray:
+        """
+        Positions des lignes contenant un mot.
+        
+        Seuls le bloc de la table des mots qui peut le contenir et sa liste
+        de positions sont lus.
+        
+        Args:
+            token: Mot tel que produit par tokenize
+        
+        Returns:
+            Tableau uint64 trié des positions (vide si le mot est absent)
+        """
+        block = bisect.bisect_right(self._block_terms, token) - 1
+        if block < 0:
+            return np.empty(0, dtype=np.uint64)
+        with open(self._terms_path, 'rb') as f:
+            f.seek(self._block_offsets[block])
+            data = f.read(self._block_offsets[block + 1] - self._block_offsets[block])
+        entry = _find_term(data, token.encode('utf-8'))
+        if entry is None:
+            return np.empty(0, dtype=np.uint64)
+        start, length = entry
+        with open(self._postings_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(length)
+        return np.cumsum(_decode_varints(data), dtype=np.uint64)
+    
+    def search(
+        self,
+        terms: Iterable[str],
+        levels: Optional[Collection[str]] = None,
+        match_any: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[tuple[Path, str]]:
+        """
+        Recherche les lignes contenant des mots, éventuellement par niveau.
+        
+        Sans mot, toutes les lignes des niveaux demandés sont retournées.
+        
+        Args:
+            terms: Mots ou expressions recherchés (découpés comme les messages)
+            levels: Niveaux à conserver (None = tous), d'après le fichier
+                de chaque ligne (error.log, ou level=ERROR/... si partitionné)
+            match_any: Si True, une ligne contenant l'un des mots suffit ;
+                sinon elle doit les contenir tous
+            limit: Nombre maximal de lignes retournées (None = toutes)
+        
+        Yields:
+            Tuples (fichier, ligne sans newline), dans l'ordre des fichiers
+            puis des lignes
+        """
+        tokens = [token for term in terms for token in tokenize(term)]
+        file_ids = self._file_ids(levels)
+        if not tokens:
+            yield from self._scan(file_ids, limit)
+            return
+        
+        found = self.lookup(tokens[0])
+        for token in tokens[1:]:
+            other = self.lookup(token)
+            found = np.union1d(found, other) if match_any else np.intersect1d(found, other, assume_unique=True)
+        found = found[np.isin(found >> np.uint64(OFFSET_BITS), file_ids)]
+        if limit is not None:
+            found = found[:limit]
+        
+        handles: dict[int, Any] = {}
+        try:
+            for position in found.tolist():
+                file_id, offset = position >> OFFSET_BITS, position & ((1 << OFFSET_BITS) - 1)
+                handle = handles.get(file_id)
+                if handle is None:
+                    handle = handles[file_id] = open(self.files[file_id], 'rb')
+                handle.seek(offset)
+                line = handle.readline().rstrip(b'\r\n').decode('utf-8', errors='replace')
+                yield self.files[file_id], line
+        finally:
+            for handle in handles.values():
+                handle.close()
+    
+    def _file_ids(self, levels: Optional[Collection[str]]) -> list[int]:
+        if levels is None:
+            return list(range(len(self.files)))
+        names = {f"{level.lower()}.log" for level in levels}
+        partitions = {f"level={level.upper()}" for level in levels}
+        return [
+            file_id for file_id, path in enumerate(self.files)
+            if path.name in names or path.relative_to(self.directory).parts[0] in partitions
+        ]
+    
+    def _scan(self, file_ids: list[int], limit: Optional[int]) -> Iterator[tuple[Path, str]]:
+        # Recherche par niveau seul : lecture séquentielle des fichiers concernés
+        remaining = limit
+        for file_id in file_ids:
+            with open(self.files[file_id], 'rb') as f:
+                for raw in f:
+                    if remaining is not None:
+                        if remaining <= 0:
+                            return
+                        remaining -= 1
+                    yield self.files[file_id], raw.rstrip(b'\r\n').decode('utf-8', errors='replace')
+
+
+def _write_run(
+    run_path: Path,
+    term_ids: dict[str, int],
+    ids: array,
+    positions: array,
+) -> None:
+    """
+    Trie un lot d'occurrences par mot puis par position et l'écrit par écarts.
+    
+    Chaque mot du lot donne une entrée _RUN_ENTRY suivie du mot et de ses
+    écarts (le premier est la position elle-même), dans l'ordre des mots.
+    """
+    names = sorted(term_ids)
+    rank = np.empty(len(names), dtype=np.uint32)
+    rank[[term_ids[name] for name in names]] = np.arange(len(names), dtype=np.uint32)
+    ids_np = rank[np.frombuffer(ids, dtype=np.uint32)]
+    positions_np = np.frombuffer(positions, dtype=np.uint64)
+    order = np.lexsort((positions_np, ids_np))
+    ids_np, positions_np = ids_np[order], positions_np[order]
+    
+    # Première occurrence de chaque mot
+    starts = np.flatnonzero(ids_np[1:] != ids_np[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], len(ids_np))
+    
+    # Écart avec la position précédente du même mot (la première est gardée telle quelle)
+    deltas = np.diff(positions_np, prepend=np.uint64(0))
+    deltas[starts] = positions_np[starts]
+    
+    data, sizes = _encode_varints(deltas)
+    data = memoryview(data)
+    byte_offsets = np.concatenate(([0], np.cumsum(sizes))).tolist()
+    with open(run_path, 'wb') as f:
+        for term_start, term_end in zip(starts.tolist(), ends.tolist()):
+            term = names[ids_np[term_start]].encode('utf-8')
+            begin, end = byte_offsets[term_start], byte_offsets[term_end]
+            f.write(_RUN_ENTRY.pack(len(term), term_end - term_start, int(positions_np[term_end - 1]), end - begin))
+            f.write(term)
+            f.write(data[begin:end])
+
+
+def _iter_run(run_path: Path) -> Iterator[tuple[bytes, int, int, bytes]]:
+    """Relit un lot : (mot, lignes, dernière position, écarts), dans l'ordre des mots."""
+    with open(run_path, 'rb') as f:
+        while header := f.read(_RUN_ENTRY.size):
+            term_size, count, last, size = _RUN_ENTRY.unpack(header)
+            yield f.read(term_size), count, last, f.read(size)
+
+
+def _iter_merged(runs: list[Path]) -> Iterator[tuple[bytes, int, int, list[bytes | memoryview]]]:
+    """
+    Fusionne des lots mot par mot : (mot, lignes, dernière position, morceaux des écarts).
+    
+    Pour un même mot, les listes des lots sont mises bout à bout dans l'ordre
+    des lots ; seul le premier écart de chacune est recalculé (par rapport à
+    la dernière position du lot précédent), le reste est recopié tel quel.
+    """
+    merged = heapq.merge(*(_iter_run(run) for run in runs), key=lambda entry: entry[0])
+    for term, group in itertools.groupby(merged, key=lambda entry: entry[0]):
+        count, previous, pieces = 0, None, []
+        for _, run_count, last, data in group:
+            if previous is None:
+                pieces.append(data)
+            else:
+                first, size = _read_varint(data)
+                pieces.append(_encode_varint(first - previous))
+                pieces.append(memoryview(data)[size:])
+            count += run_count
+            previous = last
+        yield term, count, previous, pieces
+
+
+def _reduce_runs(runs: list[Path], runs_dir: Path) -> list[Path]:
+    """
+    Fusionne les lots par groupes consécutifs de RUN_MERGE_FAN_IN, en autant
+    de passes qu'il faut pour qu'il en reste au plus RUN_MERGE_FAN_IN.
+    
+    Les lots intermédiaires ont le format de _write_run et couvrent toujours
+    des positions croissantes ; les lots fusionnés sont supprimés au fur et
+    à mesure.
+    """
+    passes = 0
+    while len(runs) > RUN_MERGE_FAN_IN:
+        passes += 1
+        reduced: list[Path] = []
+        for first in range(0, len(runs), RUN_MERGE_FAN_IN):
+            group = runs[first:first + RUN_MERGE_FAN_IN]
+            if len(group) == 1:
+                reduced.append(group[0])
+                continue
+            reduced.append(runs_dir / f'{passes}.{len(reduced)}.run')
+            with open(reduced[-1], 'wb') as f:
+                for term, count, last, pieces in _iter_merged(group):
+                    f.write(_RUN_ENTRY.pack(len(term), count, last, sum(len(piece) for piece in pieces)))
+                    f.write(term)
+                    f.writelines(pieces)
+            for run in group:
+                run.unlink()
+        runs = reduced
+    return runs
+
+
+def _merge_runs(runs: list[Path], index_dir: Path, files: list[dict[str, Any]]) -> dict[str, int]:
+    """
+    Fusionne les lots en listes de positions et table des mots, puis écrit l'index.
+    
+    Returns:
+        Statistiques : mots distincts, occurrences, octets des positions
+    
+    Raises:
+        IOError: En cas d'erreur d'écriture de l'index
+    """
+    blocks: list[list[Any]] = []
+    terms = postings = 0
+    tmp_paths = {name: index_dir / (name + '.tmp') for name in (POSTINGS_FILENAME, TERMS_FILENAME, META_FILENAME)}
+    try:
+        with open(tmp_paths[POSTINGS_FILENAME], 'wb') as postings_file, \
+                open(tmp_paths[TERMS_FILENAME], 'wb') as terms_file:
+            for term, count, _, pieces in _iter_merged(runs):
+                start = postings_file.tell()
+                postings_file.writelines(pieces)
+                if terms % TERMS_BLOCK_SIZE == 0:
+                    blocks.append([term.decode('utf-8'), terms_file.tell()])
+                terms_file.write(_TERM_ENTRY.pack(len(term), start, postings_file.tell() - start, count))
+                terms_file.write(term)
+                terms += 1
+                postings += count
+            postings_size, terms_size = postings_file.tell(), terms_file.tell()
+        
+        content = json.dumps(
+            {
+                'version': INDEX_VERSION, 'files': files, 'postings_size': postings_size,
+                'terms_size': terms_size, 'blocks': blocks,
+            },
+            ensure_ascii=False, separators=(',', ':'),
+        )
+        tmp_paths[META_FILENAME].write_text(content, encoding='utf-8')
+        # Description en dernier : tant qu'elle n'est pas remplacée, l'ancien
+        # index est détecté comme incomplet plutôt que lu de travers
+        for name in (POSTINGS_FILENAME, TERMS_FILENAME, META_FILENAME):
+            os.replace(tmp_paths[name], index_dir / name)
+    except OSError as e:
+        for path in tmp_paths.values():
+            path.unlink(missing_ok=True)
+        raise IOError(f"Erreur lors de l'écriture de l'index : {e}")
+    return {'terms': terms, 'postings': postings, 'bytes': postings_size}
+
+
+def _find_term(block: bytes, term: bytes) -> Optional[tuple[int, int]]:
+    """Cherche un mot dans un bloc de la table des mots : (début, octets) de sa liste."""
+    position = 0
+    while position < len(block):
+        term_size, start, length, _ = _TERM_ENTRY.unpack_from(block, position)
+        position += _TERM_ENTRY.size
+        if block[position:position + term_size] == term:
+            return start, length
+        position += term_size
+    return None
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode un entier positif comme _encode_varints."""
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(data: bytes) -> tuple[int, int]:
+    """Décode le premier entier de `data` : (valeur, nombre d'octets)."""
+    value = shift = size = 0
+    while True:
+        byte = data[size]
+        value |= (byte & 0x7F) << shift
+        size += 1
+        if byte < 0x80:
+            return value, size
+        shift += 7
+
+
+def _encode_varints(values: np.ndarray) -> tuple[bytes, np.ndarray]:
+    """
+    Encode des entiers positifs sur 7 bits par octet (bit de poids fort = suite).
+    
+    Returns:
+        Octets encodés et nombre d'octets de chaque valeur
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        sizes += rest > 0
+        rest >>= np.uint64(7)
+    
+    out = np.empty(int(sizes.sum()), dtype=np.uint8)
+    starts = np.cumsum(sizes) - sizes
+    for k in range(int(sizes.max()) if len(sizes) else 0):
+        mask = sizes > k
+        byte = (values[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (sizes[mask] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[mask] + k] = byte | more
+    return out.tobytes(), sizes
+
+
+def _decode_varints(data: bytes) -> np.ndarray:
+    """Décode une suite d'entiers encodés par _encode_varints."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return np.empty(0, dtype=np.uint64)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Rang de chaque octet dans sa valeur
+    rank = np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)
+    parts = (raw & 0x7F).astype(np.uint64) << (rank.astype(np.uint64) * np.uint64(7))
+    return np.add.reduceat(parts, starts)
@@ -0,0 +1,296 @@
+"""
+Analyse des lignes de journaux au format [TIMESTAMP] LEVEL: MESSAGE.
+"""
+
+import re
+from pathlib import Path
+from typing import Collection, Iterable, Iterator, Optional
+
+from .io import iter_log_line_blocks
+
+
+# Niveaux reconnus, dans l'ordre d'affichage ; OTHER regroupe le reste
+LOG_LEVELS = ('INFO', 'DEBUG', 'WARNING', 'ERROR', 'OTHER')
+
+# Pattern: [YYYY-MM-DD HH:MM:SS] LEVEL: MESSAGE
+_LOG_RE = re.compile(r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]\s+(\w+):\s+(.*)')
+
+# Politiques de décodage des octets invalides : celles de bytes.decode,
+# plus 'skip' qui ignore la ligne entière
+DECODE_ERROR_POLICIES = ('strict', 'replace', 'ignore', 'backslashreplace', 'skip')
+
+# Position du ']' fermant l'horodatage (largeur fixe : "[YYYY-MM-DD HH:MM:SS]")
+_TIMESTAMP_END = 20
+
+
+# Ligne analysée : (timestamp, level, message)
+LogEntry = tuple[str, str, str]
+
+
+def parse_log_entry(log_line: str) -> dict[str, str] | None:
+    """
+    Parse une ligne de journal au format [TIMESTAMP] LEVEL: MESSAGE.
+    
+    Args:
+        log_line: Ligne du journal
+    
+    Returns:
+        Dictionnaire avec 'timestamp', 'level', 'message' ou None si format invalide
+    """
+    # Pattern: [YYYY-MM-DD HH:MM:SS] LEVEL: MESSAGE
+    pattern = r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]\s+(\w+):\s+(.*)'
+    match = re.match(pattern, log_line)
+    
+    if match:
+        return {
+            'timestamp': match.group(1),
+            'level': match.group(2),
+            'message': match.group(3),
+        }
+    return None
+
+
+class LogParser:
+    """
+    Analyseur de lignes de journal précompilé, avec API par lots.
+    
+    Le préfixe "[YYYY-MM-DD HH:MM:SS]" étant de largeur fixe, les lignes
+    qui n'ont pas '[' en position 0 et ']' en position 20 sont rejetées
+    par simple comparaison de caractères ; les autres passent par une
+    expression régulière compilée une seule fois. Pour le classement,
+    les niveaux connus sont intégrés à l'expression : aucun objet n'est
+    créé par ligne.
+    
+    Les résultats sont identiques à ceux de parse_log_entry.
+    
+    Exemple:
+        parser = LogParser()
+        levels = parser.classify_many(lines)
+    """
+    
+    def __init__(self, levels: Iterable[str] = LOG_LEVELS) -> None:
+        """
+        Args:
+            levels: Niveaux reconnus ; les autres lignes sont classées 'OTHER'
+        """
+        self.levels = tuple(levels)
+        alternatives = '|'.join(
+            re.escape(level) for level in sorted(self.levels, key=len, reverse=True)
+        )
+        self._level_re = re.compile(
+            r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]\s+(' + alternatives + r'):\s'
+        )
+        # Équivalent sur les octets bruts (ASCII uniquement : les lignes non
+        # ASCII sont décodées puis classées par _level_re). Sur str, \s inclut
+        # aussi les séparateurs ASCII \x1c-\x1f.
+        self._level_bytes_re = re.compile(
+            rb'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\][\s\x1c-\x1f]+('
+            + alternatives.encode('ascii') + rb'):[\s\x1c-\x1f]'
+        )
+        self._bytes_levels = {level.encode('ascii'): level for level in self.levels}
+    
+    def parse(self, log_line: str) -> LogEntry | None:
+        """
+        Analyse une ligne de journal.
+        
+        Args:
+            log_line: Ligne du journal
+        
+        Returns:
+            Tuple (timestamp, level, message) ou None si format invalide
+        """
+        if log_line[:1] != '[' or log_line[_TIMESTAMP_END:_TIMESTAMP_END + 1] != ']':
+            return None
+        match = _LOG_RE.match(log_line)
+        if match is None:
+            return None
+        return match.groups()
+    
+    def level_of(self, log_line: str) -> str:
+        """
+        Retourne le niveau de classement d'une ligne.
+        
+        Args:
+            log_line: Ligne du journal
+        
+        Returns:
+            Niveau reconnu, ou 'OTHER' si la ligne est invalide ou le niveau inconnu
+        """
+        if log_line[:1] != '[' or log_line[_TIMESTAMP_END:_TIMESTAMP_END + 1] != ']':
+            return 'OTHER'
+        match = self._level_re.match(log_line)
+        return match[1] if match else 'OTHER'
+    
+    def parse_many(self, lines: Iterable[str]) -> list[LogEntry | None]:
+        """
+        Analyse un lot de lignes en un seul appel.
+        
+        Args:
+            lines: Liste ou itérateur de lignes
+        
+        Returns:
+            Liste de tuples (timestamp, level, message) ou None, dans l'ordre des lignes
+        """
+        match = _LOG_RE.match
+        end = _TIMESTAMP_END
+        results: list[LogEntry | None] = []
+        append = results.append
+        for line in lines:
+            if line[:1] == '[' and line[end:end + 1] == ']':
+                m = match(line)
+                append(m.groups() if m else None)
+            else:
+                append(None)
+        return results
+    
+    def classify_many(self, lines: Iterable[str]) -> list[str]:
+        """
+        Retourne le niveau de classement de chaque ligne d'un lot.
+        
+        Args:
+            lines: Liste ou itérateur de lignes
+        
+        Returns:
+            Liste de niveaux, dans l'ordre des lignes
+        """
+        match = self._level_re.match
+        end = _TIMESTAMP_END
+        results: list[str] = []
+        append = results.append
+        for line in lines:
+            if line[:1] == '[' and line[end:end + 1] == ']':
+                m = match(line)
+                append(m[1] if m else 'OTHER')
+            else:
+                append('OTHER')
+        return results
+    
+    
+    def classify_many_bytes(self, raw_lines: Iterable[bytes]) -> list[str]:
+        """
+        Classe un lot de lignes brutes (UTF-8) sans les décoder.
+        
+        Seules les lignes contenant des octets non ASCII sont décodées (avec
+        remplacement des octets invalides) pour être classées exactement comme
+        par classify_many.
+        
+        Args:
+            raw_lines: Lignes brutes, sans fin de ligne
+        
+        Returns:
+            Liste de niveaux, dans l'ordre des lignes
+        """
+        match = self._level_bytes_re.match
+        levels = self._bytes_levels
+        level_of = self.level_of
+        results: list[str] = []
+        append = results.append
+        for raw in raw_lines:
+            m = match(raw)
+            if m:
+                append(levels[m[1]])
+            elif raw.isascii():
+                append('OTHER')
+            else:
+                append(level_of(raw.decode('utf-8', 'replace')))
+        return results
+
+
+# Analyseur partagé, configuré avec les niveaux standards
+DEFAULT_PARSER = LogParser()
+
+
+def iter_log_records(
+    filepath: Path | str,
+    parser: LogParser = DEFAULT_PARSER,
+    keep: Optional[Collection[str]] = None,
+    errors: str = 'replace',
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[tuple[str, str]]:
+    """
+    Lit un fichier journal et produit ses lignes classées par niveau.
+    
+    Le fichier est lu par mmap (ou décompressé en flux) et classé sur les
+    octets bruts ; seules les lignes conservées (niveau dans `keep`) sont
+    décodées. Un octet invalide ne concerne que sa ligne, traitée selon la
+    politique `errors`.
+    
+    Args:
+        filepath: Chemin du fichier journal
+        parser: Analyseur à utiliser
+        keep: Niveaux à produire (None = tous)
+        errors: Politique de décodage (voir DECODE_ERROR_POLICIES) ;
+            'skip' ignore la ligne, 'strict' lève une IOError
+        start: Offset de départ en octets
+        end: Offset de fin en octets (None = fin du fichier)
+    
+    Yields:
+        Tuples (niveau, ligne décodée), dans l'ordre du fichier
+    
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+        ValueError: Si la politique de décodage est inconnue
+        IOError: Si une ligne produite est invalide et errors='strict'
+    """
+    blocks = iter_log_line_blocks(filepath, start, end)
+    return iter_records_from_blocks(blocks, parser, keep, errors, source=str(filepath))
+
+
+def iter_records_from_blocks(
+    blocks: Iterable[list[bytes]],
+    parser: LogParser = DEFAULT_PARSER,
+    keep: Optional[Collection[str]] = None,
+    errors: str = 'replace',
+    source: str = '',
+) -> Iterator[tuple[str, str]]:
+    """
+    Classe et décode des blocs de lignes brutes (voir iter_log_records).
+    
+    Args:
+        blocks: Blocs de lignes brutes (iter_log_line_blocks, prefetch_line_blocks)
+        parser: Analyseur à utiliser
+        keep: Niveaux à produire (None = tous)
+        errors: Politique de décodage (voir DECODE_ERROR_POLICIES)
+        source: Nom du fichier d'origine, pour les messages d'erreur
+    
+    Yields:
+        Tuples (niveau, ligne décodée), dans l'ordre des blocs
+    
+    Raises:
+        ValueError: Si la politique de décodage est inconnue
+        IOError: Si une ligne produite est invalide et errors='strict'
+    """
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            f"Politique de décodage inconnue : {errors} "
+            f"(attendu : {', '.join(DECODE_ERROR_POLICIES)})"
+        )
+    decode_errors = 'strict' if errors == 'skip' else errors
+    
+    for raw_lines in blocks:
+        for raw, level in zip(raw_lines, parser.classify_many_bytes(raw_lines)):
+            if keep is not None and level not in keep:
+                continue
+            try:
+                text = raw.decode('utf-8', decode_errors)
+            except UnicodeDecodeError as e:
+                if errors == 'skip':
+                    continue
+                raise IOError(
+                    f"Erreur lors de la lecture du fichier journal {source} : {e}"
+                )
+            yield level, text
+
+
+def classify_log_line(log_line: str) -> str:
+    """
+    Détermine le niveau sous lequel classer une ligne de journal.
+    
+    Args:
+        log_line: Ligne du journal
+    
+    Returns:
+        Niveau de LOG_LEVELS ('OTHER' si la ligne est invalide ou le niveau inconnu)
+    """
+    return DEFAULT_PARSER.level_of(log_line)
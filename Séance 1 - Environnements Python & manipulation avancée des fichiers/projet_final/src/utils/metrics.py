@@ -0,0 +1,338 @@
+"""
+Mesures par étape des traitements (durée, CPU, débit, octets, mémoire).
+
+Les fonctions instrumentées ouvrent une étape avec stage(name) ; tant que
+les mesures ne sont pas activées (enable_metrics), stage() renvoie un objet
+inerte partagé et l'instrumentation ne coûte presque rien.
+
+Exemple:
+    recorder = enable_metrics()
+    with stage('process_csv') as s:
+        ...
+        s.add_items(len(df))
+    recorder.save('metrics.json')
+
+Les étapes de même nom sont cumulées (un appel par bloc donne une seule
+ligne avec le nombre d'appels). Elles peuvent s'imbriquer : la durée d'une
+étape englobante inclut celle des étapes qu'elle appelle.
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure de la mémoire résidente
+    resource = None
+
+
+T = TypeVar("T")
+
+# Marqueur de fin d'itération pour measure_iter
+_END: Any = object()
+
+
+class StageMetrics:
+    """Mesures cumulées d'une étape."""
+    
+    def __init__(self, name: str, unit: str) -> None:
+        self.name = name
+        self.unit = unit
+        self.calls = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.items = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.peak_rss_mb: Optional[float] = None
+    
+    def as_dict(self) -> dict[str, Any]:
+        """Mesures et débits dérivés, pour l'export JSON."""
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wall_s': round(self.wall_s, 6),
+            'cpu_s': round(self.cpu_s, 6),
+            'items': self.items,
+            'unit': self.unit,
+            'items_per_s': round(self.items / self.wall_s, 1) if self.wall_s else None,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'read_mb_per_s': round(self.bytes_read / 1e6 / self.wall_s, 2) if self.wall_s else None,
+            'write_mb_per_s': round(self.bytes_written / 1e6 / self.wall_s, 2) if self.wall_s else None,
+            'peak_rss_mb': self.peak_rss_mb,
+        }
+
+
+class _StageTimer:
+    """Étape en cours : chronomètre et compteurs, reportés à la sortie du bloc."""
+    
+    enabled = True
+    
+    def __init__(self, recorder: "MetricsRecorder", name: str, unit: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._unit = unit
+        self.items = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+    
+    def add_items(self, count: int) -> None:
+        self.items += count
+    
+    def add_bytes_read(self, count: int) -> None:
+        self.bytes_read += count
+    
+    def add_bytes_written(self, count: int) -> None:
+        self.bytes_written += count
+    
+    def __enter__(self) -> "_StageTimer":
+        self._cpu = _cpu_time()
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        wall = time.perf_counter() - self._start
+        self._recorder._record(
+            self._name, self._unit, wall, _cpu_time() - self._cpu,
+            self.items, self.bytes_read, self.bytes_written,
+        )
+
+
+class _NullStage:
+    """Étape inerte utilisée quand les mesures sont désactivées."""
+    
+    enabled = False
+    
+    def add_items(self, count: int) -> None:
+        pass
+    
+    def add_bytes_read(self, count: int) -> None:
+        pass
+    
+    def add_bytes_written(self, count: int) -> None:
+        pass
+    
+    def __enter__(self) -> "_NullStage":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class MetricsRecorder:
+    """
+    Registre des mesures d'une exécution.
+    
+    Les étapes peuvent être mesurées depuis plusieurs threads (lecture
+    parallèle des journaux) : les cumuls sont protégés par un verrou.
+    """
+    
+    def __init__(self) -> None:
+        self.stages: dict[str, StageMetrics] = {}
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self._cpu = _process_cpu_time()
+        self._lock = threading.Lock()
+    
+    def stage(self, name: str, unit: str = 'lignes') -> _StageTimer:
+        """Ouvre une étape (à utiliser avec with)."""
+        return _StageTimer(self, name, unit)
+    
+    def count(
+        self,
+        name: str,
+        unit: str = 'lignes',
+        items: int = 0,
+        bytes_read: int = 0,
+        bytes_written: int = 0,
+    ) -> None:
+        """Ajoute des compteurs à une étape sans la chronométrer."""
+        self._record(name, unit, 0.0, 0.0, items, bytes_read, bytes_written, call=False)
+    
+    def report(self, **meta: Any) -> dict[str, Any]:
+        """
+        Construit le rapport complet (contexte d'exécution et étapes).
+        
+        Args:
+            **meta: Informations ajoutées au contexte (code de sortie...)
+        
+        Returns:
+            Rapport sérialisable en JSON
+        """
+        with self._lock:
+            stages = [metrics.as_dict() for metrics in self.stages.values()]
+        # Mesures prises avant platform.platform(), qui peut lancer un
+        # sous-processus (uname) et fausser la mémoire des processus enfants
+        totals = {
+            'wall_s': round(time.perf_counter() - self._start, 6),
+            'cpu_s': round(_process_cpu_time() - self._cpu, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_children_mb': peak_rss_mb(children=True),
+        }
+        return {
+            'meta': {
+                'started': self.started.isoformat(timespec='seconds'),
+                'argv': sys.argv,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                **totals,
+                **meta,
+            },
+            'stages': stages,
+        }
+    
+    def save(self, filepath: Path | str, **meta: Any) -> None:
+        """
+        Écrit le rapport en JSON.
+        
+        Args:
+            filepath: Fichier de destination
+            **meta: Informations ajoutées au contexte
+        """
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(**meta), indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    
+    def _record(
+        self,
+        name: str,
+        unit: str,
+        wall: float,
+        cpu: float,
+        items: int,
+        bytes_read: int,
+        bytes_written: int,
+        call: bool = True,
+    ) -> None:
+        rss = peak_rss_mb() if call else None
+        with self._lock:
+            metrics = self.stages.get(name)
+            if metrics is None:
+                metrics = self.stages[name] = StageMetrics(name, unit)
+            metrics.calls += call
+            metrics.wall_s += wall
+            metrics.cpu_s += cpu
+            metrics.items += items
+            metrics.bytes_read += bytes_read
+            metrics.bytes_written += bytes_written
+            if rss is not None:
+                metrics.peak_rss_mb = max(metrics.peak_rss_mb or 0.0, rss)
+
+
+# Registre actif (None = mesures désactivées)
+_recorder: Optional[MetricsRecorder] = None
+
+
+def enable_metrics() -> MetricsRecorder:
+    """Active les mesures et retourne le registre qui les reçoit."""
+    global _recorder
+    _recorder = MetricsRecorder()
+    return _recorder
+
+
+def disable_metrics() -> None:
+    """Désactive les mesures."""
+    global _recorder
+    _recorder = None
+
+
+def stage(name: str, unit: str = 'lignes') -> _StageTimer | _NullStage:
+    """
+    Ouvre une étape mesurée dans le registre actif.
+    
+    Args:
+        name: Nom de l'étape (les étapes de même nom sont cumulées)
+        unit: Unité des éléments comptés par add_items ('lignes'...)
+    
+    Returns:
+        Gestionnaire de contexte offrant add_items, add_bytes_read et
+        add_bytes_written ; inerte si les mesures sont désactivées
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_STAGE
+    return recorder.stage(name, unit)
+
+
+def count(name: str, unit: str = 'lignes', items: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+    """Ajoute des compteurs à une étape du registre actif, sans chronométrer."""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, unit, items, bytes_read, bytes_written)
+
+
+def measure_iter(
+    name: str,
+    items: Iterable[T],
+    unit: str = 'lignes',
+    bytes_read: int = 0,
+) -> Iterator[T]:
+    """
+    Mesure un itérateur élément par élément.
+    
+    La production de chaque élément (bloc de lignes, DataFrame...) compte
+    comme un appel de l'étape, avec len(élément) éléments : le temps passé
+    par l'appelant entre deux éléments n'est pas compté.
+    
+    Args:
+        name: Nom de l'étape
+        items: Itérable mesuré
+        unit: Unité des éléments comptés
+        bytes_read: Octets lus, ajoutés à l'étape une fois l'itérable épuisé
+    
+    Yields:
+        Éléments de items, inchangés
+    """
+    iterator = iter(items)
+    while True:
+        with stage(name, unit) as s:
+            item = next(iterator, _END)
+            if item is not _END:
+                s.add_items(len(item))
+        if item is _END:
+            count(name, unit, bytes_read=bytes_read)
+            return
+        yield item
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """
+    Mémoire résidente maximale atteinte jusqu'ici, en Mo.
+    
+    Args:
+        children: Si True, maximum des processus enfants terminés (pool de
+            processus) au lieu du processus courant
+    
+    Returns:
+        Mémoire en Mo, ou None si la mesure n'est pas disponible
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss * scale / 1e6, 1)
+
+
+def _cpu_time() -> float:
+    # Temps CPU du thread courant (les étapes mesurées dans les threads de
+    # lecture ne se comptent pas mutuellement), plus celui des processus
+    # enfants terminés (pool de processus)
+    times = os.times()
+    return time.thread_time() + times.children_user + times.children_system
+
+
+def _process_cpu_time() -> float:
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
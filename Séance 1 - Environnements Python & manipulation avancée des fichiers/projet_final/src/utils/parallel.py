@@ -0,0 +1,190 @@
+"""
+Classement parallèle des fichiers journaux sur un pool de processus.
+
+Les fichiers sont découpés en tranches (aux frontières de lignes), chaque
+tranche est classée par niveau dans un processus, puis les résultats sont
+fusionnés dans l'ordre d'entrée : la sortie est identique au traitement
+séquentiel.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Collection, Iterable, Iterator, NamedTuple, Optional, TypeVar
+
+from .io import is_compressed
+from .logs import LOG_LEVELS, iter_log_records
+
+
+# Taille cible d'une tranche de fichier confiée à un processus (64 Mio)
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class LogChunk(NamedTuple):
+    """Tranche [start, end[ d'un fichier journal, alignée sur les lignes."""
+    path: Path
+    start: int
+    end: int
+
+
+class ChunkResult(NamedTuple):
+    """Lignes d'une tranche classées par niveau."""
+    chunk: LogChunk
+    counts: dict[str, int]
+    blocks: dict[str, str]
+
+
+def plan_log_chunks(
+    log_files: Iterable[Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ranges: Optional[dict[Path, tuple[int, int]]] = None,
+) -> list[LogChunk]:
+    """
+    Découpe des fichiers journaux en tranches alignées sur les fins de ligne.
+    
+    Un fichier plus petit que chunk_size forme une seule tranche ; un gros
+    fichier est coupé juste après le premier '\\n' suivant chaque multiple
+    de chunk_size. Un fichier compressé ne peut pas être découpé : il forme
+    toujours une seule tranche.
+    
+    Args:
+        log_files: Fichiers à découper, dans l'ordre de traitement
+        chunk_size: Taille cible d'une tranche en octets
+        ranges: Plage (début, fin) à couvrir par fichier ; par défaut, le
+            fichier entier
+    
+    Returns:
+        Liste ordonnée de tranches couvrant entièrement chaque plage ; une
+        plage vide produit une tranche vide
+    
+    Raises:
+        ValueError: Si chunk_size n'est pas strictement positif
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"Taille de tranche invalide : {chunk_size}")
+    
+    chunks: list[LogChunk] = []
+    for path in log_files:
+        if ranges is not None:
+            first, size = ranges[path]
+        else:
+            first, size = 0, path.stat().st_size
+        start = first
+        if is_compressed(path):
+            chunks.append(LogChunk(path, first, size))
+            continue
+        with open(path, 'rb') as f:
+            while start < size:
+                target = start + chunk_size
+                if target >= size:
+                    end = size
+                else:
+                    f.seek(target)
+                    f.readline()
+                    end = min(f.tell(), size)
+                chunks.append(LogChunk(path, start, end))
+                start = end
+        if first >= size:
+            chunks.append(LogChunk(path, first, first))
+    return chunks
+
+
+def classify_log_chunk(
+    chunk: LogChunk,
+    keep: Optional[Collection[str]] = None,
+    errors: str = 'replace',
+) -> ChunkResult:
+    """
+    Classe par niveau les lignes d'une tranche de fichier journal.
+    
+    Exécutée dans un processus du pool : les lignes de chaque niveau sont
+    renvoyées sous forme d'un seul bloc de texte (une ligne + '\\n' par
+    entrée) pour limiter le coût de sérialisation entre processus.
+    
+    Args:
+        chunk: Tranche à traiter
+        keep: Niveaux à conserver (None = tous)
+        errors: Politique de décodage des octets invalides
+    
+    Returns:
+        ChunkResult avec le nombre de lignes et le bloc de texte par niveau
+    
+    Raises:
+        IOError: Si la tranche contient une ligne invalide et errors='strict'
+    """
+    lines_by_level: dict[str, list[str]] = {level: [] for level in LOG_LEVELS}
+    records = iter_log_records(
+        chunk.path, keep=keep, errors=errors, start=chunk.start, end=chunk.end,
+    )
+    for level, line in records:
+        lines_by_level[level].append(line)
+    
+    counts = {level: len(lines) for level, lines in lines_by_level.items() if lines}
+    blocks = {
+        level: '\n'.join(lines) + '\n'
+        for level, lines in lines_by_level.items() if lines
+    }
+    return ChunkResult(chunk, counts, blocks)
+
+
+def imap_ordered(
+    executor: ProcessPoolExecutor,
+    func: Callable[[T], R],
+    items: Iterable[T],
+    window: int,
+) -> Iterator[R]:
+    """
+    Équivalent de executor.map avec un nombre borné de tâches en vol.
+    
+    Les résultats sont produits dans l'ordre des entrées ; au plus `window`
+    résultats attendent en mémoire d'être consommés.
+    
+    Args:
+        executor: Pool d'exécution
+        func: Fonction à appliquer
+        items: Entrées, dans l'ordre
+        window: Nombre maximal de tâches soumises et non consommées
+    
+    Yields:
+        Résultats de func, dans l'ordre des entrées
+    """
+    pending: deque[Future[R]] = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def classify_logs_parallel(
+    log_files: list[Path],
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ranges: Optional[dict[Path, tuple[int, int]]] = None,
+    keep: Optional[Collection[str]] = None,
+    errors: str = 'replace',
+) -> Iterator[ChunkResult]:
+    """
+    Classe des fichiers journaux sur un pool de processus.
+    
+    Args:
+        log_files: Fichiers à traiter, dans l'ordre
+        workers: Nombre de processus
+        chunk_size: Taille cible d'une tranche en octets
+        ranges: Plage (début, fin) à lire par fichier (mode incrémental)
+        keep: Niveaux à conserver (None = tous)
+        errors: Politique de décodage des octets invalides
+    
+    Yields:
+        ChunkResult de chaque tranche, dans l'ordre des fichiers puis des
+        positions dans chaque fichier
+    """
+    chunks = plan_log_chunks(log_files, chunk_size, ranges)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        worker = partial(classify_log_chunk, keep=keep, errors=errors)
+        yield from imap_ordered(executor, worker, chunks, 2 * workers)
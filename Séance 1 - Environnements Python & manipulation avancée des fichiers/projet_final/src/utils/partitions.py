@@ -0,0 +1,203 @@
+"""
+Logs organisés partitionnés par niveau et par tranche de temps.
+
+Avec un partitionnement, chaque ligne est rangée d'après son niveau et son
+horodatage dans un fichier du type :
+
+    logs_organized/level=ERROR/date=2024-11-03/hour=14.log   (par heure)
+    logs_organized/level=ERROR/date=2024-11-03.log           (par jour)
+
+Les lignes sans horodatage valide (date ou heure inexistante comprise) vont
+dans date=unknown. Une lecture sur une plage de temps n'ouvre que les
+partitions qui la chevauchent : le coût dépend de la fenêtre demandée, pas
+du volume total.
+
+Exemple:
+    for line in read_partitioned_logs(output_dir / 'logs_organized',
+                                      start='2024-11-03 14:00:00',
+                                      end='2024-11-03 15:00:00',
+                                      levels=['ERROR']):
+        print(line)
+"""
+
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Collection, Iterator, NamedTuple, Optional
+
+from .io import COMPRESSION_CODECS, open_file
+
+
+# Granularités de partitionnement acceptées (option --partition)
+PARTITION_GRANULARITIES = ('day', 'hour')
+
+# Partition des lignes dont l'horodatage est illisible
+UNKNOWN_DATE = 'unknown'
+
+# Horodatage en tête de ligne : "[YYYY-MM-DD HH:MM:SS]" (largeur fixe)
+_TIMESTAMP_RE = re.compile(r'\[(\d{4}-\d{2}-\d{2}) (\d{2}):\d{2}:\d{2}\]')
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_DATE_DIR_RE = re.compile(r'date=(\d{4}-\d{2}-\d{2}|' + UNKNOWN_DATE + r')')
+_HOUR_FILE_RE = re.compile(r'hour=(\d{2})\.')
+
+
+class Partition(NamedTuple):
+    """Fichier d'une partition et tranche de temps couverte ([start, end), None si inconnue)."""
+    path: Path
+    level: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+
+
+def partition_key(level: str, line: str, granularity: str) -> str:
+    """
+    Chemin relatif (sans extension) de la partition d'une ligne.
+    
+    Args:
+        level: Niveau de la ligne (INFO, ERROR...)
+        line: Ligne du journal
+        granularity: 'day' ou 'hour'
+    
+    Returns:
+        Clé du type "level=ERROR/date=2024-11-03/hour=14" ; "date=unknown"
+        si l'horodatage est absent ou invalide (2024-13-45, 25 h...)
+    """
+    match = _TIMESTAMP_RE.match(line)
+    if match is None or int(match.group(2)) > 23 or _parse_day(match.group(1)) is None:
+        return f"level={level}/date={UNKNOWN_DATE}"
+    date, hour = match.groups()
+    if granularity == 'hour':
+        return f"level={level}/date={date}/hour={hour}"
+    return f"level={level}/date={date}"
+
+
+def iter_partitions(
+    logs_output_dir: Path | str,
+    start: Optional[datetime | str] = None,
+    end: Optional[datetime | str] = None,
+    levels: Optional[Collection[str]] = None,
+) -> Iterator[Partition]:
+    """
+    Partitions qui chevauchent une plage de temps, d'après leur seul chemin.
+    
+    Les fichiers ne sont pas ouverts : les répertoires hors de la plage
+    (niveau, jour) ne sont même pas parcourus.
+    
+    Args:
+        logs_output_dir: Répertoire des logs organisés partitionnés
+        start: Début de la plage (inclus) ; None = sans borne
+        end: Fin de la plage (exclue) ; None = sans borne
+        levels: Niveaux à conserver (None = tous)
+    
+    Yields:
+        Partitions par niveau puis dans l'ordre chronologique ; celles
+        sans date (date=unknown) seulement si la plage n'est pas bornée.
+        Les noms de répertoire ou de fichier illisibles sont ignorés.
+    """
+    start, end = _as_datetime(start), _as_datetime(end)
+    wanted = {level.upper() for level in levels} if levels is not None else None
+    
+    for level_dir in sorted(Path(logs_output_dir).glob('level=*')):
+        level = level_dir.name[len('level='):]
+        if wanted is not None and level not in wanted:
+            continue
+        for entry in sorted(level_dir.iterdir()):
+            match = _DATE_DIR_RE.match(entry.name)
+            if match is None:
+                continue
+            if match.group(1) == UNKNOWN_DATE:
+                if start is None and end is None and _is_log_file(entry, 'date=' + UNKNOWN_DATE):
+                    yield Partition(entry, level, None, None)
+                continue
+            day = _parse_day(match.group(1))
+            if day is None or not _overlaps(day, day + timedelta(days=1), start, end):
+                continue
+            if entry.is_dir():
+                for hour_file in sorted(entry.iterdir()):
+                    hour = _HOUR_FILE_RE.match(hour_file.name)
+                    if hour is None or int(hour.group(1)) > 23:
+                        continue
+                    if not _is_log_file(hour_file, f"hour={hour.group(1)}"):
+                        continue
+                    hour_start = day + timedelta(hours=int(hour.group(1)))
+                    if _overlaps(hour_start, hour_start + timedelta(hours=1), start, end):
+                        yield Partition(hour_file, level, hour_start, hour_start + timedelta(hours=1))
+            elif _is_log_file(entry, match.group(0)):
+                yield Partition(entry, level, day, day + timedelta(days=1))
+
+
+def read_partitioned_logs(
+    logs_output_dir: Path | str,
+    start: Optional[datetime | str] = None,
+    end: Optional[datetime | str] = None,
+    levels: Optional[Collection[str]] = None,
+) -> Iterator[str]:
+    """
+    Lit les lignes d'une plage de temps en n'ouvrant que les partitions utiles.
+    
+    Les partitions entièrement comprises dans la plage sont lues sans
+    analyse ; dans celles qui la débordent, seules les lignes dont
+    l'horodatage est dans la plage sont retournées.
+    
+    Args:
+        logs_output_dir: Répertoire des logs organisés partitionnés
+        start: Début de la plage (inclus), datetime ou "YYYY-MM-DD HH:MM:SS"
+        end: Fin de la plage (exclue)
+        levels: Niveaux à conserver (None = tous)
+    
+    Yields:
+        Lignes sans newline, par niveau puis dans l'ordre des partitions
+    """
+    start, end = _as_datetime(start), _as_datetime(end)
+    low = start.strftime(_TIMESTAMP_FORMAT) if start is not None else None
+    high = end.strftime(_TIMESTAMP_FORMAT) if end is not None else None
+    
+    for partition in iter_partitions(logs_output_dir, start, end, levels):
+        inside = (
+            (start is None or (partition.start is not None and partition.start >= start))
+            and (end is None or (partition.end is not None and partition.end <= end))
+        )
+        with open_file(partition.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not inside:
+                    # Horodatage comparé comme texte (format de largeur fixe)
+                    timestamp = line[1:20]
+                    if (low is not None and timestamp < low) or (high is not None and timestamp >= high):
+                        continue
+                yield line
+
+
+def _as_datetime(value: Optional[datetime | str]) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, _TIMESTAMP_FORMAT)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d')
+
+
+@lru_cache(maxsize=1024)
+def _parse_day(date: str) -> Optional[datetime]:
+    # Jour "YYYY-MM-DD" ou None s'il n'existe pas ; mis en cache car appelé
+    # pour chaque ligne rangée, avec très peu de dates distinctes
+    try:
+        return datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _overlaps(
+    part_start: datetime,
+    part_end: datetime,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> bool:
+    return (end is None or part_start < end) and (start is None or part_end > start)
+
+
+def _is_log_file(path: Path, stem: str) -> bool:
+    # "<stem>.log", éventuellement compressé (.log.gz...)
+    return path.is_file() and path.name in {f"{stem}.log{suffix}" for suffix in ('', *COMPRESSION_CODECS)}
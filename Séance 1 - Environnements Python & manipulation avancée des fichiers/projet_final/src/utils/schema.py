@@ -0,0 +1,249 @@
+"""
+Schémas de colonnes pour typer les CSV dès le chargement.
+
+Un CsvSchema décrit, colonne par colonne, le type attendu (entier, décimal,
+date, booléen, catégorie, texte). Chaque type a un normaliseur vectorisé qui
+convertit les chaînes brutes (virgule décimale, séparateurs de milliers,
+dates jour/mois/année, « oui »/« non »...) en types pandas natifs ; les
+valeurs invalides deviennent manquantes.
+"""
+
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+import numpy as np
+import pandas as pd
+
+
+# Valeurs considérées comme manquantes (comparées en minuscules, sans espaces)
+NA_TOKENS = frozenset({'', 'na', 'n/a', 'nan', 'null', 'none', '-', '--', '—'})
+
+# Valeurs booléennes reconnues (comparées en minuscules, sans espaces)
+TRUE_TOKENS = frozenset({'true', 'vrai', 'oui', 'yes', 'y', 'o', '1'})
+FALSE_TOKENS = frozenset({'false', 'faux', 'non', 'no', 'n', '0'})
+
+# Caractères retirés des montants : symboles monétaires et espaces (y compris
+# insécables, utilisés comme séparateurs de milliers en français)
+_AMOUNT_NOISE = r'[€$£\s  ]'
+
+
+class ColumnSpec(NamedTuple):
+    """Type attendu d'une colonne et contraintes sur ses valeurs."""
+    kind: str
+    formats: tuple[str, ...] = ()
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+
+class CsvSchema(NamedTuple):
+    """Format d'un fichier CSV et type de chacune de ses colonnes."""
+    name: str
+    columns: dict[str, ColumnSpec]
+    sep: str = ','
+    encoding: str = 'utf-8'
+
+
+def normalize_text(values: pd.Series) -> pd.Series:
+    """
+    Retire les espaces autour des valeurs et remplace les marqueurs de
+    valeur manquante ('', 'NA', 'N/A', 'NaN', '—'...) par NaN.
+    
+    Args:
+        values: Colonne de chaînes brutes
+    
+    Returns:
+        Colonne de chaînes nettoyées
+    """
+    text = values.astype(object).str.strip()
+    return text.mask(text.str.lower().isin(NA_TOKENS) | text.isna())
+
+
+def parse_integer(values: pd.Series, spec: ColumnSpec) -> pd.Series:
+    """Convertit en entiers nullables (Int64) ; non entiers et hors bornes → NA."""
+    numbers = _within_bounds(pd.to_numeric(values, errors='coerce'), spec)
+    numbers = numbers.where(numbers % 1 == 0)
+    return numbers.astype('Int64')
+
+
+def parse_decimal(values: pd.Series, spec: ColumnSpec) -> pd.Series:
+    """
+    Convertit des montants en flottants, quel que soit le séparateur décimal.
+    
+    Le dernier séparateur ('.' ou ',') est le séparateur décimal, l'autre
+    sépare les milliers : '1 234,50', '1,234.00' et '2.500,00' sont reconnus.
+    Les valeurs infinies ou hors bornes deviennent NaN.
+    """
+    text = values.str.replace(_AMOUNT_NOISE, '', regex=True)
+    comma_decimal = text.str.rfind(',') > text.str.rfind('.')
+    text = text.where(
+        ~comma_decimal,
+        text.str.replace('.', '', regex=False).str.replace(',', '.', regex=False),
+    )
+    text = text.where(comma_decimal, text.str.replace(',', '', regex=False))
+    numbers = pd.to_numeric(text, errors='coerce').astype('float64')
+    numbers = numbers.where(np.isfinite(numbers))
+    return _within_bounds(numbers, spec)
+
+
+def parse_datetime(values: pd.Series, spec: ColumnSpec) -> pd.Series:
+    """
+    Convertit en dates en essayant les formats de spec.formats dans l'ordre.
+    
+    Chaque format n'est appliqué (de façon vectorisée) qu'aux valeurs que les
+    formats précédents n'ont pas reconnues ; les dates impossibles
+    ('2023-13-01', '2020-02-30') deviennent NaT.
+    """
+    result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for fmt in spec.formats or ('ISO8601',):
+        pending = result.isna() & values.notna()
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(values[pending], format=fmt, errors='coerce')
+        result[pending] = parsed.astype('datetime64[ns]')
+    return result
+
+
+def parse_boolean(values: pd.Series, spec: ColumnSpec) -> pd.Series:
+    """Convertit oui/non, true/false, 1/0... en booléens nullables."""
+    lower = values.str.lower()
+    result = pd.Series(pd.NA, index=values.index, dtype='boolean')
+    result[lower.isin(TRUE_TOKENS)] = True
+    result[lower.isin(FALSE_TOKENS)] = False
+    return result
+
+
+def to_category(values: pd.Series, spec: ColumnSpec) -> pd.Series:
+    """Stocke une colonne à valeurs répétées sous forme catégorielle."""
+    return values.astype('category')
+
+
+def to_text(values: pd.Series, spec: ColumnSpec) -> pd.Series:
+    """Conserve une colonne en texte (déjà nettoyé par normalize_text)."""
+    return values
+
+
+# Normaliseur associé à chaque type de colonne
+NORMALIZERS: dict[str, Callable[[pd.Series, ColumnSpec], pd.Series]] = {
+    'int': parse_integer,
+    'float': parse_decimal,
+    'datetime': parse_datetime,
+    'bool': parse_boolean,
+    'category': to_category,
+    'str': to_text,
+}
+
+
+def apply_schema(df: pd.DataFrame, schema: CsvSchema) -> pd.DataFrame:
+    """
+    Convertit les colonnes brutes (chaînes) d'un DataFrame selon un schéma.
+    
+    Les colonnes absentes du schéma restent du texte, nettoyé par
+    normalize_text.
+    
+    Args:
+        df: DataFrame lu avec dtype=str
+        schema: Schéma à appliquer
+    
+    Returns:
+        Nouveau DataFrame typé
+    
+    Raises:
+        ValueError: Si le schéma utilise un type de colonne inconnu
+    """
+    typed = {}
+    for column in df.columns:
+        spec = schema.columns.get(column)
+        if spec is None:
+            typed[column] = normalize_text(df[column])
+            continue
+        normalizer = NORMALIZERS.get(spec.kind)
+        if normalizer is None:
+            raise ValueError(f"Type de colonne inconnu pour {column} : {spec.kind}")
+        typed[column] = normalizer(normalize_text(df[column]), spec)
+    return pd.DataFrame(typed, index=df.index)
+
+
+def read_options(schema: CsvSchema) -> dict:
+    """Options de pd.read_csv pour lire les valeurs brutes d'un CSV à typer."""
+    return {
+        'sep': schema.sep,
+        'encoding': schema.encoding,
+        'dtype': str,
+        'keep_default_na': False,
+    }
+
+
+def _within_bounds(numbers: pd.Series, spec: ColumnSpec) -> pd.Series:
+    if spec.minimum is not None:
+        numbers = numbers.where(numbers >= spec.minimum)
+    if spec.maximum is not None:
+        numbers = numbers.where(numbers <= spec.maximum)
+    return numbers
+
+
+# Export clients (data/data.csv) : séparateur ';', virgule décimale, dates
+# jour/mois/année
+CLIENTS_SCHEMA = CsvSchema(
+    name='clients',
+    sep=';',
+    columns={
+        'id_client': ColumnSpec('int', minimum=1),
+        'nom': ColumnSpec('category'),
+        'prenom': ColumnSpec('category'),
+        'age': ColumnSpec('int', minimum=0, maximum=120),
+        'date_inscription': ColumnSpec('datetime', formats=('%d/%m/%Y', '%Y-%m-%d')),
+        'montant_total_eur': ColumnSpec('float', minimum=0),
+        'actif': ColumnSpec('bool'),
+        'derniere_connexion': ColumnSpec(
+            'datetime', formats=('%d/%m/%Y %H:%M', '%d/%m/%Y', 'ISO8601'),
+        ),
+        'newsletter_ok': ColumnSpec('bool'),
+    },
+)
+
+# Schémas disponibles, par nom (option --schema)
+SCHEMAS: dict[str, CsvSchema] = {
+    CLIENTS_SCHEMA.name: CLIENTS_SCHEMA,
+}
+
+
+def detect_schema(filepath: Path | str) -> Optional[CsvSchema]:
+    """
+    Retrouve le schéma d'un CSV d'après sa ligne d'en-tête.
+    
+    Args:
+        filepath: Chemin du fichier CSV
+    
+    Returns:
+        Premier schéma dont toutes les colonnes figurent dans l'en-tête, ou
+        None si aucun ne correspond
+    """
+    for schema in SCHEMAS.values():
+        with open(filepath, 'r', encoding=schema.encoding, errors='replace') as f:
+            header = {name.strip() for name in f.readline().rstrip('\r\n').split(schema.sep)}
+        if set(schema.columns) <= header:
+            return schema
+    return None
+
+
+def resolve_schema(name: str, filepath: Path | str) -> Optional[CsvSchema]:
+    """
+    Choisit le schéma à appliquer à un CSV.
+    
+    Args:
+        name: 'auto' (détection d'après l'en-tête), 'none' (pas de typage) ou
+            nom d'un schéma de SCHEMAS
+        filepath: Chemin du fichier CSV
+    
+    Returns:
+        Schéma retenu, ou None
+    
+    Raises:
+        ValueError: Si le nom de schéma est inconnu
+    """
+    if name == 'none':
+        return None
+    if name == 'auto':
+        return detect_schema(filepath)
+    if name not in SCHEMAS:
+        raise ValueError(f"Schéma inconnu : {name}")
+    return SCHEMAS[name]
@@ -0,0 +1,382 @@
+"""
+Statistiques descriptives calculées en un seul passage, bloc par bloc.
+
+StreamingStats accumule, pour chaque colonne, le nombre de valeurs, les
+valeurs manquantes, la moyenne et la variance (formules de Welford/Chan),
+le minimum, le maximum et les quantiles (QuantileSketch). Deux accumulateurs
+se fusionnent : des blocs traités par des processus différents donnent le
+même résumé qu'un traitement séquentiel. describe() reproduit la mise en
+page de DataFrame.describe().
+"""
+
+import math
+from collections import Counter
+from typing import Any, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+
+# Quantiles du résumé (ceux de DataFrame.describe)
+DEFAULT_PERCENTILES = (0.25, 0.5, 0.75)
+
+# Nombre de valeurs conservées telles quelles par colonne : en deçà, les
+# quantiles sont exacts ; au-delà, ils sont estimés par l'esquisse
+EXACT_QUANTILE_LIMIT = 100_000
+
+# Précision relative de l'esquisse : 0,5 % pour les nombres ; 1e-6 pour les
+# dates, stockées en nanosecondes depuis 1970 (soit environ 30 minutes)
+NUMERIC_ACCURACY = 0.005
+DATETIME_ACCURACY = 1e-6
+
+
+class QuantileSketch:
+    """
+    Esquisse de quantiles fusionnable, à erreur relative bornée (DDSketch).
+    
+    Les valeurs sont d'abord conservées telles quelles (quantiles exacts).
+    Au-delà de exact_limit valeurs, chacune est rangée dans un seau
+    logarithmique : le seau i couvre ]gamma^(i-1), gamma^i], avec
+    gamma = (1 + a) / (1 - a). Toute valeur estimée est alors à moins de
+    a (en relatif) de la vraie valeur, et deux esquisses se fusionnent en
+    additionnant leurs seaux.
+    """
+    
+    def __init__(
+        self,
+        relative_accuracy: float = NUMERIC_ACCURACY,
+        exact_limit: int = EXACT_QUANTILE_LIMIT,
+    ) -> None:
+        """
+        Args:
+            relative_accuracy: Erreur relative maximale des quantiles estimés
+            exact_limit: Nombre de valeurs conservées avant de passer aux seaux
+        
+        Raises:
+            ValueError: Si relative_accuracy n'est pas dans ]0, 1[
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Précision relative invalide : {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.exact_limit = exact_limit
+        self.count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._exact: Optional[list[np.ndarray]] = []
+        self._positive: Counter[int] = Counter()
+        self._negative: Counter[int] = Counter()
+        self._zeros = 0
+    
+    def update(self, values: np.ndarray) -> None:
+        """
+        Ajoute des valeurs (flottants finis, sans NaN).
+        
+        Args:
+            values: Valeurs à ajouter
+        """
+        if not len(values):
+            return
+        self.count += len(values)
+        if self._exact is not None:
+            self._exact.append(np.array(values, dtype=np.float64))
+            if self.count > self.exact_limit:
+                self._flush_exact()
+            return
+        self._add_to_buckets(values)
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Ajoute le contenu d'une autre esquisse (même précision).
+        
+        Raises:
+            ValueError: Si les précisions diffèrent
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Impossible de fusionner des esquisses de précisions différentes")
+        self.count += other.count
+        if self._exact is not None and other._exact is not None:
+            self._exact.extend(other._exact)
+            if self.count > self.exact_limit:
+                self._flush_exact()
+            return
+        self._flush_exact()
+        if other._exact is not None:
+            for values in other._exact:
+                self._add_to_buckets(values)
+        else:
+            self._positive.update(other._positive)
+            self._negative.update(other._negative)
+            self._zeros += other._zeros
+    
+    def quantiles(self, probabilities: Iterable[float]) -> list[float]:
+        """
+        Calcule des quantiles avec interpolation linéaire (comme pandas).
+        
+        Args:
+            probabilities: Probabilités entre 0 et 1
+        
+        Returns:
+            Quantiles (NaN si l'esquisse est vide)
+        """
+        probabilities = list(probabilities)
+        if not self.count:
+            return [math.nan] * len(probabilities)
+        if self._exact is not None:
+            return np.quantile(np.concatenate(self._exact), probabilities).tolist()
+        
+        # Valeurs représentatives des seaux, dans l'ordre croissant
+        negative = sorted(self._negative, reverse=True)
+        positive = sorted(self._positive)
+        values = np.array(
+            [-self._bucket_value(i) for i in negative]
+            + ([0.0] if self._zeros else [])
+            + [self._bucket_value(i) for i in positive]
+        )
+        counts = np.array(
+            [self._negative[i] for i in negative]
+            + ([self._zeros] if self._zeros else [])
+            + [self._positive[i] for i in positive]
+        )
+        cumulative = np.cumsum(counts)
+        
+        results = []
+        for p in probabilities:
+            rank = p * (self.count - 1)
+            low, high = math.floor(rank), math.ceil(rank)
+            value_low = values[np.searchsorted(cumulative, low, side='right')]
+            value_high = values[np.searchsorted(cumulative, high, side='right')]
+            results.append(float(value_low + (value_high - value_low) * (rank - low)))
+        return results
+    
+    def _flush_exact(self) -> None:
+        exact, self._exact = self._exact, None
+        for values in exact or []:
+            self._add_to_buckets(values)
+    
+    def _add_to_buckets(self, values: np.ndarray) -> None:
+        positive = values[values > 0]
+        negative = -values[values < 0]
+        self._zeros += int(np.count_nonzero(values == 0))
+        for store, magnitudes in ((self._positive, positive), (self._negative, negative)):
+            if len(magnitudes):
+                indexes = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+                keys, counts = np.unique(indexes, return_counts=True)
+                store.update(dict(zip(keys.tolist(), counts.tolist())))
+    
+    def _bucket_value(self, index: int) -> float:
+        # Milieu (au sens relatif) du seau ]gamma^(i-1), gamma^i]
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+
+class ColumnStats:
+    """Statistiques accumulées d'une colonne (numérique, date ou autre)."""
+    
+    def __init__(self, kind: str, extension: bool = False) -> None:
+        """
+        Args:
+            kind: 'numeric', 'datetime' ou 'categorical'
+            extension: True si la colonne a un type nullable pandas (Int64,
+                Float64...) : le résumé est alors en Float64, comme describe()
+        """
+        self.kind = kind
+        self.extension = extension
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch(
+            DATETIME_ACCURACY if kind == 'datetime' else NUMERIC_ACCURACY,
+        )
+        self.values: Counter[Any] = Counter()
+    
+    def update(self, series: pd.Series) -> None:
+        """Ajoute les valeurs d'un bloc."""
+        missing = int(series.isna().sum())
+        self.nulls += missing
+        if self.kind == 'categorical':
+            self.count += len(series) - missing
+            self.values.update(series.dropna().tolist())
+            return
+        
+        if self.kind == 'datetime':
+            # Nanosecondes entières : min et max restent exacts
+            raw = series.dropna().astype('datetime64[ns]').to_numpy().view('i8')
+            values = raw.astype(np.float64)
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            raw = values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        
+        # Fusion de Chan et al. des (effectif, moyenne, M2) du bloc
+        n = len(values)
+        total = values.sum()
+        mean = total / n
+        m2 = float(((values - mean) ** 2).sum())
+        delta = mean - self.mean
+        combined = self.count + n
+        self.mean += delta * n / combined
+        self.m2 += m2 + delta * delta * self.count * n / combined
+        self.count = combined
+        self.total += total
+        self.minimum = min(self.minimum, raw.min().item())
+        self.maximum = max(self.maximum, raw.max().item())
+        self.sketch.update(values)
+    
+    def merge(self, other: "ColumnStats") -> None:
+        """Ajoute les statistiques d'une autre partie de la même colonne."""
+        self.nulls += other.nulls
+        if self.kind == 'categorical':
+            self.count += other.count
+            self.values.update(other.values)
+            return
+        if not other.count:
+            return
+        delta = other.mean - self.mean
+        combined = self.count + other.count
+        self.mean += delta * other.count / combined
+        self.m2 += other.m2 + delta * delta * self.count * other.count / combined
+        self.count = combined
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+    
+    def describe(self, percentiles: tuple[float, ...], name: str) -> pd.Series:
+        """Résumé de la colonne, au format de DataFrame.describe()."""
+        labels = [f"{p * 100:g}%" for p in percentiles]
+        if self.kind == 'categorical':
+            if self.values:
+                top, freq = max(self.values.items(), key=lambda item: item[1])
+                return pd.Series(
+                    [self.count, len(self.values), top, freq],
+                    index=['count', 'unique', 'top', 'freq'], name=name,
+                )
+            return pd.Series(
+                [self.count, 0, np.nan, np.nan],
+                index=['count', 'unique', 'top', 'freq'], name=name, dtype='object',
+            )
+        
+        empty = self.count == 0
+        # Les quantiles estimés restent dans les bornes exactes observées
+        quantiles = [
+            min(max(q, self.minimum), self.maximum) if not empty else q
+            for q in self.sketch.quantiles(percentiles)
+        ]
+        if self.kind == 'datetime':
+            def timestamp(value: float) -> Any:
+                return pd.NaT if empty else pd.Timestamp(int(value))
+            return pd.Series(
+                [self.count, pd.NaT if empty else timestamp(self.total / self.count),
+                 timestamp(self.minimum), *map(timestamp, quantiles), timestamp(self.maximum)],
+                index=['count', 'mean', 'min', *labels, 'max'], name=name,
+            )
+        
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+        return pd.Series(
+            [self.count, math.nan if empty else self.total / self.count, std,
+             math.nan if empty else self.minimum, *quantiles,
+             math.nan if empty else self.maximum],
+            index=['count', 'mean', 'std', 'min', *labels, 'max'], name=name,
+            dtype='Float64' if self.extension else 'float64',
+        )
+
+
+class StreamingStats:
+    """
+    Accumulateur de statistiques descriptives d'un DataFrame lu par blocs.
+    
+    Comme DataFrame.describe(), seules les colonnes numériques et les dates
+    sont résumées ; à défaut, toutes les colonnes le sont (effectif, nombre
+    de valeurs distinctes, valeur la plus fréquente).
+    
+    Exemple:
+        stats = StreamingStats()
+        for chunk in chunks:
+            stats.update(chunk)
+        print(stats.describe().to_string())
+    """
+    
+    def __init__(self, percentiles: tuple[float, ...] = DEFAULT_PERCENTILES) -> None:
+        """
+        Args:
+            percentiles: Quantiles à calculer (entre 0 et 1)
+        """
+        self.percentiles = percentiles
+        self.rows = 0
+        self.columns: dict[str, ColumnStats] = {}
+    
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Ajoute les lignes d'un bloc.
+        
+        Les colonnes résumées sont choisies au premier bloc, d'après ses types.
+        
+        Args:
+            df: Bloc de données (mêmes colonnes et types pour tous les blocs)
+        """
+        if not self.columns:
+            self.columns = _column_stats_for(df)
+        self.rows += len(df)
+        for name, column in self.columns.items():
+            column.update(df[name])
+    
+    def merge(self, other: "StreamingStats") -> None:
+        """
+        Ajoute les statistiques d'un autre accumulateur (autre partie des données).
+        
+        Raises:
+            ValueError: Si les colonnes résumées diffèrent
+        """
+        if not other.columns:
+            return
+        if not self.columns:
+            self.columns = {name: ColumnStats(c.kind, c.extension) for name, c in other.columns.items()}
+        if list(self.columns) != list(other.columns):
+            raise ValueError("Impossible de fusionner des statistiques de colonnes différentes")
+        self.rows += other.rows
+        for name, column in self.columns.items():
+            column.merge(other.columns[name])
+    
+    def null_counts(self) -> dict[str, int]:
+        """Nombre de valeurs manquantes par colonne résumée."""
+        return {name: column.nulls for name, column in self.columns.items()}
+    
+    def describe(self) -> pd.DataFrame:
+        """
+        Résumé au format de DataFrame.describe() (mêmes lignes, même ordre).
+        
+        Raises:
+            ValueError: Si aucun bloc n'a été ajouté
+        """
+        if not self.columns:
+            raise ValueError("Aucune donnée à résumer")
+        described = [
+            column.describe(self.percentiles, name) for name, column in self.columns.items()
+        ]
+        # Même ordre des lignes que describe() : d'abord celles du résumé le
+        # plus court, puis les autres dans leur ordre d'apparition
+        rows: list[str] = []
+        for index in sorted((series.index for series in described), key=len):
+            rows.extend(label for label in index if label not in rows)
+        summary = pd.concat([series.reindex(rows) for series in described], axis=1)
+        summary.columns = list(self.columns)
+        return summary
+
+
+def _column_stats_for(df: pd.DataFrame) -> dict[str, ColumnStats]:
+    # Mêmes colonnes que describe() : nombres et dates, sinon toutes
+    selected = df.select_dtypes(include=[np.number, 'datetime'])
+    if not len(selected.columns):
+        return {
+            name: ColumnStats('categorical') for name in df.columns
+        }
+    return {
+        name: ColumnStats(
+            'datetime' if dtype.kind == 'M' else 'numeric',
+            extension=isinstance(dtype, pd.api.extensions.ExtensionDtype),
+        )
+        for name, dtype in selected.dtypes.items()
+    }
@@ -0,0 +1,36 @@
+"""
+Tests de row_fingerprints : deux lignes distinctes ne doivent jamais être
+confondues, et une même ligne garde son empreinte qu'elle ait été lue comme
+entière ou comme flottante.
+"""
+
+import numpy as np
+import pandas as pd
+
+from main import clean_csv_data
+from utils.dedup import row_fingerprints
+
+
+def test_large_integer_ids_stay_distinct():
+    # Identifiants de 19 chiffres et voisins de 2**53 : égaux une fois
+    # convertis en float64, ils doivent garder des empreintes distinctes
+    df = pd.DataFrame({
+        "id": [9007199254740993, 9007199254740992, 1234567890123456789, 1234567890123456788],
+        "name": ["a", "a", "b", "b"],
+    })
+    assert len(set(row_fingerprints(df).tolist())) == 4
+    assert len(clean_csv_data(df)) == 4
+
+
+def test_integral_floats_hash_like_integers():
+    as_int = pd.DataFrame({"id": [1, 2, 3], "qty": [10, 20, 30]})
+    as_float = pd.DataFrame({"id": [1.0, 2.0, 3.0], "qty": [10.0, 20.0, np.nan]})
+    assert (row_fingerprints(as_int)[:2] == row_fingerprints(as_float)[:2]).all()
+
+
+def test_float_normalization():
+    df = pd.DataFrame({"x": [0.0, -0.0, np.nan, -np.nan, 0.5]})
+    fingerprints = row_fingerprints(df)
+    assert fingerprints[0] == fingerprints[1]
+    assert fingerprints[2] == fingerprints[3]
+    assert len(set(fingerprints.tolist())) == 3
@@ -0,0 +1,48 @@
+"""
+Tests de la construction de l'index : le découpage en lots et le nombre de
+passes de fusion ne doivent pas changer les listes de positions.
+"""
+
+import random
+
+import pytest
+
+from utils import log_index
+from utils.log_index import LogIndex, build_log_index, tokenize
+
+
+WORDS = ['timeout', 'auth', 'paiement', 'refusé', 'db', 'cache', 'user', 'retry']
+
+
+def write_logs(directory, rng):
+    for level in ('info', 'error'):
+        lines = [
+            f"[2024-11-03 14:{i % 60:02d}:00] {level.upper()}: "
+            + " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5)))
+            for i in range(300)
+        ]
+        (directory / f"{level}.log").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def all_postings(directory):
+    index = LogIndex(directory)
+    return {token: index.lookup(token).tolist() for word in WORDS for token in tokenize(word)}
+
+
+@pytest.mark.parametrize("run_size, fan_in", [(7, 2), (50, 3), (1000, 64)])
+def test_multi_pass_merge(tmp_path, monkeypatch, run_size, fan_in):
+    write_logs(tmp_path, random.Random(0))
+    build_log_index(tmp_path)
+    expected = all_postings(tmp_path)
+    
+    monkeypatch.setattr(log_index, 'RUN_MAX_POSTINGS', run_size)
+    monkeypatch.setattr(log_index, 'RUN_MERGE_FAN_IN', fan_in)
+    build_log_index(tmp_path)
+    assert all_postings(tmp_path) == expected
+    assert sorted(path.name for path in (tmp_path / log_index.INDEX_DIRNAME).iterdir()) == [
+        log_index.META_FILENAME, log_index.POSTINGS_FILENAME, log_index.TERMS_FILENAME,
+    ]
+    
+    index = LogIndex(tmp_path)
+    for path, line in index.search(['timeout', 'auth']):
+        assert 'timeout' in line and 'auth' in line
@@ -0,0 +1,36 @@
+"""
+Tests du partitionnement : un horodatage invalide ne doit jamais produire
+de partition datée, ni faire échouer la lecture d'un répertoire.
+"""
+
+import pytest
+
+from utils.partitions import iter_partitions, partition_key
+
+
+@pytest.mark.parametrize("timestamp", ["2024-13-45 10:00:00", "2024-02-30 10:00:00", "2024-11-03 24:00:00"])
+def test_invalid_timestamp_goes_to_unknown(timestamp):
+    line = f"[{timestamp}] ERROR boom"
+    assert partition_key("ERROR", line, "hour") == "level=ERROR/date=unknown"
+    assert partition_key("ERROR", line, "day") == "level=ERROR/date=unknown"
+
+
+def test_valid_timestamp():
+    line = "[2024-02-29 23:59:59] ERROR boom"
+    assert partition_key("ERROR", line, "hour") == "level=ERROR/date=2024-02-29/hour=23"
+    assert partition_key("ERROR", line, "day") == "level=ERROR/date=2024-02-29"
+
+
+def test_iter_partitions_skips_unparseable_names(tmp_path):
+    level_dir = tmp_path / "level=ERROR"
+    (level_dir / "date=2024-13-45").mkdir(parents=True)
+    (level_dir / "date=2024-13-45" / "hour=10.log").write_text("")
+    (level_dir / "date=2024-11-03").mkdir()
+    (level_dir / "date=2024-11-03" / "hour=10.log").write_text("")
+    (level_dir / "date=2024-11-03" / "hour=99.log").write_text("")
+    (level_dir / "date=2024-02-30.log").write_text("")
+    
+    partitions = list(iter_partitions(tmp_path, start="2024-01-01", end="2025-01-01"))
+    assert [p.path.relative_to(tmp_path).as_posix() for p in partitions] == [
+        "level=ERROR/date=2024-11-03/hour=10.log",
+    ]
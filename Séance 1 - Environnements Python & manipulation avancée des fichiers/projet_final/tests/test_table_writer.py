@@ -0,0 +1,48 @@
+"""
+Tests de TableWriter : les blocs écrits sont regroupés en groupes de lignes
+(lots Feather) de row_group_size lignes, sans groupe vide.
+"""
+
+import pandas as pd
+import pytest
+
+from utils.io import TableWriter
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc as ipc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+
+CHUNK_SIZES = [300, 0, 450, 700, 0, 10, 2000, 5, 0]
+
+
+def group_sizes(path, fmt):
+    if fmt == 'parquet':
+        metadata = pq.ParquetFile(path).metadata
+        return [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+    reader = ipc.open_file(path)
+    return [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+
+
+@pytest.mark.parametrize("fmt", ['parquet', 'feather'])
+def test_chunks_are_grouped(tmp_path, fmt):
+    path = tmp_path / f"data.{fmt}"
+    chunks = [pd.DataFrame({'id': range(n), 'city': ['Paris'] * n}) for n in CHUNK_SIZES]
+    with TableWriter(path, fmt, row_group_size=1000) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    
+    assert group_sizes(path, fmt) == [1000, 1000, 1000, 465]
+    expected = pd.concat(chunks, ignore_index=True)
+    result = pd.read_parquet(path) if fmt == 'parquet' else pd.read_feather(path)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", ['parquet', 'feather'])
+def test_empty_frames(tmp_path, fmt):
+    path = tmp_path / f"data.{fmt}"
+    with TableWriter(path, fmt) as writer:
+        writer.write(pd.DataFrame({'id': pd.Series([], dtype='int64')}))
+        writer.write(pd.DataFrame({'id': pd.Series([], dtype='int64')}))
+    assert group_sizes(path, fmt) == []
+    assert list((pd.read_parquet(path) if fmt == 'parquet' else pd.read_feather(path)).columns) == ['id']
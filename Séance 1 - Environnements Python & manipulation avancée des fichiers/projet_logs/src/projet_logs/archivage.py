@@ -0,0 +1,122 @@
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Taille des blocs copiés lors de la compression et de la vérification
+TAILLE_BLOC = 1024 * 1024
+
+# Extension ajoutée au nom du fichier archivé, par compression
+EXTENSIONS = {"gzip": ".gz", "xz": ".xz", "aucune": ""}
+
+
+def ouvrir_compresse(brut, compression, nom, mtime):
+    # Flux compressé écrivant dans le fichier déjà ouvert `brut`
+    if compression == "gzip":
+        # Nom et date d'origine dans l'en-tête gzip (et non ceux du fichier temporaire)
+        return gzip.GzipFile(filename=nom, mode="wb", fileobj=brut, compresslevel=6, mtime=mtime)
+    return lzma.LZMAFile(brut, "wb", preset=6)
+
+
+def ouvrir_archive(chemin, compression):
+    if compression == "gzip":
+        return gzip.open(chemin, "rb")
+    if compression == "xz":
+        return lzma.open(chemin, "rb")
+    return open(chemin, "rb")
+
+
+def empreinte(flux):
+    # (taille, crc32) du contenu lu jusqu'à la fin du flux
+    taille, crc = 0, 0
+    while bloc := flux.read(TAILLE_BLOC):
+        taille += len(bloc)
+        crc = zlib.crc32(bloc, crc)
+    return taille, crc
+
+
+def archiver(log_file, archive_dir, compression="gzip"):
+    # Compresse `log_file` dans `archive_dir` via un fichier temporaire du même
+    # dossier, renommé atomiquement une fois complet ; l'archive est relue et
+    # comparée à la source avant que celle-ci ne soit supprimée. Une source
+    # modifiée entre-temps (lignes ajoutées) est conservée et l'archive retirée :
+    # elle sera archivée en entier au prochain passage.
+    log_file = Path(log_file)
+    archive_path = Path(archive_dir)
+    archive_path.mkdir(exist_ok=True, parents=True)
+    destination = archive_path / (log_file.name + EXTENSIONS[compression])
+
+    if compression == "aucune":
+        shutil.move(str(log_file), str(destination))
+        return destination
+
+    etat = log_file.stat()
+    mtime = int(etat.st_mtime)
+    tmp = tempfile.NamedTemporaryFile(dir=archive_path, prefix=f".{log_file.name}.", suffix=".tmp", delete=False)
+    try:
+        with tmp as brut:
+            with open(log_file, "rb") as source, ouvrir_compresse(brut, compression, log_file.name, mtime) as sortie:
+                taille, crc = 0, 0
+                while bloc := source.read(TAILLE_BLOC):
+                    sortie.write(bloc)
+                    taille += len(bloc)
+                    crc = zlib.crc32(bloc, crc)
+            brut.flush()
+            os.fsync(brut.fileno())
+        os.replace(tmp.name, destination)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+
+    # Vérification : l'archive doit redonner exactement le contenu lu
+    with ouvrir_archive(destination, compression) as flux:
+        if empreinte(flux) != (taille, crc):
+            destination.unlink()
+            raise OSError(f"Archive corrompue pour {log_file} : source conservée")
+
+    # Dernier contrôle juste avant la suppression : un écrivain a pu ajouter
+    # des lignes après la fin de la lecture
+    actuel = log_file.stat()
+    if (actuel.st_ino, actuel.st_size) != (etat.st_ino, taille):
+        destination.unlink()
+        raise OSError(f"{log_file} modifié pendant l'archivage : source conservée")
+    log_file.unlink()
+    return destination
+
+
+class Archiveur:
+    """Archivage en tâche de fond : pool de threads borné (compression, vérification, suppression)."""
+
+    def __init__(self, archive_dir, compression="gzip", threads=2, en_attente=None):
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Compression inconnue : {compression} ({', '.join(EXTENSIONS)})")
+        self.archive_dir = Path(archive_dir)
+        self.compression = compression
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="archivage")
+        # Au-delà de `en_attente` fichiers non archivés, soumettre() bloque :
+        # la lecture ne prend pas trop d'avance sur l'archivage
+        self.places = threading.BoundedSemaphore(en_attente or 2 * threads)
+        self.taches = []
+
+    def soumettre(self, log_file):
+        self.places.acquire()
+        try:
+            future = self.executor.submit(archiver, log_file, self.archive_dir, self.compression)
+        except BaseException:
+            self.places.release()
+            raise
+        future.add_done_callback(lambda _: self.places.release())
+        self.taches.append((Path(log_file), future))
+        return future
+
+    def terminer(self):
+        # Attend la fin des archivages ; retourne [(fichier, archive ou exception)]
+        self.executor.shutdown(wait=True)
+        resultats = [(log_file, future.exception() or future.result()) for log_file, future in self.taches]
+        self.taches = []
+        return resultats
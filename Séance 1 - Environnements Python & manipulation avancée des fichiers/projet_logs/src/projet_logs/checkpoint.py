@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Nombre maximal d'octets relus pour calculer l'empreinte de la dernière ligne
+TAIL_WINDOW = 64 * 1024
+
+
+def empreinte_fin(fichier, offset):
+    # Empreinte de la ligne qui se termine juste avant `offset`
+    if offset <= 0:
+        return ""
+    debut = max(0, offset - TAIL_WINDOW)
+    with open(fichier, "rb") as f:
+        f.seek(debut)
+        fin = f.read(offset - debut)
+    debut_ligne = fin.rfind(b"\n", 0, len(fin) - 1) + 1
+    return hashlib.blake2b(fin[debut_ligne:], digest_size=16).hexdigest()
+
+
+class CheckpointStore:
+    """Points de reprise (inode, taille, offset, empreinte) par fichier, stockés en JSON."""
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        self.entrees = {}
+        if self.chemin.exists():
+            self.entrees = json.loads(self.chemin.read_text(encoding="utf-8"))
+
+    def offset_reprise(self, log_file):
+        stat = Path(log_file).stat()
+        point = self.entrees.get(str(Path(log_file).resolve()))
+
+        # Rotation : l'inode a changé -> on cherche si le fichier a été renommé
+        if point is None or point["inode"] != stat.st_ino:
+            point = next(
+                (p for p in self.entrees.values() if p["inode"] == stat.st_ino), None
+            )
+            if point is None:
+                return 0
+
+        # Troncature ou réécriture : on repart du début
+        if stat.st_size < point["offset"]:
+            return 0
+        if empreinte_fin(log_file, point["offset"]) != point["last_line_hash"]:
+            return 0
+        return point["offset"]
+
+    def mettre_a_jour(self, log_file, offset):
+        stat = Path(log_file).stat()
+        self.entrees[str(Path(log_file).resolve())] = {
+            "inode": stat.st_ino,
+            "size": stat.st_size,
+            "offset": offset,
+            "last_line_hash": empreinte_fin(log_file, offset),
+        }
+
+    def oublier(self, log_file):
+        self.entrees.pop(str(Path(log_file).resolve()), None)
+
+    def sauvegarder(self):
+        # Écriture atomique : fichier temporaire puis renommage
+        self.chemin.parent.mkdir(exist_ok=True, parents=True)
+        tmp = self.chemin.with_name(self.chemin.name + ".tmp")
+        tmp.write_text(json.dumps(self.entrees, indent=2), encoding="utf-8")
+        os.replace(tmp, self.chemin)
+
+
+def lire_ajouts(log_file, offset, jusqu_a_la_fin=False):
+    # Lit les lignes complètes ajoutées après `offset` ; une dernière ligne
+    # sans '\n' (en cours d'écriture) sera lue au passage suivant, sauf si
+    # jusqu_a_la_fin=True (fichier sur le point d'être archivé)
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    fin = len(data) if jusqu_a_la_fin else data.rfind(b"\n") + 1
+    return data[:fin].decode("utf-8"), offset + fin
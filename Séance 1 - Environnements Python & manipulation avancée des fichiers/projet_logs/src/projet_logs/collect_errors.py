@@ -1,35 +1,220 @@
 from pathlib import Path
-import shutil
+import argparse
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
-def traiter_logs(log_dir, output_file, archive_dir=None):
+from projet_logs.archivage import Archiveur
+from projet_logs.checkpoint import CheckpointStore
+from projet_logs.filtres import FILTRE_PAR_DEFAUT, Filtre, extraire
+from projet_logs.suivi import suivre_logs
+
+
+def analyser_fichier(log_file, filtre, debut, jusqu_a_la_fin):
+    # Exécuté dans un processus du pool : (lignes retenues, offset de fin, erreur)
+    try:
+        lignes, offset = extraire(log_file, filtre, debut, jusqu_a_la_fin)
+        return lignes, offset, None
+    except Exception as e:
+        return [], debut, e
+
+
+def resultats_dans_l_ordre(executor, taches, fenetre):
+    # Les fichiers sont analysés en parallèle mais leurs résultats sont
+    # rendus dans l'ordre d'entrée ; au plus `fenetre` analyses en cours,
+    # pour borner la mémoire occupée par les résultats en attente
+    en_cours = deque()
+    for log_file, *arguments in taches:
+        future = None
+        if executor:
+            try:
+                future = executor.submit(analyser_fichier, log_file, *arguments)
+            except BrokenProcessPool:
+                # Pool inutilisable (processus tué) : la suite est analysée ici
+                executor = None
+        en_cours.append((log_file, future, arguments))
+        if len(en_cours) >= fenetre:
+            yield _resultat(*en_cours.popleft())
+    while en_cours:
+        yield _resultat(*en_cours.popleft())
+
+
+def _resultat(log_file, future, arguments):
+    if future is not None:
+        try:
+            return log_file, future.result()
+        except BrokenProcessPool:
+            # Processus du pool tué (mémoire, signal) : fichier analysé ici
+            pass
+    return log_file, analyser_fichier(log_file, *arguments)
+
+
+def traiter_logs(
+    log_dir, output_file, archive_dir=None, checkpoint_file=None, filtre=FILTRE_PAR_DEFAUT, workers=1,
+    compression="gzip", archiveurs=2,
+):
     raw_path = Path(log_dir)
     out_path = Path(output_file)
     
     # Création du dossier de sortie
     out_path.parent.mkdir(exist_ok=True, parents=True)
 
-    # Ouverture du fichier de sortie en écriture
-    with out_path.open("w", encoding="utf-8") as out:
-        # Parcours des fichiers .log [cite: 52]
-        for log_file in raw_path.glob("*.log"):
-            try:
-                content = log_file.read_text(encoding="utf-8")
-                for line in content.splitlines():
-                    # Filtrage des erreurs [cite: 52]
-                    if "ERROR" in line:
-                        out.write(f"[{log_file.name}] {line}\n")
-                
-                # Bonus : Archivage [cite: 66]
-                if archive_dir:
-                    archive_path = Path(archive_dir)
-                    archive_path.mkdir(exist_ok=True)
-                    shutil.move(str(log_file), str(archive_path / log_file.name))
-                    
-            except Exception as e:
-                print(f"Erreur lors de la lecture de {log_file}: {e}")
+    # Mode incrémental : on ne lit que les octets ajoutés depuis le dernier
+    # passage et on complète le fichier de sortie au lieu de l'écraser
+    store = CheckpointStore(checkpoint_file) if checkpoint_file else None
+    mode = "a" if store else "w"
+
+    # Parcours des fichiers .log [cite: 52], triés pour une sortie reproductible
+    log_files = sorted(raw_path.glob("*.log"))
+    taches = []
+    for log_file in log_files:
+        debut = store.offset_reprise(log_file) if store else 0
+        # Sans mode incrémental, ou avant archivage, le fichier est lu jusqu'au bout
+        taches.append((log_file, filtre, debut, bool(archive_dir) or not store))
+
+    # Analyse séquentielle par défaut ; workers=None : un processus par cœur
+    # (jamais plus que de fichiers)
+    workers = min(workers or os.cpu_count() or 1, len(log_files)) or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # Bonus : Archivage [cite: 66], en tâche de fond pendant l'analyse des fichiers suivants
+    archiveur = Archiveur(archive_dir, compression, threads=archiveurs) if archive_dir else None
+
+    # Ouverture du fichier de sortie
+    try:
+        with out_path.open(mode, encoding="utf-8") as out:
+            for log_file, (lignes, offset, erreur) in resultats_dans_l_ordre(executor, taches, 2 * workers):
+                if erreur is not None:
+                    print(f"Erreur lors de la lecture de {log_file}: {erreur}")
+                    continue
+                try:
+                    # Filtrage des erreurs [cite: 52], écrites dans l'ordre des fichiers
+                    if lignes:
+                        out.write("".join(f"[{log_file.name}] {ligne}\n" for ligne in lignes))
+
+                    if archiveur:
+                        # Les erreurs sont écrites avant que la source ne puisse être supprimée
+                        out.flush()
+                        archiveur.soumettre(log_file)
+                    elif store:
+                        store.mettre_a_jour(log_file, offset)
+
+                except Exception as e:
+                    print(f"Erreur lors de la lecture de {log_file}: {e}")
+    finally:
+        if executor:
+            executor.shutdown()
+        if archiveur:
+            for log_file, resultat in archiveur.terminer():
+                if isinstance(resultat, BaseException):
+                    print(f"Erreur lors de l'archivage de {log_file}: {resultat}")
+                elif store:
+                    store.oublier(log_file)
+
+    if store:
+        store.sauvegarder()
+
+
+def filtre_depuis_arguments(args):
+    # Sans option de filtrage, comportement historique (lignes contenant "ERROR")
+    niveaux = [n.strip() for n in args.niveaux.split(",") if n.strip()] if args.niveaux else []
+    mots_cles = args.mot_cle or []
+    regex = args.regex or []
+    if not (niveaux or mots_cles or regex):
+        return Filtre(mots_cles=("ERROR",), traces=args.traces)
+    return Filtre(niveaux, mots_cles, regex, traces=args.traces)
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collecte des erreurs dans les logs")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Ne lit que les lignes ajoutées depuis le dernier passage (sans archivage)",
+    )
+    parser.add_argument(
+        "--niveaux",
+        help="Niveaux à retenir, séparés par des virgules (ex. ERROR,CRITICAL,FATAL)",
+    )
+    parser.add_argument(
+        "--mot-cle",
+        action="append",
+        help="Mot-clé à rechercher dans les lignes (option répétable, ex. Traceback)",
+    )
+    parser.add_argument(
+        "--regex",
+        action="append",
+        help="Expression régulière à rechercher dans les lignes (option répétable)",
+    )
+    parser.add_argument(
+        "--traces",
+        action="store_true",
+        help="Retient aussi les lignes indentées qui suivent une ligne retenue (traces de pile)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "xz", "aucune"],
+        default="gzip",
+        help="Compression des fichiers archivés (défaut : gzip)",
+    )
+    parser.add_argument(
+        "--archiveurs",
+        type=int,
+        default=2,
+        help="Nombre de threads d'archivage (défaut : 2)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Nombre de processus d'analyse (défaut : 1, analyse séquentielle ; 0 : un par cœur)",
+    )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Suit les logs en continu jusqu'à Ctrl+C (incrémental, sans archivage)",
+    )
+    parser.add_argument(
+        "--latence-max",
+        type=float,
+        default=1.0,
+        help="Mode suivi : délai maximal en secondes avant l'écriture d'une erreur lue (défaut : 1)",
+    )
+    parser.add_argument(
+        "--taille-lot",
+        type=int,
+        default=1000,
+        help="Mode suivi : nombre d'erreurs en attente déclenchant une écriture (défaut : 1000)",
+    )
+    parser.add_argument(
+        "--intervalle",
+        type=float,
+        default=0.5,
+        help="Mode suivi : intervalle en secondes entre deux relectures des logs (défaut : 0.5)",
+    )
+    args = parser.parse_args()
+    try:
+        filtre = filtre_depuis_arguments(args)
+    except ValueError as e:
+        parser.error(str(e))
+
     # Bonus : Dater le fichier de sortie [cite: 66]
     date_str = datetime.now().strftime("%Y%m%d")
-    traiter_logs("raw_logs", f"output/errors_{date_str}.log", "archive")
\ No newline at end of file
+    if args.follow:
+        total = asyncio.run(suivre_logs(
+            "raw_logs", "output/errors_%Y%m%d.log", "output/.checkpoints.json", filtre,
+            latence_max=args.latence_max, taille_lot=args.taille_lot, intervalle=args.intervalle,
+        ))
+        print(f"Suivi arrêté : {total} erreurs collectées")
+    elif args.incremental:
+        traiter_logs(
+            "raw_logs", f"output/errors_{date_str}.log",
+            checkpoint_file="output/.checkpoints.json", filtre=filtre, workers=args.workers,
+        )
+    else:
+        traiter_logs(
+            "raw_logs", f"output/errors_{date_str}.log", "archive", filtre=filtre, workers=args.workers,
+            compression=args.compression, archiveurs=args.archiveurs,
+        )
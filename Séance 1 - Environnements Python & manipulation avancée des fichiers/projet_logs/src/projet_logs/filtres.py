@@ -0,0 +1,131 @@
+import re
+
+# Taille des blocs lus dans chaque fichier journal (1 Mio)
+TAILLE_BLOC = 1024 * 1024
+
+# En-tête d'une trace Python : les lignes indentées qui suivent, puis la
+# ligne de l'exception, font partie de la même erreur
+ENTETE_TRACEBACK = b"Traceback (most recent call last)"
+
+
+class Filtre:
+    """Niveaux, mots-clés et expressions régulières recherchés ensemble dans les lignes (sur les octets)."""
+
+    def __init__(self, niveaux=(), mots_cles=(), regex=(), traces=False):
+        alternatives = []
+        if niveaux:
+            # Niveau en tête de ligne, après l'horodatage éventuel : "[...] ERROR: ..."
+            noms = b"|".join(re.escape(n.upper().encode("utf-8")) for n in niveaux)
+            alternatives.append(rb"^(?:\[[^\]\n]*\][ \t]*)?(?:" + noms + rb")\b")
+        alternatives.extend(re.escape(m.encode("utf-8")) for m in mots_cles)
+
+        # Chaque regex est compilée seule : une regex invalide est signalée
+        # telle quelle. Sans groupe ni option globale, elle rejoint l'expression
+        # combinée ; sinon (références arrière, noms de groupes, "(?i)" en
+        # tête...) elle est recherchée à part, pour garder son sens.
+        separees = []
+        for r in regex:
+            try:
+                motif = re.compile(r.encode("utf-8"), re.MULTILINE)
+            except re.error as e:
+                raise ValueError(f"Expression régulière invalide '{r}': {e}") from None
+            if motif.groups == 0 and motif.flags == re.MULTILINE:
+                alternatives.append(motif.pattern)
+            else:
+                separees.append(motif)
+        if not (alternatives or separees):
+            raise ValueError("Le filtre doit contenir au moins un niveau, un mot-clé ou une regex")
+
+        self.niveaux = tuple(niveaux)
+        self.mots_cles = tuple(mots_cles)
+        self.regex = tuple(regex)
+        # Avec traces=True, les lignes indentées qui suivent une ligne retenue
+        # (trace de pile) sont retenues aussi
+        self.traces = traces
+        self.motifs = separees
+        if alternatives:
+            self.motifs.insert(0, re.compile(b"|".join(b"(?:" + a + b")" for a in alternatives), re.MULTILINE))
+
+    def extraire_bloc(self, bloc, sortie, trace_en_cours=None):
+        # `bloc` se termine par une fin de ligne (sauf le dernier bloc d'un
+        # fichier) ; les lignes retenues sont ajoutées à `sortie`. Retourne
+        # l'état de la trace en cours à la fin du bloc (à passer au bloc suivant).
+        position = 0
+        if trace_en_cours is not None:
+            position, trace_en_cours = self._suite_trace(bloc, 0, sortie, trace_en_cours)
+
+        # Début de la prochaine correspondance de chaque motif (-1 : aucune),
+        # recherchée à nouveau seulement quand elle a été dépassée
+        prochaines = [None] * len(self.motifs)
+        while True:
+            for i, motif in enumerate(self.motifs):
+                if prochaines[i] is None or 0 <= prochaines[i] < position:
+                    m = motif.search(bloc, position)
+                    prochaines[i] = m.start() if m else -1
+            trouvees = [debut for debut in prochaines if debut >= 0]
+            if not trouvees:
+                return trace_en_cours
+            correspondance = min(trouvees)
+            debut = bloc.rfind(b"\n", 0, correspondance) + 1
+            fin = bloc.find(b"\n", correspondance)
+            if fin < 0:
+                fin = len(bloc)
+            ligne = bloc[debut:fin]
+            sortie.append(decoder(ligne))
+            position = fin + 1
+            if self.traces:
+                trace_en_cours = "python" if ENTETE_TRACEBACK in ligne else "pile"
+                position, trace_en_cours = self._suite_trace(bloc, position, sortie, trace_en_cours)
+
+    def _suite_trace(self, bloc, position, sortie, trace):
+        while position < len(bloc):
+            fin = bloc.find(b"\n", position)
+            if fin < 0:
+                fin = len(bloc)
+            ligne = bloc[position:fin]
+            if ligne[:1] in (b" ", b"\t"):
+                sortie.append(decoder(ligne))
+                position = fin + 1
+                continue
+            # Trace Python : la première ligne non indentée est l'exception
+            if trace == "python" and ligne.strip():
+                sortie.append(decoder(ligne))
+                position = fin + 1
+            return position, None
+        return position, trace
+
+
+# Comportement historique de collect_errors : toute ligne contenant "ERROR"
+FILTRE_PAR_DEFAUT = Filtre(mots_cles=("ERROR",))
+
+
+def decoder(ligne):
+    # Un octet invalide ne concerne que sa ligne
+    return ligne.rstrip(b"\r").decode("utf-8", "replace")
+
+
+def extraire(log_file, filtre=FILTRE_PAR_DEFAUT, debut=0, jusqu_a_la_fin=True, taille_bloc=TAILLE_BLOC):
+    # Parcourt le fichier par blocs à partir de `debut` sans jamais le charger
+    # en entier. Retourne les lignes retenues et l'offset de fin de lecture ;
+    # une dernière ligne sans '\n' (en cours d'écriture) n'est lue que si
+    # jusqu_a_la_fin=True, comme pour lire_ajouts.
+    lignes = []
+    trace = None
+    reste = b""
+    offset = debut
+    with open(log_file, "rb") as f:
+        f.seek(debut)
+        while True:
+            donnees = f.read(taille_bloc)
+            if not donnees:
+                break
+            bloc = reste + donnees
+            coupe = bloc.rfind(b"\n") + 1
+            if coupe:
+                trace = filtre.extraire_bloc(bloc[:coupe], lignes, trace)
+                offset += coupe
+            reste = bloc[coupe:]
+    if reste and jusqu_a_la_fin:
+        filtre.extraire_bloc(reste, lignes, trace)
+        offset += len(reste)
+    return lignes, offset
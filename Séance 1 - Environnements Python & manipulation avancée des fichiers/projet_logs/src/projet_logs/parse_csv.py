@@ -1,24 +1,42 @@
 import pandas as pd
 from pathlib import Path
 
-def nettoyer_csv(input_path, output_path):
+from projet_logs.schema import SCHEMA_CLIENTS, appliquer_schema
+
+def nettoyer_csv(input_path, output_path, schema=SCHEMA_CLIENTS, format_sortie="csv", compression=None, row_group_size=None):
     # 1. Lecture du fichier (séparateur et encodage spécifiés dans le cours) [cite: 46]
-    # On gère les types si nécessaire avec dtype=str pour éviter les erreurs de conversion
-    df = pd.read_csv(input_path, sep=";", encoding="utf-8", dtype=str)
+    # Tout est lu en texte (dtype=str), puis converti colonne par colonne selon le schéma,
+    # qui décide seul des valeurs manquantes ; sans schéma, "NA", "N/A"... restent manquantes
+    df = pd.read_csv(input_path, sep=";", encoding="utf-8", dtype=str, keep_default_na=schema is None)
 
     # 2. Nettoyage des noms de colonnes [cite: 47]
     # Strip (espaces), lower (minuscule), replace (espace par underscore)
     df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
 
-    # 3. Gestion des valeurs manquantes (Ex: dropna si la ligne est vide) [cite: 47]
-    df = df.replace({"": None})
+    # 3. Typage (entiers, décimaux à virgule, dates jour/mois/année, booléens, catégories)
+    # Les valeurs vides ou invalides deviennent manquantes
+    if schema is not None:
+        df = appliquer_schema(df, schema)
+    else:
+        df = df.replace({"": None})
+
+    # 4. Gestion des valeurs manquantes (Ex: dropna si la ligne est vide) [cite: 47]
     df = df.dropna(how="all")
 
-    # 4. Sauvegarde dans output/clean_data.csv [cite: 61]
+    # 5. Sauvegarde dans output/clean_data.csv [cite: 61]
+    # Parquet / Feather (pyarrow requis) : types conservés, relecture bien plus rapide
     output_path = Path(output_path)
     output_path.parent.mkdir(exist_ok=True, parents=True) # Crée le dossier output si absent
-    df.to_csv(output_path, index=False)
+    if format_sortie == "parquet":
+        output_path = output_path.with_suffix(".parquet")
+        df.to_parquet(output_path, index=False, compression=compression or "snappy", row_group_size=row_group_size)
+    elif format_sortie == "feather":
+        output_path = output_path.with_suffix(".feather")
+        df.reset_index(drop=True).to_feather(output_path, compression=compression or "lz4")
+    else:
+        df.to_csv(output_path, index=False)
     print(f"Fichier nettoyé sauvegardé sous : {output_path}")
+    return df
 
 if __name__ == "__main__":
     # Chemins basés sur la structure demandée
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+# Valeurs considérées comme manquantes (en minuscules, sans espaces)
+VALEURS_MANQUANTES = {"", "na", "n/a", "nan", "null", "none", "-", "--", "—"}
+VRAI = {"true", "vrai", "oui", "yes", "y", "o", "1"}
+FAUX = {"false", "faux", "non", "no", "n", "0"}
+
+# Schéma de data/data.csv : colonne -> (type, options)
+SCHEMA_CLIENTS = {
+    "id_client": ("int", {"min": 1}),
+    "nom": ("category", {}),
+    "prenom": ("category", {}),
+    "age": ("int", {"min": 0, "max": 120}),
+    "date_inscription": ("date", {"formats": ["%d/%m/%Y", "%Y-%m-%d"]}),
+    "montant_total_eur": ("float", {"min": 0}),
+    "actif": ("bool", {}),
+    "derniere_connexion": ("date", {"formats": ["%d/%m/%Y %H:%M", "%d/%m/%Y", "ISO8601"]}),
+    "newsletter_ok": ("bool", {}),
+}
+
+
+def nettoyer_texte(serie):
+    # Espaces retirés, marqueurs de valeur manquante -> NaN
+    texte = serie.astype(object).str.strip()
+    return texte.mask(texte.str.lower().isin(VALEURS_MANQUANTES) | texte.isna())
+
+
+def bornes(nombres, options):
+    if "min" in options:
+        nombres = nombres.where(nombres >= options["min"])
+    if "max" in options:
+        nombres = nombres.where(nombres <= options["max"])
+    return nombres
+
+
+def vers_entier(serie, options):
+    nombres = bornes(pd.to_numeric(serie, errors="coerce"), options)
+    return nombres.where(nombres % 1 == 0).astype("Int64")
+
+
+def vers_decimal(serie, options):
+    # "1 234,50", "1,234.00", "2.500,00", "12,00€" : le dernier séparateur est la décimale
+    texte = serie.str.replace(r"[€$£\s  ]", "", regex=True)
+    virgule = texte.str.rfind(",") > texte.str.rfind(".")
+    texte = texte.where(~virgule, texte.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    texte = texte.where(virgule, texte.str.replace(",", "", regex=False))
+    nombres = pd.to_numeric(texte, errors="coerce").astype("float64")
+    return bornes(nombres.where(np.isfinite(nombres)), options)
+
+
+def vers_date(serie, options):
+    # Chaque format n'est essayé que sur les valeurs encore non reconnues
+    dates = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+    for fmt in options.get("formats", ["ISO8601"]):
+        restantes = dates.isna() & serie.notna()
+        if not restantes.any():
+            break
+        dates[restantes] = pd.to_datetime(serie[restantes], format=fmt, errors="coerce").astype("datetime64[ns]")
+    return dates
+
+
+def vers_booleen(serie, options):
+    minuscules = serie.str.lower()
+    booleens = pd.Series(pd.NA, index=serie.index, dtype="boolean")
+    booleens[minuscules.isin(VRAI)] = True
+    booleens[minuscules.isin(FAUX)] = False
+    return booleens
+
+
+CONVERTISSEURS = {
+    "int": vers_entier,
+    "float": vers_decimal,
+    "date": vers_date,
+    "bool": vers_booleen,
+    "category": lambda serie, options: serie.astype("category"),
+    "str": lambda serie, options: serie,
+}
+
+
+def appliquer_schema(df, schema):
+    """Convertit les colonnes texte (lues avec dtype=str) selon le schéma."""
+    colonnes = {}
+    for colonne in df.columns:
+        serie = nettoyer_texte(df[colonne])
+        if colonne in schema:
+            type_colonne, options = schema[colonne]
+            serie = CONVERTISSEURS[type_colonne](serie, options)
+        colonnes[colonne] = serie
+    return pd.DataFrame(colonnes, index=df.index)
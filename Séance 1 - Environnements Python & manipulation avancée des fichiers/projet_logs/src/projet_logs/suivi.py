@@ -0,0 +1,93 @@
+import asyncio
+import contextlib
+import signal
+import time
+from datetime import datetime
+from pathlib import Path
+
+from projet_logs.checkpoint import CheckpointStore
+from projet_logs.filtres import FILTRE_PAR_DEFAUT, extraire
+
+
+async def suivre_logs(
+    log_dir, motif_sortie, checkpoint_file, filtre=FILTRE_PAR_DEFAUT,
+    latence_max=1.0, taille_lot=1000, intervalle=0.5, duree=None,
+):
+    # Mode suivi : les fichiers .log sont relus périodiquement à partir de la
+    # dernière position lue. Une ligne retenue est écrite au plus tard
+    # `latence_max` secondes après sa lecture (ou dès que `taille_lot` lignes
+    # attendent) ; les points de reprise ne sont enregistrés qu'après
+    # l'écriture, donc une ligne peut être réécrite après un arrêt brutal
+    # mais jamais perdue. Ctrl+C / SIGTERM : arrêt propre après une dernière écriture.
+    store = CheckpointStore(checkpoint_file)
+    arret = asyncio.Event()
+    boucle = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            boucle.add_signal_handler(sig, arret.set)
+    if duree is not None:
+        boucle.call_later(duree, arret.set)
+
+    positions = {}        # fichier -> (inode, offset) déjà lu
+    a_enregistrer = set() # fichiers dont le point de reprise a avancé
+    en_attente = []       # lignes lues mais pas encore écrites
+    premiere = None       # instant de lecture de la plus ancienne ligne en attente
+    total = 0
+
+    def ecrire():
+        # Le nom du fichier de sortie est daté : il change à minuit
+        if en_attente:
+            sortie = Path(datetime.now().strftime(motif_sortie))
+            sortie.parent.mkdir(exist_ok=True, parents=True)
+            with sortie.open("a", encoding="utf-8") as out:
+                out.write("".join(en_attente))
+        for log_file in a_enregistrer:
+            inode, offset = positions[log_file]
+            with contextlib.suppress(FileNotFoundError):
+                # Fichier remplacé entre-temps (rotation) : son point de reprise n'est plus valable
+                if log_file.stat().st_ino == inode:
+                    store.mettre_a_jour(log_file, offset)
+        store.sauvegarder()
+        en_attente.clear()
+        a_enregistrer.clear()
+
+    try:
+        while not arret.is_set():
+            for log_file in sorted(Path(log_dir).glob("*.log")):
+                try:
+                    stat = log_file.stat()
+                    connu = positions.get(log_file)
+                    if connu and connu[0] == stat.st_ino and stat.st_size >= connu[1]:
+                        debut = connu[1]
+                    else:
+                        # Premier passage, rotation ou troncature : le point de reprise décide
+                        debut = store.offset_reprise(log_file)
+                    if stat.st_size <= debut:
+                        positions[log_file] = (stat.st_ino, debut)
+                        continue
+                    lignes, offset = await asyncio.to_thread(extraire, log_file, filtre, debut, False)
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    print(f"Erreur lors de la lecture de {log_file}: {e}")
+                    continue
+                if offset == debut:
+                    continue
+                positions[log_file] = (stat.st_ino, offset)
+                a_enregistrer.add(log_file)
+                if lignes:
+                    en_attente.extend(f"[{log_file.name}] {ligne}\n" for ligne in lignes)
+                    total += len(lignes)
+                    if premiere is None:
+                        premiere = time.monotonic()
+
+            delai_depasse = premiere is not None and time.monotonic() - premiere >= latence_max
+            if len(en_attente) >= taille_lot or delai_depasse or (a_enregistrer and not en_attente):
+                ecrire()
+                premiere = None
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(arret.wait(), min(intervalle, latence_max))
+    finally:
+        ecrire()
+    return total
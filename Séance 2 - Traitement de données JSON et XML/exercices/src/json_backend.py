@@ -0,0 +1,155 @@
+"""
+Sérialisation JSON avec le backend le plus rapide disponible.
+
+orjson (optionnel : uv pip install -e '.[fast]') est utilisé s'il est
+installé, le module json de la bibliothèque standard sinon ; la variable
+d'environnement JSON_BACKEND=json (ou set_backend("json")) force ce dernier.
+
+Pour les mêmes options (compact ou indenté, caractères non ASCII conservés),
+les deux backends écrivent les mêmes octets, sauf pour les flottants écrits
+en notation exponentielle ("1e16" au lieu de "1e+16", même valeur). Les cas
+qu'orjson ne sait pas traiter (entiers hors 64 bits, NaN et Infinity, qu'il
+écrirait null, ensure_ascii=True) passent par json.
+
+Ce module existe à l'identique dans exercices/src et mini-projet (projets
+indépendants, sans paquet commun) : toute modification est à reporter dans
+les deux copies.
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Backends connus, du plus rapide au plus lent
+JSON_BACKENDS = ("orjson", "json")
+
+# Entier peut-être hors des 64 bits d'orjson (qui le lirait comme un flottant) :
+# 19 chiffres ou plus (-9223372036854775809 n'en a que 19). Les chiffres sont
+# ramenés à "0" par translate puis la suite cherchée avec `in`, dix fois plus
+# rapide qu'une expression régulière \d{19}
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGIT_RUN = b"0" * 19
+
+# Marqueur d'un niveau d'indentation : un octet de contrôle n'apparaît jamais
+# brut dans une sortie JSON (orjson l'échappe en \u0001)
+_INDENT_MARK = b"\x01"
+
+_backend = "orjson" if orjson is not None and os.environ.get("JSON_BACKEND", "orjson") != "json" else "json"
+
+
+def get_backend() -> str:
+    """Nom du backend utilisé ("orjson" ou "json")."""
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """
+    Choisit le backend utilisé par loads, dumps, load et dump.
+    
+    Args:
+        name: "orjson" ou "json"
+    
+    Raises:
+        ValueError: Si le backend est inconnu ou non installé
+    """
+    global _backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Backend JSON inconnu: '{name}' (disponibles: {', '.join(JSON_BACKENDS)})")
+    if name == "orjson" and orjson is None:
+        raise ValueError("Le backend 'orjson' n'est pas installé (uv pip install orjson)")
+    _backend = name
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Décode un document JSON.
+    
+    Raises:
+        json.JSONDecodeError: Si le JSON est invalide (l'erreur d'orjson en hérite)
+    """
+    if _backend == "orjson":
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        if _LONG_DIGIT_RUN not in raw.translate(_DIGITS_TO_ZERO):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # Même message d'erreur que json (et NaN, accepté par json)
+                pass
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: int | None = None, ensure_ascii: bool = False) -> bytes:
+    """
+    Encode un objet en JSON (UTF-8).
+    
+    Args:
+        obj: Objet à encoder
+        indent: Nombre d'espaces par niveau ; None pour une sortie compacte
+            (sans espaces après "," et ":")
+        ensure_ascii: Échappe les caractères non ASCII (\\uXXXX)
+    
+    Returns:
+        Document JSON encodé en UTF-8
+    """
+    if _backend == "orjson" and not ensure_ascii and indent != 0:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            output = orjson.dumps(obj, option=option)
+        except TypeError:
+            # Entier de plus de 64 bits, type non géré... : json tranche
+            pass
+        else:
+            # NaN/Infinity, écrits null par orjson, passent par json : l'objet
+            # n'est parcouru que si la sortie contient null
+            if b"null" not in output or not _has_non_finite(obj):
+                if indent and indent != 2:
+                    output = _reindent(output, indent)
+                return output
+    
+    separators = None if indent is not None else (",", ":")
+    return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii, separators=separators).encode("utf-8")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    # Flottant NaN ou infini dans l'objet, valeurs et clés comprises
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _reindent(output: bytes, indent: int) -> bytes:
+    # Sortie indentée par 2 -> indent espaces par niveau. Les espaces d'une
+    # ligne suivent toujours un saut de ligne (aucune chaîne JSON n'en
+    # contient) : chaque passe remplace un niveau par un marqueur, en
+    # quelques replace() sur tout le texte plutôt qu'un appel par ligne
+    output = output.replace(b"\n  ", b"\n" + _INDENT_MARK)
+    while _INDENT_MARK + b"  " in output:
+        output = output.replace(_INDENT_MARK + b"  ", _INDENT_MARK * 2)
+    return output.replace(_INDENT_MARK, b" " * indent)
+
+
+def load(path: str | Path) -> Any:
+    """Lit et décode un fichier JSON (une seule lecture, en octets)."""
+    return loads(Path(path).read_bytes())
+
+
+def dump(obj: Any, path: str | Path, indent: int | None = None, ensure_ascii: bool = False) -> None:
+    """Encode un objet et l'écrit dans un fichier JSON (options de dumps)."""
+    Path(path).write_bytes(dumps(obj, indent=indent, ensure_ascii=ensure_ascii))
@@ -5,9 +5,10 @@ les fusionner en un seul dataset, éliminer les doublons,
 et sauvegarder dans merged.json.
 """
 
-import json
 from pathlib import Path
 
+import json_backend
+
 
 def load_json(json_path: Path) -> list[dict]:
     """
@@ -15,12 +16,11 @@ def load_json(json_path: Path) -> list[dict]:
     
     Args:
         json_path: Chemin vers le fichier JSON
-        
+    
     Returns:
         Liste de dictionnaires
     """
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = json_backend.load(json_path)
     print(f"📄 Chargé {len(data)} entrées depuis {json_path.name}")
     return data
 
@@ -32,7 +32,7 @@ def merge_datasets(datasets: list[list[dict]], key: str = "id") -> list[dict]:
     Args:
         datasets: Liste de datasets à fusionner
         key: Clé utilisée pour identifier les doublons
-        
+    
     Returns:
         Dataset fusionné sans doublons
     """
@@ -57,8 +57,7 @@ def save_to_json(data: list[dict], json_path: Path) -> None:
         data: Données à sauvegarder
         json_path: Chemin vers le fichier JSON de sortie
     """
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    json_backend.dump(data, json_path, indent=4, ensure_ascii=False)
     print(f"✅ Données sauvegardées dans {json_path}")
 
 
@@ -5,9 +5,10 @@ et sauvegarder le tout dans un fichier books.json.
 """
 
 import xml.etree.ElementTree as ET
-import json
 from pathlib import Path
 
+import json_backend
+
 
 def load_books_from_xml(xml_path: Path) -> list[dict]:
     """
@@ -15,7 +16,7 @@ def load_books_from_xml(xml_path: Path) -> list[dict]:
     
     Args:
         xml_path: Chemin vers le fichier XML
-        
+    
     Returns:
         Liste de dictionnaires contenant les informations des livres
     """
@@ -44,8 +45,7 @@ def save_to_json(data: list[dict], json_path: Path) -> None:
         data: Données à sauvegarder
         json_path: Chemin vers le fichier JSON de sortie
     """
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    json_backend.dump(data, json_path, indent=4, ensure_ascii=False)
     print(f"✅ Données sauvegardées dans {json_path}")
 
 
@@ -3,23 +3,84 @@
 ==========================================================
 
 Objectifs :
-- Lecture d'un fichier data.json ou data.xml
-- Détection automatique du format
+- Lecture d'un fichier data.json ou data.xml (ainsi que NDJSON et CSV)
+- Détection automatique du format (registre de formats extensible)
 - Transformation vers un format standard Python (dict ou list)
 - Gestion des erreurs (fichier vide, mauvais format, clé manquante)
 """
 
+import codecs
+import csv
+import gc
+import hashlib
+import io
 import json
+import os
+import pickle
+import re
+import sys
+import tempfile
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, TextIO
 from enum import Enum
 
+import json_backend
+
+
+# Taille des blocs lus lors du parsing en streaming (64 Kio)
+READ_CHUNK_SIZE = 64 * 1024
+
+# Taille du début de fichier examiné pour reconnaître un format (4 Kio)
+SNIFF_SIZE = 4 * 1024
+
+# Échantillon servant à déduire le type des feuilles XML (infer_types=True) :
+# nombre d'enregistrements (streaming) et nombre maximal de valeurs examinées
+XML_SAMPLE_RECORDS = 100
+XML_SAMPLE_VALUES = 10_000
+
+# Cache disque de parse_many : emplacement et taille maximale par défaut (512 Mio)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "multi_parser"
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+
+# Version des résultats en cache : à incrémenter quand le parsing change
+CACHE_VERSION = 1
+
+# Limites par défaut de display_data : profondeur, éléments par dict/liste
+# et lignes au total (None : pas de limite)
+DISPLAY_MAX_DEPTH = 6
+DISPLAY_MAX_ITEMS = 20
+DISPLAY_MAX_LINES = 200
+
+# Nombre de lignes accumulées par display_data avant chaque écriture
+DISPLAY_BUFFER_LINES = 1000
+
+# Séparateurs de colonnes reconnus dans les fichiers CSV
+CSV_DELIMITERS = ",;\t|"
+
+# Contenu vide (blancs seulement)
+_BLANK_RE = re.compile(rb"\s*")
+
+# Marques d'ordre des octets (BOM) et encodage correspondant ;
+# UTF-32 avant UTF-16, dont la marque est un préfixe de la sienne
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
 
 class FileFormat(Enum):
     """Enumération des formats de fichiers supportés."""
     JSON = "json"
+    NDJSON = "ndjson"
     XML = "xml"
+    CSV = "csv"
     UNKNOWN = "unknown"
 
 
@@ -43,6 +104,73 @@ class MissingKeyError(ParserError):
     pass
 
 
+@dataclass(frozen=True)
+class FormatHandler:
+    """Format de fichier enregistré : extensions, reconnaissance par le contenu et parsing."""
+    name: str
+    extensions: tuple[str, ...]
+    sniff: Callable[[str], bool]          # Début du fichier décodé (lignes complètes si possible) -> reconnu ?
+    parse: Callable[[bytes, str], Any]    # (contenu, nom du fichier) -> données
+
+
+# Formats enregistrés, dans l'ordre où leurs reconnaissances sont essayées
+_FORMATS: list[FormatHandler] = []
+
+
+def register_format(handler: FormatHandler, before: str | None = None) -> FormatHandler:
+    """
+    Enregistre un format auprès de parse_file et detect_format.
+    
+    Args:
+        handler: Format à enregistrer (remplace un format de même nom)
+        before: Nom d'un format dont la reconnaissance doit être essayée
+            après celle-ci (format plus spécifique) ; à la fin sinon
+    
+    Returns:
+        Le format enregistré
+    """
+    _FORMATS[:] = [h for h in _FORMATS if h.name != handler.name]
+    names = [h.name for h in _FORMATS]
+    position = names.index(before) if before in names else len(_FORMATS)
+    _FORMATS.insert(position, handler)
+    return handler
+
+
+def find_format(file_path: Path, prefix: bytes | None = None) -> FormatHandler | None:
+    """
+    Cherche le format d'un fichier d'après son extension, sinon son début.
+    
+    Seuls les SNIFF_SIZE premiers octets sont examinés (BOM pris en compte),
+    quelle que soit la taille du fichier.
+    
+    Args:
+        file_path: Chemin vers le fichier
+        prefix: Début du fichier déjà lu (évite une lecture supplémentaire)
+    
+    Returns:
+        Format reconnu, ou None
+    """
+    extension = file_path.suffix.lower()
+    for handler in _FORMATS:
+        if extension in handler.extensions:
+            return handler
+    
+    if prefix is None:
+        with open(file_path, "rb") as f:
+            prefix = f.read(SNIFF_SIZE)
+    text = _decode_prefix(prefix[:SNIFF_SIZE])
+    last_newline = text.rfind("\n")
+    if len(prefix) >= SNIFF_SIZE and last_newline >= 0:
+        # Dernière ligne probablement coupée : seules les lignes complètes sont
+        # examinées. Sans saut de ligne (JSON minifié, XML sur une ligne), le
+        # début est gardé tel quel : les formats par lignes en exigent deux
+        text = text[:last_newline + 1]
+    for handler in _FORMATS:
+        if handler.sniff(text):
+            return handler
+    return None
+
+
 def detect_format(file_path: Path) -> FileFormat:
     """
     Détecte automatiquement le format d'un fichier basé sur son extension
@@ -50,93 +178,484 @@ def detect_format(file_path: Path) -> FileFormat:
     
     Args:
         file_path: Chemin vers le fichier
-        
+    
     Returns:
-        FileFormat correspondant au type détecté
+        FileFormat correspondant au type détecté (UNKNOWN pour un format
+        ajouté par register_format : voir find_format)
     """
-    extension = file_path.suffix.lower()
+    try:
+        handler = find_format(file_path)
+    except OSError:
+        return FileFormat.UNKNOWN
     
-    if extension == ".json":
-        return FileFormat.JSON
-    elif extension == ".xml":
-        return FileFormat.XML
-    else:
-        # Tenter de détecter par le contenu
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:
-                    return FileFormat.UNKNOWN
-                if content.startswith("{") or content.startswith("["):
-                    return FileFormat.JSON
-                elif content.startswith("<?xml") or content.startswith("<"):
-                    return FileFormat.XML
-        except Exception:
-            pass
-        
+    try:
+        return FileFormat(handler.name) if handler else FileFormat.UNKNOWN
+    except ValueError:
         return FileFormat.UNKNOWN
 
 
+def _split_bom(data: bytes) -> tuple[bytes, str]:
+    # (contenu sans BOM, encodage) ; UTF-8 en l'absence de BOM
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data[len(bom):], encoding
+    return data, "utf-8"
+
+
+def _decode(data: bytes, name: str) -> str:
+    data, encoding = _split_bom(data)
+    try:
+        return data.decode(encoding)
+    except UnicodeDecodeError as e:
+        raise InvalidFormatError(f"Encodage invalide dans '{name}': {e}")
+
+
+def _decode_prefix(prefix: bytes) -> str:
+    # Un caractère multi-octets coupé en fin de préfixe est ignoré
+    prefix, encoding = _split_bom(prefix)
+    return prefix.decode(encoding, errors="ignore")
+
+
+def _is_empty(data: bytes) -> bool:
+    # Vide ou seulement des blancs (après un éventuel BOM UTF-8), sans copie
+    offset = len(codecs.BOM_UTF8) if data.startswith(codecs.BOM_UTF8) else 0
+    return _BLANK_RE.fullmatch(data, offset) is not None
+
+
+def _read_content(file_path: Path) -> bytes:
+    data = file_path.read_bytes()
+    if _is_empty(data):
+        raise EmptyFileError(f"Le fichier '{file_path.name}' est vide")
+    return data
+
+
 def parse_json(file_path: Path) -> dict | list:
     """
     Parse un fichier JSON et retourne son contenu.
     
     Args:
         file_path: Chemin vers le fichier JSON
-        
+    
     Returns:
         Contenu du fichier sous forme de dict ou list
-        
+    
     Raises:
         EmptyFileError: Si le fichier est vide
         InvalidFormatError: Si le JSON est invalide
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read().strip()
+    return _parse_json(_read_content(file_path), file_path.name)
+
+
+def _parse_json(data: bytes, name: str) -> dict | list:
+    # Les blancs autour du document sont ignorés : pas de copie par strip() ;
+    # en UTF-8, les octets sont décodés directement par le backend
+    content, encoding = _split_bom(data)
+    try:
+        return json_backend.loads(content if encoding == "utf-8" else _decode(data, name))
+    except UnicodeDecodeError as e:
+        raise InvalidFormatError(f"Encodage invalide dans '{name}': {e}")
+    except json.JSONDecodeError as e:
+        raise InvalidFormatError(f"Format JSON invalide dans '{name}': {e}")
+
+
+def parse_ndjson(file_path: Path) -> list:
+    """
+    Parse un fichier NDJSON (un document JSON par ligne).
     
-    if not content:
-        raise EmptyFileError(f"Le fichier '{file_path.name}' est vide")
+    Args:
+        file_path: Chemin vers le fichier NDJSON
     
+    Returns:
+        Liste des documents, les lignes vides étant ignorées
+    
+    Raises:
+        EmptyFileError: Si le fichier est vide
+        InvalidFormatError: Si une ligne n'est pas du JSON valide
+    """
+    return _parse_ndjson(_read_content(file_path), file_path.name)
+
+
+def _parse_ndjson(data: bytes, name: str) -> list:
+    records = []
+    for line_number, line in enumerate(_decode(data, name).splitlines(), start=1):
+        if not line or line.isspace():
+            continue
+        try:
+            records.append(json_backend.loads(line))
+        except json.JSONDecodeError as e:
+            raise InvalidFormatError(f"Format NDJSON invalide dans '{name}' (ligne {line_number}): {e}")
+    return records
+
+
+def parse_csv(file_path: Path) -> list:
+    """
+    Parse un fichier CSV avec en-tête (séparateur détecté : , ; tabulation ou |).
+    
+    Args:
+        file_path: Chemin vers le fichier CSV
+    
+    Returns:
+        Liste de dicts (un par ligne), valeurs converties par convert_value ;
+        None pour une colonne absente de la ligne
+    
+    Raises:
+        EmptyFileError: Si le fichier est vide
+        InvalidFormatError: Si une ligne a plus de colonnes que l'en-tête
+    """
+    return _parse_csv(_read_content(file_path), file_path.name)
+
+
+def _parse_csv(data: bytes, name: str) -> list:
+    text = _decode(data, name)
+    sample = text[:SNIFF_SIZE]
     try:
-        return json.loads(content)
-    except json.JSONDecodeError as e:
-        raise InvalidFormatError(f"Format JSON invalide dans '{file_path.name}': {e}")
+        dialect = csv.Sniffer().sniff(sample[:sample.rfind("\n") + 1] or sample, delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        dialect = csv.excel
+    
+    reader = csv.DictReader(io.StringIO(text, newline=""), dialect=dialect)
+    records = []
+    try:
+        for row in reader:
+            if None in row:
+                raise InvalidFormatError(
+                    f"Format CSV invalide dans '{name}' (ligne {reader.line_num}): "
+                    "plus de colonnes que l'en-tête"
+                )
+            records.append({key: convert_value(value) if value is not None else None for key, value in row.items()})
+    except csv.Error as e:
+        raise InvalidFormatError(f"Format CSV invalide dans '{name}' (ligne {reader.line_num}): {e}")
+    return records
+
+
+def iter_records(file_path: str | Path, path_expr: str | None = "products") -> Iterator[Any]:
+    """
+    Parcourt un par un les éléments d'un tableau JSON sans charger le fichier.
+    
+    Le fichier est lu par blocs de READ_CHUNK_SIZE caractères : seul
+    l'élément en cours est décodé, les valeurs qui ne sont pas sur le
+    chemin sont sautées sans être construites. La mémoire dépend de la
+    taille d'un élément, pas de celle du fichier. Le contenu qui suit le
+    tableau n'est pas lu.
+    
+    Args:
+        file_path: Chemin vers le fichier JSON
+        path_expr: Chemin du tableau, clés séparées par des points
+            ("products", "catalog.products") ; None ou "" pour un
+            tableau à la racine du document
+    
+    Yields:
+        Éléments du tableau, dans l'ordre du fichier
+    
+    Raises:
+        EmptyFileError: Si le fichier est vide
+        InvalidFormatError: Si le JSON est invalide ou si le chemin ne
+            désigne pas un tableau
+        MissingKeyError: Si une clé du chemin est absente
+    """
+    path = Path(file_path)
+    keys = path_expr.split(".") if path_expr else []
+    
+    # Encodage d'après le BOM, comme parse_file ; les codecs utf-8-sig,
+    # utf-16 et utf-32 retirent eux-mêmes le BOM
+    with open(path, "rb") as f:
+        _, encoding = _split_bom(f.read(4))
+    encoding = "utf-8-sig" if encoding == "utf-8" else encoding[:6]
+    
+    with open(path, "r", encoding=encoding) as f:
+        stream = _JsonStream(f, READ_CHUNK_SIZE)
+        try:
+            if stream.peek() == "":
+                raise EmptyFileError(f"Le fichier '{path.name}' est vide")
+            
+            # Descente jusqu'au tableau : les autres valeurs sont sautées
+            for depth, key in enumerate(keys):
+                if not stream.find_key(key):
+                    raise MissingKeyError(f"Clé manquante: '{'.'.join(keys[:depth + 1])}'")
+            
+            if stream.peek() != "[":
+                raise InvalidFormatError(
+                    f"'{path_expr or 'racine'}' n'est pas un tableau dans '{path.name}'"
+                )
+            stream.expect("[")
+            if stream.peek() == "]":
+                return
+            while True:
+                yield stream.read_value()
+                if stream.peek() == "]":
+                    return
+                stream.expect(",")
+        except json.JSONDecodeError as e:
+            # e.msg porte la position dans le fichier (celle de e est relative au tampon)
+            raise InvalidFormatError(f"Format JSON invalide dans '{path.name}': {e.msg}")
+        except UnicodeDecodeError as e:
+            raise InvalidFormatError(f"Encodage invalide dans '{path.name}': {e}")
+
+
+# Fin d'une chaîne JSON (après le guillemet ouvrant) et caractères structurants
+_STRING_END_RE = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURE_RE = re.compile(r'["\[\]{}]')
+_NUMBER_TAIL_RE = re.compile(r'[0-9.eE+-]*')
+
+
+class _JsonStream:
+    """Lecture d'un document JSON par blocs, valeur par valeur (pour iter_records)."""
+    
+    def __init__(self, f: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.offset = 0  # Position de buffer[0] dans le fichier (messages d'erreur)
+        self.decoder = json.JSONDecoder()
+    
+    def _fill(self, size: int | None = None) -> bool:
+        # Ajoute un bloc au tampon en oubliant la partie déjà consommée
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+    
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+    
+    def peek(self) -> str:
+        """Prochain caractère significatif (blancs sautés), "" en fin de fichier."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"'{char}' attendu (caractère {self.offset + self.pos})")
+        self.pos += 1
+    
+    def read_value(self) -> Any:
+        """Décode la valeur suivante, en complétant le tampon si elle est coupée."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Seule une valeur coupée par la fin du tampon justifie de lire
+                # plus loin ; une erreur au milieu du tampon est définitive
+                truncated = e.pos >= len(self.buffer) - 6 or e.msg.startswith("Unterminated string")
+                if truncated and self._fill(max(self.chunk_size, len(self.buffer))):
+                    continue
+                raise self._error(f"{e.msg} (caractère {self.offset + e.pos})") from None
+            # Un nombre en fin de tampon ("-2.5e" -> -2.5) peut se poursuivre
+            # dans le bloc suivant
+            if self.eof or not _NUMBER_TAIL_RE.fullmatch(self.buffer, end):
+                self.pos = end
+                return value
+            self._fill(max(self.chunk_size, len(self.buffer)))
+    
+    def skip_value(self) -> None:
+        """Saute la valeur suivante sans la construire."""
+        char = self.peek()
+        if char == '"':
+            self.pos += 1
+            self._skip_string()
+        elif char in "[{":
+            depth = 0
+            while True:
+                match = _STRUCTURE_RE.search(self.buffer, self.pos)
+                if match is None:
+                    self.pos = len(self.buffer)
+                    if not self._fill():
+                        raise self._error("Fin de fichier inattendue")
+                    continue
+                self.pos = match.end()
+                if match.group() == '"':
+                    self._skip_string()
+                elif match.group() in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        else:
+            # Nombre, true, false ou null : décodé (petite valeur)
+            self.read_value()
+    
+    def _skip_string(self) -> None:
+        # Appelé juste après le guillemet ouvrant
+        while True:
+            match = _STRING_END_RE.match(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                return
+            if not self._fill(max(self.chunk_size, len(self.buffer))):
+                raise self._error("Chaîne non terminée")
+    
+    def find_key(self, key: str) -> bool:
+        """
+        Avance jusqu'à la valeur de `key` dans l'objet suivant.
+        
+        Returns:
+            True si la clé est trouvée (le flux est placé sur sa valeur),
+            False si l'objet se termine sans elle
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            return False
+        while True:
+            if self.peek() != '"':
+                raise self._error(f"Nom de clé attendu (caractère {self.offset + self.pos})")
+            name = self.read_value()
+            self.expect(":")
+            if name == key:
+                return True
+            self.skip_value()
+            if self.peek() == "}":
+                return False
+            self.expect(",")
 
 
-def parse_xml(file_path: Path) -> dict:
+def parse_xml(file_path: Path, infer_types: bool = False) -> dict:
     """
     Parse un fichier XML et retourne son contenu sous forme de dictionnaire.
     
     Args:
         file_path: Chemin vers le fichier XML
-        
+        infer_types: Convertit les feuilles avec des convertisseurs par
+            chemin déduits d'un échantillon (voir infer_converters) ;
+            résultat identique, sans exceptions sur les valeurs texte
+    
     Returns:
         Contenu du fichier sous forme de dict
-        
+    
     Raises:
         EmptyFileError: Si le fichier est vide
         InvalidFormatError: Si le XML est invalide
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read().strip()
-    
-    if not content:
-        raise EmptyFileError(f"Le fichier '{file_path.name}' est vide")
-    
+    return _parse_xml(_read_content(file_path), file_path.name, infer_types)
+
+
+def _parse_xml(data: bytes, name: str, infer_types: bool = False) -> dict:
+    # Octets transmis tels quels : l'encodage déclaré (ou le BOM) est respecté
     try:
-        root = ET.fromstring(content)
-        return xml_element_to_dict(root)
+        root = ET.fromstring(data)
     except ET.ParseError as e:
-        raise InvalidFormatError(f"Format XML invalide dans '{file_path.name}': {e}")
+        raise InvalidFormatError(f"Format XML invalide dans '{name}': {e}")
+    return xml_element_to_dict(root, infer_converters([root]) if infer_types else None)
+
+
+def iter_xml_records(
+    file_path: str | Path,
+    record_path: str = "product",
+    infer_types: bool = False,
+) -> Iterator[Any]:
+    """
+    Parcourt un par un les enregistrements d'un fichier XML sans charger l'arbre.
+    
+    Le document est lu avec ET.iterparse : chaque enregistrement est converti
+    par xml_element_to_dict dès sa balise fermante, puis retiré de l'arbre,
+    comme les éléments qui ne font partie d'aucun enregistrement. La mémoire
+    reste celle d'un enregistrement, quelle que soit la taille du fichier.
+    
+    Args:
+        file_path: Chemin vers le fichier XML
+        record_path: Balise des enregistrements ("product"), éventuellement
+            précédée de ses parents ("products/product") pour ne retenir
+            que ceux placés sous ces éléments
+        infer_types: Déduit des XML_SAMPLE_RECORDS premiers enregistrements
+            un convertisseur par chemin de feuille, utilisé pour tous les
+            enregistrements (résultat identique, voir infer_converters)
+    
+    Yields:
+        Enregistrements convertis, dans l'ordre du fichier (un enregistrement
+        imbriqué dans un autre fait partie de celui-ci)
+    
+    Raises:
+        EmptyFileError: Si le fichier est vide
+        InvalidFormatError: Si le XML est invalide
+    """
+    path = Path(file_path)
+    tags = record_path.strip("/").split("/")
+    stack = []           # Éléments ouverts, de la racine à l'élément courant
+    record_depth = None  # Profondeur de l'enregistrement en cours
+    # Avec infer_types, premiers enregistrements en attente des convertisseurs
+    sample = [] if infer_types else None
+    converters = None
+    
+    with open(path, "rb") as f:
+        try:
+            for event, element in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    stack.append(element)
+                    if record_depth is None and [e.tag for e in stack[-len(tags):]] == tags:
+                        record_depth = len(stack)
+                    continue
+                
+                stack.pop()
+                if record_depth is not None and len(stack) >= record_depth:
+                    # Élément intérieur à l'enregistrement : conservé jusqu'à sa fin
+                    continue
+                if record_depth is not None:
+                    record_depth = None
+                    if sample is not None:
+                        # Échantillon : conservé entier (mais détaché de l'arbre)
+                        sample.append(element)
+                        if len(sample) >= XML_SAMPLE_RECORDS:
+                            converters = infer_converters(sample)
+                            yield from (xml_element_to_dict(record, converters) for record in sample)
+                            sample = None
+                        if stack:
+                            stack[-1].remove(element)
+                        continue
+                    yield xml_element_to_dict(element, converters)
+                # Enregistrement traité ou élément hors enregistrement : libéré
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+            
+            if sample:
+                # Moins de XML_SAMPLE_RECORDS enregistrements dans le fichier
+                converters = infer_converters(sample)
+                yield from (xml_element_to_dict(record, converters) for record in sample)
+        except ET.ParseError as e:
+            if not stack and _is_blank(f):
+                raise EmptyFileError(f"Le fichier '{path.name}' est vide")
+            raise InvalidFormatError(f"Format XML invalide dans '{path.name}': {e}")
+
 
+def _is_blank(f) -> bool:
+    # Fichier (binaire) vide ou ne contenant que des blancs, lu par blocs
+    f.seek(0)
+    while chunk := f.read(READ_CHUNK_SIZE):
+        if not chunk.isspace():
+            return False
+    return True
 
-def xml_element_to_dict(element: ET.Element) -> dict:
+
+def xml_element_to_dict(
+    element: ET.Element,
+    converters: dict[str, Callable[[str], Any]] | None = None,
+    path: str | None = None,
+) -> dict:
     """
     Convertit récursivement un élément XML en dictionnaire Python.
     
     Args:
         element: Élément XML à convertir
-        
+        converters: Convertisseurs par chemin de feuille (infer_converters) ;
+            convert_value pour toutes les feuilles si None
+        path: Chemin de l'élément ("product/price") ; sa balise par défaut
+    
     Returns:
         Dictionnaire représentant l'élément XML
     """
@@ -151,7 +670,11 @@ def xml_element_to_dict(element: ET.Element) -> dict:
     if children:
         child_dict = {}
         for child in children:
-            child_data = xml_element_to_dict(child)
+            if converters:
+                child_path = f"{path or element.tag}/{child.tag}"
+                child_data = xml_element_to_dict(child, converters, child_path)
+            else:
+                child_data = xml_element_to_dict(child)
             
             # Gérer les éléments multiples avec le même nom (liste)
             if child.tag in child_dict:
@@ -165,6 +688,9 @@ def xml_element_to_dict(element: ET.Element) -> dict:
     elif element.text and element.text.strip():
         # Convertir les types de base
         text = element.text.strip()
+        if converters:
+            # Chemin absent de l'échantillon : conversion générale, sans exception
+            return converters.get(path or element.tag, _convert_checked)(text)
         return convert_value(text)
     
     return result
@@ -176,7 +702,7 @@ def convert_value(value: str) -> Any:
     
     Args:
         value: Valeur à convertir
-        
+    
     Returns:
         Valeur convertie (int, float, bool ou str)
     """
@@ -202,6 +728,115 @@ def convert_value(value: str) -> Any:
     return value
 
 
+# Formes acceptées par int() et float() (chiffres Unicode et "_" compris) ;
+# au-delà de _INT_MAX_DIGITS chiffres, int() refuse la chaîne
+_INT_RE = re.compile(r"[+-]?\d+(?:_\d+)*")
+_NUMBER_RE = re.compile(
+    r"(?P<int>[+-]?\d+(?:_\d+)*)"
+    r"|(?P<float>[+-]?(?:(?:(?:\d+(?:_\d+)*)?\.\d+(?:_\d+)*|\d+(?:_\d+)*\.?)(?:e[+-]?\d+(?:_\d+)*)?"
+    r"|nan|inf|infinity))",
+    re.IGNORECASE,
+)
+_INT_MAX_DIGITS = 4300
+
+# Premiers caractères possibles d'un booléen ou d'un nombre (hors chiffres)
+_NON_TEXT_START = frozenset("+-.tTfFnNiI")
+
+
+def _convert_checked(value: str) -> Any:
+    # Même résultat que convert_value, mais la forme de la chaîne est
+    # vérifiée avant int() / float() : aucune exception levée
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    match = _NUMBER_RE.fullmatch(value)
+    if match is None:
+        return value
+    if match.lastgroup == "int":
+        return int(value) if len(value) <= _INT_MAX_DIGITS else convert_value(value)
+    return float(value)
+
+
+def _to_bool(value: str) -> Any:
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    return _convert_checked(value)
+
+
+def _to_int(value: str) -> Any:
+    if _INT_RE.fullmatch(value) and len(value) <= _INT_MAX_DIGITS:
+        return int(value)
+    return _convert_checked(value)
+
+
+def _to_float(value: str) -> Any:
+    match = _NUMBER_RE.fullmatch(value)
+    if match is not None and match.lastgroup == "float":
+        return float(value)
+    # Valeur entière (int, comme convert_value) ou non numérique
+    return _convert_checked(value)
+
+
+def _to_str(value: str) -> Any:
+    # Texte courant : un seul caractère examiné
+    if value[:1] in _NON_TEXT_START or value[:1].isdecimal():
+        return _convert_checked(value)
+    return value
+
+
+def infer_converters(
+    elements: Iterable[ET.Element],
+    max_values: int = XML_SAMPLE_VALUES,
+) -> dict[str, Callable[[str], Any]]:
+    """
+    Déduit d'un échantillon un convertisseur par chemin de feuille XML.
+    
+    Le type d'un chemin ("product/price") est celui de toutes ses valeurs
+    dans l'échantillon (bool, int, int/float, sinon texte). Le convertisseur
+    teste ce type en premier et retombe sur la conversion générale si une
+    valeur ne s'y conforme pas : les résultats sont ceux de convert_value,
+    sans exception levée pour les valeurs texte.
+    
+    Args:
+        elements: Éléments de l'échantillon (chemins relatifs à leur balise)
+        max_values: Nombre maximal de feuilles examinées
+    
+    Returns:
+        Dictionnaire chemin -> convertisseur, à passer à xml_element_to_dict
+    """
+    types: dict[str, set] = {}
+    seen = 0
+    for element in elements:
+        pending = [(element, element.tag)]
+        while pending and seen < max_values:
+            node, path = pending.pop()
+            children = list(node)
+            if children:
+                pending.extend((child, f"{path}/{child.tag}") for child in children)
+            elif node.text and node.text.strip():
+                types.setdefault(path, set()).add(type(_convert_checked(node.text.strip())))
+                seen += 1
+        if seen >= max_values:
+            break
+    
+    converters = {}
+    for path, found in types.items():
+        if found == {bool}:
+            converters[path] = _to_bool
+        elif found <= {int}:
+            converters[path] = _to_int
+        elif found <= {int, float}:
+            converters[path] = _to_float
+        else:
+            converters[path] = _to_str
+    return converters
+
+
 def get_value(data: dict, key: str, required: bool = True) -> Any:
     """
     Récupère une valeur d'un dictionnaire avec gestion des clés manquantes.
@@ -210,10 +845,10 @@ def get_value(data: dict, key: str, required: bool = True) -> Any:
         data: Dictionnaire source
         key: Clé à récupérer
         required: Si True, lève une exception si la clé est manquante
-        
+    
     Returns:
         Valeur associée à la clé
-        
+    
     Raises:
         MissingKeyError: Si la clé est manquante et required=True
     """
@@ -224,16 +859,59 @@ def get_value(data: dict, key: str, required: bool = True) -> Any:
     return data[key]
 
 
+def _sniff_json(text: str) -> bool:
+    return text.lstrip()[:1] in ("{", "[")
+
+
+def _sniff_ndjson(text: str) -> bool:
+    # Au moins deux lignes, chacune un objet ou un tableau JSON complet
+    lines = [line for line in text.splitlines() if line and not line.isspace()][:5]
+    if len(lines) < 2:
+        return False
+    try:
+        return all(isinstance(json.loads(line), (dict, list)) for line in lines)
+    except json.JSONDecodeError:
+        return False
+
+
+def _sniff_xml(text: str) -> bool:
+    return text.lstrip().startswith("<")
+
+
+def _sniff_csv(text: str) -> bool:
+    # En-tête et lignes avec le même nombre (> 1) de colonnes, séparateur usuel
+    lines = [line for line in text.splitlines() if line and not line.isspace()][:10]
+    if len(lines) < 2 or lines[0].lstrip()[:1] in ("{", "[", "<"):
+        return False
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        return False
+    widths = {len(row) for row in csv.reader(lines, dialect)}
+    return len(widths) == 1 and widths.pop() > 1
+
+
+# Formats intégrés ; NDJSON est essayé avant JSON (dont il est un cas particulier)
+register_format(FormatHandler(FileFormat.NDJSON.value, (".ndjson", ".jsonl"), _sniff_ndjson, _parse_ndjson))
+register_format(FormatHandler(FileFormat.JSON.value, (".json",), _sniff_json, _parse_json))
+register_format(FormatHandler(FileFormat.XML.value, (".xml",), _sniff_xml, _parse_xml))
+register_format(FormatHandler(FileFormat.CSV.value, (".csv", ".tsv"), _sniff_csv, _parse_csv))
+
+
 def parse_file(file_path: str | Path) -> dict | list:
     """
-    Fonction principale : parse un fichier JSON ou XML automatiquement.
+    Fonction principale : parse un fichier JSON, NDJSON, XML ou CSV
+    automatiquement.
+    
+    Le fichier est lu une seule fois : le format est reconnu sur le début
+    du contenu lu (si l'extension ne suffit pas), puis ce contenu est parsé.
     
     Args:
         file_path: Chemin vers le fichier à parser
-        
+    
     Returns:
         Contenu du fichier sous forme de dict ou list
-        
+    
     Raises:
         FileNotFoundError: Si le fichier n'existe pas
         EmptyFileError: Si le fichier est vide
@@ -245,46 +923,350 @@ def parse_file(file_path: str | Path) -> dict | list:
     if not path.exists():
         raise FileNotFoundError(f"Fichier non trouvé: '{path}'")
     
-    # Détecter le format
-    file_format = detect_format(path)
+    # Unique lecture du fichier, puis détection du format sur son début
+    data = path.read_bytes()
+    handler = find_format(path, data[:SNIFF_SIZE])
     print(f"📄 Fichier: {path.name}")
-    print(f"🔍 Format détecté: {file_format.value.upper()}")
+    print(f"🔍 Format détecté: {(handler.name if handler else FileFormat.UNKNOWN.value).upper()}")
     
-    # Parser selon le format
-    if file_format == FileFormat.JSON:
-        return parse_json(path)
-    elif file_format == FileFormat.XML:
-        return parse_xml(path)
-    else:
+    return _parse_content(path, data, handler)
+
+
+def _parse_content(path: Path, data: bytes, handler: FormatHandler | None) -> Any:
+    if handler is None:
         raise InvalidFormatError(
             f"Format non supporté pour '{path.name}'. "
-            "Formats acceptés: JSON, XML"
+            f"Formats acceptés: {', '.join(h.name.upper() for h in _FORMATS)}"
         )
+    if _is_empty(data):
+        raise EmptyFileError(f"Le fichier '{path.name}' est vide")
+    
+    # Parser selon le format
+    return handler.parse(data, path.name)
 
 
-def display_data(data: dict | list, indent: int = 0) -> None:
+class ParseCache:
     """
-    Affiche les données de manière formatée.
+    Cache disque des fichiers parsés (pickle), borné en taille (LRU).
+    
+    Le résultat est stocké sous l'empreinte du contenu (et de l'extension,
+    dont dépend le format) ; une clé (chemin, taille, mtime_ns) mène à cette
+    empreinte. Un fichier inchangé est retrouvé sans être relu, un fichier
+    copié ou touché mais identique est relu et haché, mais pas reparsé.
+    """
+    
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.objects_dir = self.cache_dir / "objects"
+        self.keys_dir = self.cache_dir / "keys"
+    
+    @staticmethod
+    def stat_key(path: Path) -> str:
+        stat = path.stat()
+        raw = f"{CACHE_VERSION}\0{path.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=20).hexdigest()
+    
+    @staticmethod
+    def content_key(path: Path, data: bytes) -> str:
+        digest = hashlib.blake2b(data, digest_size=20)
+        digest.update(f"\0{CACHE_VERSION}\0{path.suffix.lower()}".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def lookup(self, path: Path) -> tuple[bool, Any]:
+        """Résultat d'un fichier inchangé depuis sa mise en cache : (trouvé, résultat)."""
+        try:
+            # Fichier absent ou illisible : l'analyse lèvera l'erreur adéquate
+            key = self.keys_dir / self.stat_key(path)
+            content_key = key.read_text(encoding="utf-8").split("\n")[0]
+        except (OSError, UnicodeDecodeError):
+            return False, None
+        found, result = self.load(content_key)
+        if found:
+            # Comme pour les résultats : date de modification = dernière utilisation
+            try:
+                os.utime(key)
+            except OSError:
+                pass
+        return found, result
+    
+    def load(self, content_key: str) -> tuple[bool, Any]:
+        entry = self.objects_dir / f"{content_key}.pickle"
+        # Le ramasse-miettes, déclenché sans cesse par la création de millions
+        # d'objets, ferait plus que doubler la durée du chargement
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(entry, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # Entrée illisible (écriture interrompue, version de Python...) : oubliée
+            entry.unlink(missing_ok=True)
+            return False, None
+        finally:
+            if gc_enabled:
+                gc.enable()
+        try:
+            # Date de modification = dernière utilisation (éviction LRU)
+            os.utime(entry)
+        except OSError:
+            pass
+        return True, result
+    
+    def store(self, content_key: str, result: Any) -> None:
+        self._write(self.objects_dir / f"{content_key}.pickle", pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+    
+    def remember(self, stat_key: str, content_key: str, path: Path) -> None:
+        # La prochaine consultation de ce fichier inchangé évitera sa lecture ;
+        # le chemin permet à evict de reconnaître une clé périmée
+        self._write(self.keys_dir / stat_key, f"{content_key}\n{path.resolve()}".encode("utf-8"))
+    
+    def _write(self, target: Path, payload: bytes) -> None:
+        # Fichier temporaire renommé : une entrée n'est jamais lue à moitié écrite
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    
+    def evict(self) -> int:
+        """
+        Supprime les résultats les moins récemment utilisés au-delà de max_bytes,
+        puis les clés devenues inutiles.
+        
+        Une clé est supprimée si son résultat ne l'est plus, ou si son fichier
+        a été modifié (nouvelle taille ou date) ou supprimé depuis : elle ne
+        serait plus jamais consultée.
+        
+        Returns:
+            Nombre de résultats supprimés
+        """
+        if not self.objects_dir.is_dir():
+            return 0
+        entries = []
+        for entry in self.objects_dir.glob("*.pickle"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        
+        for key in self.keys_dir.iterdir() if self.keys_dir.is_dir() else ():
+            if key.name.startswith(".tmp-"):
+                continue
+            try:
+                content_key, _, source = key.read_text(encoding="utf-8").partition("\n")
+            except (OSError, UnicodeDecodeError):
+                continue
+            stale = not (self.objects_dir / f"{content_key}.pickle").exists()
+            if not stale and source:
+                try:
+                    stale = self.stat_key(Path(source)) != key.name
+                except OSError:
+                    stale = True
+            if stale:
+                key.unlink(missing_ok=True)
+        return removed
+
+
+def _parse_quietly(path: Path, cache_dir: Path | None) -> Any:
+    # Exécuté dans un processus de parse_many : parse_file sans affichage,
+    # en passant par le cache (contenu déjà parsé sous un autre chemin)
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier non trouvé: '{path}'")
+    cache = ParseCache(cache_dir) if cache_dir is not None else None
+    stat_key = cache.stat_key(path) if cache else None
+    
+    data = path.read_bytes()
+    if cache:
+        content_key = cache.content_key(path, data)
+        found, result = cache.load(content_key)
+        if not found:
+            result = _parse_content(path, data, find_format(path, data[:SNIFF_SIZE]))
+            cache.store(content_key, result)
+        cache.remember(stat_key, content_key, path)
+        return result
+    return _parse_content(path, data, find_format(path, data[:SNIFF_SIZE]))
+
+
+def parse_many(
+    file_paths: Iterable[str | Path],
+    workers: int | None = None,
+    cache_dir: str | Path | None = DEFAULT_CACHE_DIR,
+    max_cache_bytes: int = DEFAULT_CACHE_SIZE,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Parse plusieurs fichiers en parallèle, avec un cache disque des résultats.
+    
+    Les fichiers inchangés depuis leur mise en cache sont chargés sans être
+    relus ; les autres sont parsés dans un pool de processus (les formats
+    ajoutés par register_format doivent l'être à l'import d'un module pour
+    être connus des processus). Le cache est ramené à max_cache_bytes en
+    supprimant les résultats les moins récemment utilisés.
     
     Args:
-        data: Données à afficher
-        indent: Niveau d'indentation
+        file_paths: Fichiers à parser
+        workers: Nombre de processus (défaut : nombre de cœurs)
+        cache_dir: Répertoire du cache ; None pour ne pas en utiliser
+        max_cache_bytes: Taille maximale du cache
+        return_exceptions: Place l'exception d'un fichier en échec dans la
+            liste des résultats au lieu de la lever
+    
+    Returns:
+        Résultats dans l'ordre des fichiers
+    
+    Raises:
+        FileNotFoundError: Si un fichier n'existe pas
+        ParserError: Si un fichier est vide, invalide ou non supporté
     """
-    prefix = "  " * indent
+    paths = [Path(p) for p in file_paths]
+    cache = ParseCache(cache_dir, max_cache_bytes) if cache_dir is not None else None
+    results = [None] * len(paths)
     
+    # Fichiers inchangés : une consultation du cache, sans lecture
+    missing = []
+    for index, path in enumerate(paths):
+        found = False
+        if cache:
+            found, results[index] = cache.lookup(path)
+        if not found:
+            missing.append(index)
+    
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        futures = {}
+        if executor:
+            futures = {index: executor.submit(_parse_quietly, paths[index], cache_dir) for index in missing}
+        for index in missing:
+            try:
+                if executor:
+                    results[index] = futures[index].result()
+                else:
+                    results[index] = _parse_quietly(paths[index], cache_dir)
+            except (OSError, ParserError) as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        if cache:
+            # À chaque appel, même sans nouveau résultat : max_cache_bytes a pu baisser
+            cache.evict()
+    
+    return results
+
+
+# Entrée de display_data sans contenu à afficher en dessous
+_NO_CHILD = object()
+
+
+def _display_entries(data: dict | list, max_items: int | None) -> Iterator[tuple[str, Any]]:
+    # (texte de la ligne, contenu affiché en dessous ou _NO_CHILD)
     if isinstance(data, dict):
-        for key, value in data.items():
+        for key, value in islice(data.items(), max_items):
             if isinstance(value, (dict, list)):
-                print(f"{prefix}📁 {key}:")
-                display_data(value, indent + 1)
+                yield f"📁 {key}:", value
             else:
-                print(f"{prefix}• {key}: {value}")
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            print(f"{prefix}[{i}]")
-            display_data(item, indent + 1)
+                yield f"• {key}: {value}", _NO_CHILD
+    else:
+        for i, item in enumerate(islice(data, max_items)):
+            yield f"[{i}]", item
+    if max_items is not None and len(data) > max_items:
+        yield f"… {len(data) - max_items:,} éléments de plus", _NO_CHILD
+
+
+def _container_summary(data: dict | list) -> str:
+    # Résumé d'un contenu trop profond pour être affiché
+    if isinstance(data, dict):
+        return f"{{…}} {len(data):,} clé(s)"
+    return f"[…] {len(data):,} élément(s)"
+
+
+def display_data(
+    data: dict | list,
+    indent: int = 0,
+    max_depth: int | None = DISPLAY_MAX_DEPTH,
+    max_items: int | None = DISPLAY_MAX_ITEMS,
+    max_lines: int | None = DISPLAY_MAX_LINES,
+    stream: TextIO | None = None,
+) -> None:
+    """
+    Affiche les données de manière formatée.
+    
+    Le parcours est itératif (pas de limite de récursion) et les lignes sont
+    écrites par blocs dans un seul flux. Les parties coupées par une limite
+    sont résumées ("… 999,990 éléments de plus", "[…] 12 élément(s)").
+    
+    Args:
+        data: Données à afficher
+        indent: Niveau d'indentation
+        max_depth: Niveaux de dict/liste imbriqués affichés sous data
+        max_items: Éléments affichés par dict ou liste
+        max_lines: Nombre maximal de lignes affichées
+        stream: Flux de sortie (sys.stdout par défaut)
+    """
+    out = stream if stream is not None else sys.stdout
+    lines = []
+    count = 0
+    
+    def emit(level: int, text: str) -> bool:
+        # False une fois la limite de lignes atteinte
+        nonlocal count
+        if max_lines is not None and count >= max_lines:
+            return False
+        lines.append(f"{'  ' * level}{text}\n")
+        count += 1
+        if len(lines) >= DISPLAY_BUFFER_LINES:
+            out.write("".join(lines))
+            lines.clear()
+        return True
+    
+    complete = True
+    if not isinstance(data, (dict, list)):
+        emit(indent, str(data))
     else:
-        print(f"{prefix}{data}")
+        # Pile de (entrées restantes, niveau d'indentation, profondeur)
+        stack = [(_display_entries(data, max_items), indent, 0)]
+        while stack:
+            entries, level, depth = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+            text, child = entry
+            if isinstance(child, (dict, list)) and max_depth is not None and depth >= max_depth:
+                text = f"{text} {_container_summary(child)}"
+                child = _NO_CHILD
+            if not emit(level, text):
+                complete = False
+                break
+            if isinstance(child, (dict, list)):
+                stack.append((_display_entries(child, max_items), level + 1, depth + 1))
+            elif child is not _NO_CHILD and not emit(level + 1, str(child)):
+                complete = False
+                break
+    
+    if not complete:
+        lines.append(f"{'  ' * indent}… affichage limité à {max_lines:,} lignes\n")
+    out.write("".join(lines))
 
 
 def main():
@@ -296,13 +1278,15 @@ def main():
     test_files = [
         ("data.json", "Fichier JSON valide"),
         ("data.xml", "Fichier XML valide"),
+        ("data.ndjson", "Fichier NDJSON valide"),
+        ("data.csv", "Fichier CSV valide"),
         ("empty.json", "Fichier vide"),
         ("invalid.txt", "Format non supporté"),
         ("nonexistent.json", "Fichier inexistant"),
     ]
     
     print("=" * 60)
-    print("🔧 MINI-PROJET : Parser Multi-Format (JSON/XML)")
+    print("🔧 MINI-PROJET : Parser Multi-Format (JSON/NDJSON/XML/CSV)")
     print("=" * 60)
     
     for filename, description in test_files:
@@ -332,7 +1316,15 @@ def main():
                     missing = get_value(data, "nonexistent_key")
                 except MissingKeyError as e:
                     print(f"  ⚠️ {e}")
-                    
+                
+                # Même lecture en streaming : un produit à la fois
+                if detect_format(file_path) == FileFormat.JSON:
+                    count = sum(1 for _ in iter_records(file_path, "products"))
+                    print(f"\n🌊 Lecture en streaming: {count} produits")
+                elif detect_format(file_path) == FileFormat.XML:
+                    count = sum(1 for _ in iter_xml_records(file_path, "products/product"))
+                    print(f"\n🌊 Lecture en streaming: {count} produits")
+        
         except FileNotFoundError as e:
             print(f"❌ Erreur: {e}")
         except EmptyFileError as e:
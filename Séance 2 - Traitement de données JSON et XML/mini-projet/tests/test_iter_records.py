@@ -0,0 +1,82 @@
+"""
+Tests de iter_records : la lecture par blocs doit donner les mêmes éléments
+que json.loads, quelle que soit la position des coupures entre blocs.
+"""
+
+import json
+import random
+
+import pytest
+
+import multi_parser
+from multi_parser import InvalidFormatError, MissingKeyError, iter_records
+
+
+def random_string(rng: random.Random) -> str:
+    # Guillemets, antislashs, échappements et caractères non ASCII
+    alphabet = 'ab "\\/\n\té€😀{}[],:'
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randint(0, 7 if depth < 3 else 4)
+    if kind == 0:
+        return rng.randint(-10**20, 10**20)
+    if kind == 1:
+        return rng.uniform(-1e6, 1e6) * 10 ** rng.randint(-30, 30)
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind in (3, 4):
+        return random_string(rng)
+    if kind in (5, 6):
+        return {random_string(rng): random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def random_document(rng: random.Random) -> tuple[str, list]:
+    # Clés sautées avant et après le tableau, blancs variables
+    records = [random_value(rng) for _ in range(rng.randint(0, 8))]
+    document = {
+        "meta": random_value(rng),
+        "catalog": {"skipped": random_value(rng), "products": records, "after": random_value(rng)},
+    }
+    indent = rng.choice([None, 0, 2])
+    return json.dumps(document, indent=indent, ensure_ascii=rng.random() < 0.5), records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 16, 64])
+def test_chunk_boundaries(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(multi_parser, "READ_CHUNK_SIZE", chunk_size)
+    rng = random.Random(chunk_size)
+    path = tmp_path / "catalog.json"
+    for _ in range(200):
+        text, records = random_document(rng)
+        path.write_text(text, encoding="utf-8")
+        assert list(iter_records(path, "catalog.products")) == records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64])
+def test_truncated_document(tmp_path, monkeypatch, chunk_size):
+    # Un document coupé avant la fin du tableau lève InvalidFormatError,
+    # jamais une autre erreur (la suite du tableau n'est pas lue)
+    monkeypatch.setattr(multi_parser, "READ_CHUNK_SIZE", chunk_size)
+    text = json.dumps({"products": [{"id": 1, "price": -2.5e-3, "name": "a\\\"b"}, [1, 2]]})
+    path = tmp_path / "truncated.json"
+    for end in range(1, text.rindex("]")):
+        path.write_text(text[:end], encoding="utf-8")
+        with pytest.raises((InvalidFormatError, MissingKeyError)):
+            list(iter_records(path, "products"))
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-16", "utf-32"])
+def test_bom_encodings(tmp_path, encoding):
+    path = tmp_path / "bom.json"
+    path.write_text('{"products": [{"name": "é"}, 2]}', encoding=encoding)
+    assert list(iter_records(path)) == [{"name": "é"}, 2]
+
+
+def test_invalid_utf8(tmp_path):
+    path = tmp_path / "invalid.json"
+    path.write_bytes(b'{"products": [{"name": "\xff"}]}')
+    with pytest.raises(InvalidFormatError):
+        list(iter_records(path))
@@ -0,0 +1,38 @@
+"""
+Tests de json_backend : orjson doit écrire les mêmes octets que json pour
+les valeurs qu'il ne représente pas lui-même.
+"""
+
+import json
+
+import pytest
+
+import json_backend
+
+pytest.importorskip("orjson")
+
+
+NAN, INF = float("nan"), float("inf")
+
+
+@pytest.fixture
+def backends():
+    previous = json_backend.get_backend()
+    yield
+    json_backend.set_backend(previous)
+
+
+@pytest.mark.parametrize("obj", [
+    {"a": [NAN, INF, -INF, None, 1.5]},
+    {NAN: 1},
+    {"x": (1, {"y": [INF]})},
+    [None, 2**70, -9223372036854775809],
+])
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_same_output_as_json(backends, obj, indent):
+    json_backend.set_backend("orjson")
+    fast = json_backend.dumps(obj, indent=indent)
+    json_backend.set_backend("json")
+    assert fast == json_backend.dumps(obj, indent=indent)
+    assert fast.decode("utf-8") == json.dumps(obj, indent=indent, ensure_ascii=False,
+                                              separators=None if indent is not None else (",", ":"))
@@ -0,0 +1,25 @@
+"""
+Tests de parse_many avec le cache : un fichier en échec ne doit pas empêcher
+le traitement des autres.
+"""
+
+import json
+
+import pytest
+
+from multi_parser import parse_many
+
+
+def test_missing_file_with_cache(tmp_path):
+    valid = tmp_path / "valid.json"
+    valid.write_text(json.dumps({"products": [1, 2]}), encoding="utf-8")
+    missing = tmp_path / "missing.json"
+    cache_dir = tmp_path / "cache"
+    
+    for _ in range(2):  # Sans puis avec le résultat de valid.json en cache
+        results = parse_many([missing, valid], workers=1, cache_dir=cache_dir, return_exceptions=True)
+        assert isinstance(results[0], FileNotFoundError)
+        assert results[1] == {"products": [1, 2]}
+    
+    with pytest.raises(FileNotFoundError):
+        parse_many([missing], workers=1, cache_dir=cache_dir)
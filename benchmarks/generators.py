@@ -0,0 +1,430 @@
+"""
+Générateurs de données synthétiques pour les benchmarks.
+
+Chaque générateur écrit son fichier au fil de l'eau (mémoire bornée, même
+pour 100 millions de lignes), est déterministe pour une graine donnée et
+retourne un Dataset décrivant ce qui a été produit (nombre d'éléments,
+taille en octets) pour calculer les débits.
+
+Formats produits :
+- journaux « [YYYY-MM-DD HH:MM:SS] LEVEL: message » (avec traces de pile) ;
+- CSV clients ';' au format français, aussi « sale » que data/data.csv ;
+- catalogues JSON et XML imbriqués, comme mini-projet/data ;
+- jeux JSON de personnes avec doublons (exercice de fusion) ;
+- bibliothèque XML de livres (exercice de conversion).
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+from xml.sax.saxutils import escape, quoteattr
+
+
+# Nombre de lignes (ou d'enregistrements) générées avant chaque écriture
+BLOCK_SIZE = 50_000
+
+LOG_LEVELS = ['INFO'] * 60 + ['DEBUG'] * 25 + ['WARNING'] * 10 + ['ERROR'] * 4 + ['CRITICAL']
+LOG_MESSAGES = [
+    "Connexion utilisateur id={}",
+    "Requête GET /api/v1/items/{} traitée en {} ms",
+    "Cache miss pour la clé session:{}",
+    "Échec d'écriture sur le disque (tentative {})",
+    "Paiement {} refusé : solde insuffisant",
+    "Délai dépassé en appelant le service auth ({} ms)",
+    "Tâche planifiée {} terminée",
+]
+LOG_SERVICES = ['app', 'api', 'auth', 'payment', 'server', 'worker', 'scheduler', 'gateway']
+
+# Valeurs inspirées de data/data.csv (formats mélangés, valeurs invalides)
+LAST_NAMES = [
+    'Dupont', 'Martin', 'Durand', 'Nguyen', 'Moreau', 'Garcia', 'Bernard', 'Rossi',
+    'Lefevre', 'Petit', "O'Neil", 'Müller', 'Smith', 'Lopez', 'Kowalski', 'Chen',
+    'Ivanov', "D'Amico", 'Ndiaye', 'Hernández', 'Öztürk', 'Sato', 'Zhang', 'Doe', '   ',
+]
+FIRST_NAMES = [
+    'Alice', 'Paul', 'Sophie', 'Minh', 'Luc', 'Elena', 'Hugo', 'Chiara', 'Emma',
+    'Thomas', 'Sean', 'Anna', 'John', 'Carlos', 'Ewa', 'Wei', 'Sergey', 'Marie',
+    'Luigi', 'Awa', 'José', 'Ahmet', 'Yuki', 'Li', 'Jane', ' ',
+]
+MISSING_VALUES = ['', ' ', 'NaN', 'NA', 'N/A', '—', '-- ']
+TRUE_VALUES = ['oui', 'OUI', 'TRUE', 'true', 'True', '1', 'yes']
+FALSE_VALUES = ['non', 'NON', 'FALSE', 'false', 'False', '0']
+CSV_HEADER = (
+    "id_client;nom;prenom;age;date_inscription;montant_total_eur;"
+    "actif;derniere_connexion;newsletter_ok;\n"
+)
+
+CATEGORIES = ['Electronics', 'Accessories', 'Books', 'Garden', 'Kitchen', 'Sports', 'Toys']
+PRODUCT_WORDS = ['Laptop', 'Mouse', 'Cable', 'Lamp', 'Chair', 'Kettle', 'Ball', 'Drone', 'Desk']
+CITIES = ['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Nice', 'Nantes', 'Lille', 'Bordeaux']
+GENRES = ['Fiction', 'Dystopie', 'Roman historique', 'Fantasy', 'Policier', 'Essai', 'Poésie']
+
+
+class Dataset(NamedTuple):
+    """Fichier(s) généré(s) et volume correspondant."""
+    path: Path
+    items: int
+    bytes: int
+
+
+def generate_logs(
+    output_dir: Path | str,
+    lines: int,
+    files: int = 8,
+    seed: int = 42,
+) -> Dataset:
+    """
+    Génère des journaux « [TIMESTAMP] LEVEL: MESSAGE » répartis sur plusieurs
+    fichiers .log, avec ~2 % de lignes de trace de pile (sans horodatage).
+    
+    Args:
+        output_dir: Répertoire des fichiers .log (créé si besoin)
+        lines: Nombre total de lignes
+        files: Nombre de fichiers
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Dataset (répertoire, nombre de lignes, taille totale)
+    """
+    rng = random.Random(seed)
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    start = datetime(2025, 1, 10)
+    total_bytes = 0
+    per_file, extra = divmod(lines, files)
+    
+    for number in range(files):
+        count = per_file + (1 if number < extra else 0)
+        day = start + timedelta(days=number)
+        name = f"{LOG_SERVICES[number % len(LOG_SERVICES)]}_{day:%Y-%m-%d}"
+        if number >= len(LOG_SERVICES):
+            name += f"_{number // len(LOG_SERVICES)}"
+        log_file = directory / f"{name}.log"
+        
+        with open(log_file, 'w', encoding='utf-8', newline='\n') as f:
+            second = 0
+            for block_start in range(0, count, BLOCK_SIZE):
+                block = []
+                for _ in range(min(BLOCK_SIZE, count - block_start)):
+                    if rng.random() < 0.02:
+                        block.append(f"    at service.handler(module.py:{rng.randint(1, 999)})")
+                        continue
+                    second += rng.randint(0, 2)
+                    stamp = day + timedelta(seconds=second)
+                    message = rng.choice(LOG_MESSAGES).format(
+                        rng.randint(1, 99_999), rng.randint(1, 5_000),
+                    )
+                    block.append(f"[{stamp:%Y-%m-%d %H:%M:%S}] {rng.choice(LOG_LEVELS)}: {message}")
+                f.write('\n'.join(block) + '\n')
+        total_bytes += log_file.stat().st_size
+    
+    return Dataset(directory, lines, total_bytes)
+
+
+def _csv_age(rng: random.Random) -> str:
+    draw = rng.random()
+    if draw < 0.85:
+        return str(rng.randint(18, 90))
+    if draw < 0.95:
+        return rng.choice(MISSING_VALUES)
+    return rng.choice(['thirty-two', 'abc', 'xx', '-5', '105', '999'])
+
+
+def _csv_date(rng: random.Random, with_time: bool) -> str:
+    draw = rng.random()
+    if draw < 0.08:
+        return rng.choice(MISSING_VALUES)
+    if draw < 0.10:
+        return rng.choice(['2023-13-01', '2020-02-30', '31/02/2021'])
+    day = datetime(2018, 1, 1) + timedelta(minutes=rng.randint(0, 7 * 365 * 24 * 60))
+    if draw < 0.20:
+        return f"{day:%Y-%m-%dT%H:%M}" if with_time else f"{day:%Y-%m-%d}"
+    return f"{day:%d/%m/%Y %H:%M}" if with_time else f"{day:%d/%m/%Y}"
+
+
+def _csv_amount(rng: random.Random) -> str:
+    draw = rng.random()
+    if draw < 0.08:
+        return rng.choice(MISSING_VALUES + ['inf'])
+    units, cents = rng.randint(0, 99_999), rng.randint(0, 99)
+    thousands, rest = divmod(units, 1000)
+    if draw < 0.40:
+        return f"{units},{cents:02d}"
+    if draw < 0.60:
+        return f"{thousands} {rest:03d},{cents:02d}" if thousands else f"{rest},{cents:02d}"
+    if draw < 0.70:
+        return f"{thousands}.{rest:03d},{cents:02d}" if thousands else f"{rest},{cents:02d}"
+    if draw < 0.80:
+        return f"{units:,}.{cents:02d}"
+    if draw < 0.90:
+        return f"€{units},{cents:02d}"
+    return str(units)
+
+
+def _csv_boolean(rng: random.Random) -> str:
+    draw = rng.random()
+    if draw < 0.45:
+        return rng.choice(TRUE_VALUES)
+    if draw < 0.90:
+        return rng.choice(FALSE_VALUES)
+    return rng.choice(MISSING_VALUES + ['T R U E'])
+
+
+def generate_clients_csv(
+    output_file: Path | str,
+    rows: int,
+    duplicate_rate: float = 0.02,
+    seed: int = 42,
+) -> Dataset:
+    """
+    Génère un export clients au format de data/data.csv : séparateur ';',
+    virgule décimale, séparateurs de milliers variés, dates jour/mois/année,
+    booléens « oui »/« non », valeurs manquantes et invalides, doublons.
+    
+    Args:
+        output_file: Fichier CSV à écrire
+        rows: Nombre de lignes de données
+        duplicate_rate: Proportion de lignes recopiant une ligne récente
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Dataset (fichier, nombre de lignes, taille)
+    """
+    rng = random.Random(seed)
+    path = Path(output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    recent: list[str] = []
+    
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(CSV_HEADER)
+        for block_start in range(0, rows, BLOCK_SIZE):
+            block = []
+            for row_id in range(block_start + 1, min(block_start + BLOCK_SIZE, rows) + 1):
+                if recent and rng.random() < duplicate_rate:
+                    block.append(rng.choice(recent))
+                    continue
+                if rng.random() < 0.005:
+                    block.append(f"{row_id};" + "   ;" * 8)
+                    continue
+                line = ';'.join((
+                    str(row_id),
+                    rng.choice(LAST_NAMES),
+                    rng.choice(FIRST_NAMES),
+                    _csv_age(rng),
+                    _csv_date(rng, with_time=False),
+                    _csv_amount(rng),
+                    _csv_boolean(rng),
+                    _csv_date(rng, with_time=True),
+                    _csv_boolean(rng),
+                )) + ';'
+                block.append(line)
+                if len(recent) < 1000:
+                    recent.append(line)
+                else:
+                    recent[rng.randrange(1000)] = line
+            f.write('\n'.join(block) + '\n')
+    
+    return Dataset(path, rows, path.stat().st_size)
+
+
+def _product(rng: random.Random, product_id: int) -> dict:
+    return {
+        "id": product_id,
+        "name": f"{rng.choice(PRODUCT_WORDS)} {rng.choice(['Pro', 'Mini', 'Max', 'Air'])} {product_id}",
+        "price": round(rng.uniform(1, 3000), 2),
+        "category": rng.choice(CATEGORIES),
+        "in_stock": rng.random() < 0.7,
+        "dimensions": {
+            "width": round(rng.uniform(1, 200), 1),
+            "height": round(rng.uniform(1, 200), 1),
+            "weight": round(rng.uniform(0.1, 50), 2),
+        },
+        "tags": rng.sample(['promo', 'new', 'eco', 'premium', 'bundle', 'refurb'], k=rng.randint(0, 3)),
+        "reviews": [
+            {"user": f"user{rng.randint(1, 99_999)}", "rating": rng.randint(1, 5)}
+            for _ in range(rng.randint(0, 3))
+        ],
+    }
+
+
+def generate_catalog_json(output_file: Path | str, products: int, seed: int = 42) -> Dataset:
+    """
+    Génère un catalogue JSON imbriqué ({"products": [...], "metadata": {...}}),
+    structuré comme mini-projet/data/data.json.
+    
+    Args:
+        output_file: Fichier JSON à écrire
+        products: Nombre de produits
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Dataset (fichier, nombre de produits, taille)
+    """
+    rng = random.Random(seed)
+    path = Path(output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n    "products": [\n')
+        for block_start in range(0, products, BLOCK_SIZE):
+            block = [
+                '        ' + json.dumps(_product(rng, product_id), ensure_ascii=False)
+                for product_id in range(block_start + 1, min(block_start + BLOCK_SIZE, products) + 1)
+            ]
+            if block_start:
+                f.write(',\n')
+            f.write(',\n'.join(block))
+        metadata = {"last_updated": "2026-01-09", "total_products": products}
+        f.write(f'\n    ],\n    "metadata": {json.dumps(metadata)}\n}}\n')
+    
+    return Dataset(path, products, path.stat().st_size)
+
+
+def _product_xml(product: dict) -> str:
+    dimensions = ''.join(
+        f"<{key}>{value}</{key}>" for key, value in product["dimensions"].items()
+    )
+    tags = ''.join(f"<tag>{tag}</tag>" for tag in product["tags"])
+    reviews = ''.join(
+        f"<review><user>{review['user']}</user><rating>{review['rating']}</rating></review>"
+        for review in product["reviews"]
+    )
+    return (
+        f'        <product id="{product["id"]}">'
+        f'<name>{escape(product["name"])}</name>'
+        f'<price>{product["price"]}</price>'
+        f'<category>{product["category"]}</category>'
+        f'<in_stock>{str(product["in_stock"]).lower()}</in_stock>'
+        f'<dimensions>{dimensions}</dimensions>'
+        f'<tags>{tags}</tags>'
+        f'<reviews>{reviews}</reviews>'
+        f'</product>'
+    )
+
+
+def generate_catalog_xml(output_file: Path | str, products: int, seed: int = 42) -> Dataset:
+    """
+    Génère le même catalogue que generate_catalog_json, au format XML de
+    mini-projet/data/data.xml.
+    
+    Args:
+        output_file: Fichier XML à écrire
+        products: Nombre de produits
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Dataset (fichier, nombre de produits, taille)
+    """
+    rng = random.Random(seed)
+    path = Path(output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<catalog>\n    <products>\n')
+        for block_start in range(0, products, BLOCK_SIZE):
+            block = [
+                _product_xml(_product(rng, product_id))
+                for product_id in range(block_start + 1, min(block_start + BLOCK_SIZE, products) + 1)
+            ]
+            f.write('\n'.join(block) + '\n')
+        f.write(
+            '    </products>\n    <metadata>\n'
+            '        <last_updated>2026-01-09</last_updated>\n'
+            f'        <total_products>{products}</total_products>\n'
+            '    </metadata>\n</catalog>\n'
+        )
+    
+    return Dataset(path, products, path.stat().st_size)
+
+
+def generate_people_json(
+    output_dir: Path | str,
+    records: int,
+    files: int = 2,
+    overlap: float = 0.2,
+    seed: int = 42,
+) -> Dataset:
+    """
+    Génère des fichiers JSON de personnes (comme exercices/data/data1.json)
+    dont une partie des identifiants se recoupe d'un fichier à l'autre.
+    
+    Args:
+        output_dir: Répertoire des fichiers data<N>.json (créé si besoin)
+        records: Nombre total d'enregistrements
+        files: Nombre de fichiers
+        overlap: Proportion d'enregistrements reprenant un identifiant du
+            fichier précédent (doublons à éliminer)
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Dataset (répertoire, nombre d'enregistrements, taille totale)
+    """
+    rng = random.Random(seed)
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    per_file = records // files
+    total_bytes = 0
+    next_id = 1
+    
+    for number in range(1, files + 1):
+        count = per_file if number < files else records - per_file * (files - 1)
+        first_id = next_id
+        people = []
+        for _ in range(count):
+            if number > 1 and rng.random() < overlap:
+                person_id = rng.randint(max(1, first_id - per_file), first_id - 1)
+            else:
+                person_id = next_id
+                next_id += 1
+            first, last = rng.choice(FIRST_NAMES).strip() or 'Anne', rng.choice(LAST_NAMES).strip() or 'Roy'
+            people.append({
+                "id": person_id,
+                "name": f"{first} {last}",
+                "email": f"{first}.{last}{person_id}@email.com".lower(),
+                "age": rng.randint(18, 90),
+                "city": rng.choice(CITIES),
+            })
+        data_file = directory / f"data{number}.json"
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump(people, f, indent=4, ensure_ascii=False)
+        total_bytes += data_file.stat().st_size
+    
+    return Dataset(directory, records, total_bytes)
+
+
+def generate_books_xml(output_file: Path | str, books: int, seed: int = 42) -> Dataset:
+    """
+    Génère une bibliothèque XML au format de exercices/data/books.xml.
+    
+    Args:
+        output_file: Fichier XML à écrire
+        books: Nombre de livres
+        seed: Graine du générateur aléatoire
+    
+    Returns:
+        Dataset (fichier, nombre de livres, taille)
+    """
+    rng = random.Random(seed)
+    path = Path(output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<library>\n')
+        for block_start in range(0, books, BLOCK_SIZE):
+            block = []
+            for book_id in range(block_start + 1, min(block_start + BLOCK_SIZE, books) + 1):
+                author = f"{rng.choice(FIRST_NAMES).strip() or 'Anne'} {rng.choice(LAST_NAMES).strip() or 'Roy'}"
+                block.append(
+                    f'    <book id={quoteattr(str(book_id))}>\n'
+                    f'        <title>{escape(rng.choice(PRODUCT_WORDS))} n°{book_id}</title>\n'
+                    f'        <author>{escape(author)}</author>\n'
+                    f'        <year>{rng.randint(1800, 2025)}</year>\n'
+                    f'        <genre>{rng.choice(GENRES)}</genre>\n'
+                    f'    </book>'
+                )
+            f.write('\n'.join(block) + '\n')
+        f.write('</library>\n')
+    
+    return Dataset(path, books, path.stat().st_size)
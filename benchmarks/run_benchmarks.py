@@ -0,0 +1,497 @@
+"""
+Suite de benchmarks des traitements des différents projets.
+
+Génère des données synthétiques réalistes (voir generators.py), chronomètre
+chaque traitement dans un processus dédié et enregistre les résultats en
+JSON : durées, débit (éléments/s et Mo/s) et mémoire résidente maximale.
+Avec --compare, les résultats sont comparés à une exécution précédente et
+le script échoue (code 1) si un traitement a ralenti ou consomme plus de
+mémoire au-delà de la tolérance.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --log-lines 10000000 --only organize_logs traiter_logs
+    python benchmarks/run_benchmarks.py --scale 0.1 --compare benchmarks/results/reference.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure de la mémoire résidente
+    resource = None
+
+from generators import (
+    Dataset,
+    generate_books_xml,
+    generate_catalog_json,
+    generate_catalog_xml,
+    generate_clients_csv,
+    generate_logs,
+    generate_people_json,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SEANCE_1 = REPO_ROOT / "Séance 1 - Environnements Python & manipulation avancée des fichiers"
+SEANCE_2 = REPO_ROOT / "Séance 2 - Traitement de données JSON et XML"
+
+# Répertoire à ajouter à sys.path pour importer chaque projet
+IMPORT_ROOTS = {
+    'projet_final': SEANCE_1 / "projet_final" / "src",
+    'projet_logs': SEANCE_1 / "projet_logs" / "src",
+    'mini-projet': SEANCE_2 / "mini-projet",
+    'exercices': SEANCE_2 / "exercices" / "src",
+}
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+MANIFEST_FILENAME = "manifest.json"
+
+
+class BenchCase(NamedTuple):
+    """Traitement chronométré et données sur lesquelles il s'exécute."""
+    name: str
+    project: str
+    function: str
+    dataset: str
+    unit: str
+    setup: Callable[[dict[str, Dataset], Path], Callable[[], object]]
+
+
+# --- Préparation des traitements (exécutée dans le processus du benchmark) ---
+
+def _setup_organize_logs(data: dict[str, Dataset], work_dir: Path, **options) -> Callable[[], object]:
+    from main import organize_logs
+    return lambda: organize_logs(data['logs'].path, work_dir, **options)
+
+
+def _setup_traiter_logs(data: dict[str, Dataset], work_dir: Path, **options) -> Callable[[], object]:
+    from projet_logs.collect_errors import traiter_logs
+    return lambda: traiter_logs(data['logs'].path, work_dir / "errors.log", **options)
+
+
+def _setup_nettoyer_csv(data: dict[str, Dataset], work_dir: Path) -> Callable[[], object]:
+    from projet_logs.parse_csv import nettoyer_csv
+    return lambda: nettoyer_csv(data['clients_csv'].path, work_dir / "clean_data.csv")
+
+
+def _setup_process_csv(data: dict[str, Dataset], work_dir: Path, **options) -> Callable[[], object]:
+    from main import process_csv
+    from utils.schema import CLIENTS_SCHEMA
+    return lambda: process_csv(data['clients_csv'].path, work_dir, schema=CLIENTS_SCHEMA, **options)
+
+
+def _setup_parse_file(data: dict[str, Dataset], work_dir: Path, dataset: str) -> Callable[[], object]:
+    from multi_parser import parse_file
+    return lambda: parse_file(data[dataset].path)
+
+
+def _setup_iter_records(data: dict[str, Dataset], work_dir: Path) -> Callable[[], object]:
+    from multi_parser import iter_records
+    return lambda: sum(1 for _ in iter_records(data['catalog_json'].path, "products"))
+
+
+def _setup_parse_many_cached(data: dict[str, Dataset], work_dir: Path) -> Callable[[], object]:
+    from multi_parser import parse_many
+    paths = [data['catalog_json'].path]
+    cache_dir = work_dir / 'parse_cache'
+    # Cache rempli hors chronométrage : seul le chargement d'un résultat en cache est mesuré
+    parse_many(paths, cache_dir=cache_dir)
+    return lambda: parse_many(paths, cache_dir=cache_dir)
+
+
+def _setup_iter_xml_records(data: dict[str, Dataset], work_dir: Path, **options) -> Callable[[], object]:
+    from multi_parser import iter_xml_records
+    return lambda: sum(1 for _ in iter_xml_records(data['catalog_xml'].path, "products/product", **options))
+
+
+def _setup_merge_datasets(data: dict[str, Dataset], work_dir: Path) -> Callable[[], object]:
+    from merge_json import load_json, merge_datasets
+    # Chargement hors chronométrage : seule la fusion est mesurée
+    datasets = [load_json(path) for path in sorted(data['people_json'].path.glob("data*.json"))]
+    return lambda: merge_datasets(datasets, key="id")
+
+
+def _setup_merge_roundtrip(data: dict[str, Dataset], work_dir: Path, backend: str) -> Callable[[], object]:
+    import json_backend
+    from merge_json import load_json, merge_datasets, save_to_json
+    json_backend.set_backend(backend)
+    paths = sorted(data['people_json'].path.glob("data*.json"))
+    output = work_dir / "merged.json"
+    
+    def roundtrip():
+        # Lecture, fusion et écriture indentée : la sérialisation domine
+        save_to_json(merge_datasets([load_json(path) for path in paths], key="id"), output)
+    return roundtrip
+
+
+def _setup_load_books(data: dict[str, Dataset], work_dir: Path) -> Callable[[], object]:
+    from xml_to_json import load_books_from_xml
+    return lambda: load_books_from_xml(data['books_xml'].path)
+
+
+CASES = {case.name: case for case in [
+    BenchCase('organize_logs', 'projet_final', 'organize_logs', 'logs', 'lignes',
+              _setup_organize_logs),
+    BenchCase('organize_logs_stream', 'projet_final', 'organize_logs(stream=True)', 'logs', 'lignes',
+              partial(_setup_organize_logs, stream=True)),
+    BenchCase('organize_logs_parallel', 'projet_final', 'organize_logs(workers=4)', 'logs', 'lignes',
+              partial(_setup_organize_logs, workers=4)),
+    BenchCase('traiter_logs', 'projet_logs', 'traiter_logs', 'logs', 'lignes',
+              _setup_traiter_logs),
+    BenchCase('traiter_logs_parallel', 'projet_logs', 'traiter_logs(workers=4)', 'logs', 'lignes',
+              partial(_setup_traiter_logs, workers=4)),
+    BenchCase('nettoyer_csv', 'projet_logs', 'nettoyer_csv', 'clients_csv', 'lignes',
+              _setup_nettoyer_csv),
+    BenchCase('process_csv', 'projet_final', 'process_csv', 'clients_csv', 'lignes',
+              _setup_process_csv),
+    BenchCase('process_csv_chunked', 'projet_final', 'process_csv(chunksize=100000)', 'clients_csv',
+              'lignes', partial(_setup_process_csv, chunksize=100_000)),
+    BenchCase('parse_file_json', 'mini-projet', 'parse_file', 'catalog_json', 'produits',
+              partial(_setup_parse_file, dataset='catalog_json')),
+    BenchCase('iter_records_json', 'mini-projet', 'iter_records', 'catalog_json', 'produits',
+              _setup_iter_records),
+    BenchCase('parse_many_cached', 'mini-projet', 'parse_many (cache)', 'catalog_json', 'produits',
+              _setup_parse_many_cached),
+    BenchCase('parse_file_xml', 'mini-projet', 'parse_file', 'catalog_xml', 'produits',
+              partial(_setup_parse_file, dataset='catalog_xml')),
+    BenchCase('iter_xml_records', 'mini-projet', 'iter_xml_records', 'catalog_xml', 'produits',
+              _setup_iter_xml_records),
+    BenchCase('iter_xml_records_inferred', 'mini-projet', 'iter_xml_records(infer_types=True)', 'catalog_xml',
+              'produits', partial(_setup_iter_xml_records, infer_types=True)),
+    BenchCase('merge_datasets', 'exercices', 'merge_datasets', 'people_json', 'enregistrements',
+              _setup_merge_datasets),
+    BenchCase('merge_roundtrip_json', 'exercices', 'load_json + merge + save_to_json (json)', 'people_json',
+              'enregistrements', partial(_setup_merge_roundtrip, backend='json')),
+    BenchCase('merge_roundtrip_orjson', 'exercices', 'load_json + merge + save_to_json (orjson)', 'people_json',
+              'enregistrements', partial(_setup_merge_roundtrip, backend='orjson')),
+    BenchCase('load_books_from_xml', 'exercices', 'load_books_from_xml', 'books_xml', 'livres',
+              _setup_load_books),
+]}
+
+
+# --- Génération des données ---
+
+def _dataset_specs(args: argparse.Namespace) -> dict[str, tuple[list, Callable[[Path], Dataset]]]:
+    """Paramètres et générateur de chaque jeu de données, selon la ligne de commande."""
+    def scaled(value: int) -> int:
+        return max(1, int(value * args.scale))
+    
+    log_lines, csv_rows = scaled(args.log_lines), scaled(args.csv_rows)
+    products, records, books = scaled(args.catalog_products), scaled(args.merge_records), scaled(args.books)
+    seed = args.seed
+    return {
+        'logs': ([log_lines, args.log_files, seed],
+                 lambda d: generate_logs(d / "logs", log_lines, args.log_files, seed=seed)),
+        'clients_csv': ([csv_rows, seed],
+                        lambda d: generate_clients_csv(d / "data.csv", csv_rows, seed=seed)),
+        'catalog_json': ([products, seed],
+                         lambda d: generate_catalog_json(d / "catalog.json", products, seed=seed)),
+        'catalog_xml': ([products, seed],
+                        lambda d: generate_catalog_xml(d / "catalog.xml", products, seed=seed)),
+        'people_json': ([records, seed],
+                        lambda d: generate_people_json(d / "people", records, seed=seed)),
+        'books_xml': ([books, seed],
+                      lambda d: generate_books_xml(d / "books.xml", books, seed=seed)),
+    }
+
+
+def prepare_datasets(names: set[str], data_dir: Path, args: argparse.Namespace) -> dict[str, Dataset]:
+    """
+    Génère les jeux de données demandés dans data_dir.
+    
+    Un jeu déjà présent (d'après le manifeste) et généré avec les mêmes
+    paramètres est réutilisé, ce qui évite de régénérer des gigaoctets de
+    journaux à chaque exécution avec --data-dir.
+    
+    Args:
+        names: Jeux de données nécessaires
+        data_dir: Répertoire des données générées
+        args: Arguments de la ligne de commande (tailles, graine)
+    
+    Returns:
+        Jeux de données par nom
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = data_dir / MANIFEST_FILENAME
+    manifest = json.loads(manifest_file.read_text(encoding='utf-8')) if manifest_file.exists() else {}
+    
+    datasets = {}
+    specs = _dataset_specs(args)
+    for name in sorted(names):
+        params, generate = specs[name]
+        entry = manifest.get(name)
+        if entry and entry['params'] == params and Path(entry['path']).exists():
+            datasets[name] = Dataset(Path(entry['path']), entry['items'], entry['bytes'])
+            print(f"♻️  {name} : réutilisé ({entry['items']:,} éléments)")
+            continue
+        
+        start = time.perf_counter()
+        dataset = generate(data_dir)
+        datasets[name] = dataset
+        manifest[name] = {
+            'params': params, 'path': str(dataset.path),
+            'items': dataset.items, 'bytes': dataset.bytes,
+        }
+        manifest_file.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        print(
+            f"🧪 {name} : {dataset.items:,} éléments, {dataset.bytes / 1e6:,.1f} Mo "
+            f"(généré en {time.perf_counter() - start:.1f} s)"
+        )
+    return datasets
+
+
+# --- Exécution ---
+
+def _peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Mémoire résidente maximale du processus (ou de ses enfants), en Mo."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss * scale / 1e6, 1)
+
+
+def _run_case(name: str, data: dict[str, Dataset], work_dir: Path, repeat: int, conn) -> None:
+    """Corps du processus de benchmark : prépare, chronomètre, renvoie les mesures."""
+    case = CASES[name]
+    sys.path.insert(0, str(IMPORT_ROOTS[case.project]))
+    try:
+        timings = []
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+            func = case.setup(data, work_dir)
+            baseline = _peak_rss_mb()
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+        conn.send({
+            'seconds': timings,
+            'baseline_rss_mb': baseline,
+            'peak_rss_mb': _peak_rss_mb(),
+            'peak_rss_children_mb': _peak_rss_mb(children=True),
+        })
+    except Exception as e:
+        conn.send({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(case: BenchCase, data: dict[str, Dataset], work_root: Path, repeat: int) -> dict:
+    """
+    Exécute un benchmark dans un processus neuf, pour que la mémoire maximale
+    mesurée soit celle de ce seul traitement.
+    
+    Args:
+        case: Benchmark à exécuter
+        data: Jeux de données générés
+        work_root: Répertoire des sorties (un sous-répertoire par benchmark)
+        repeat: Nombre d'exécutions chronométrées
+    
+    Returns:
+        Résultat du benchmark (durées, débits, mémoire ou erreur)
+    """
+    work_dir = work_root / case.name
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(case.name, data, work_dir, repeat, sender))
+    process.start()
+    sender.close()
+    try:
+        measures = receiver.recv()
+    except EOFError:
+        measures = {'error': "processus interrompu"}
+    process.join()
+    
+    dataset = data[case.dataset]
+    result = {
+        'name': case.name,
+        'project': case.project,
+        'function': case.function,
+        'dataset': case.dataset,
+        'items': dataset.items,
+        'unit': case.unit,
+        'input_bytes': dataset.bytes,
+        'repeat': repeat,
+    }
+    if 'error' in measures:
+        result['error'] = measures['error']
+        return result
+    
+    best = min(measures['seconds'])
+    result.update({
+        'seconds': [round(value, 6) for value in measures['seconds']],
+        'seconds_best': round(best, 6),
+        'seconds_median': round(statistics.median(measures['seconds']), 6),
+        'items_per_s': round(dataset.items / best, 1) if best else None,
+        'mb_per_s': round(dataset.bytes / 1e6 / best, 2) if best else None,
+        'baseline_rss_mb': measures['baseline_rss_mb'],
+        'peak_rss_mb': measures['peak_rss_mb'],
+        'peak_rss_children_mb': measures['peak_rss_children_mb'],
+    })
+    return result
+
+
+def compare_results(results: list[dict], reference_file: Path, tolerance: float) -> list[dict]:
+    """
+    Compare les résultats à ceux d'une exécution de référence.
+    
+    Args:
+        results: Résultats de l'exécution courante
+        reference_file: Fichier JSON produit par une exécution précédente
+        tolerance: Écart relatif toléré (0.15 = 15 %)
+    
+    Returns:
+        Régressions détectées (débit en baisse ou mémoire en hausse)
+    """
+    reference = {
+        result['name']: result
+        for result in json.loads(reference_file.read_text(encoding='utf-8'))['results']
+        if 'error' not in result
+    }
+    regressions = []
+    for result in results:
+        previous = reference.get(result['name'])
+        if previous is None or 'error' in result:
+            continue
+        if previous['items'] != result['items']:
+            print(f"⚠️  {result['name']} : volumes différents, comparaison ignorée")
+            continue
+        checks = [
+            ('items_per_s', result['items_per_s'] < previous['items_per_s'] * (1 - tolerance)),
+            ('peak_rss_mb', result['peak_rss_mb'] is not None and previous['peak_rss_mb'] is not None
+             and result['peak_rss_mb'] > previous['peak_rss_mb'] * (1 + tolerance)),
+        ]
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append({
+                    'name': result['name'], 'metric': metric,
+                    'reference': previous[metric], 'current': result[metric],
+                })
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks des traitements de logs, CSV, JSON et XML")
+    parser.add_argument('--log-lines', type=int, default=1_000_000, help="Nombre de lignes de journaux")
+    parser.add_argument('--log-files', type=int, default=8, help="Nombre de fichiers journaux")
+    parser.add_argument('--csv-rows', type=int, default=200_000, help="Nombre de lignes du CSV clients")
+    parser.add_argument('--catalog-products', type=int, default=100_000,
+                        help="Nombre de produits des catalogues JSON et XML")
+    parser.add_argument('--merge-records', type=int, default=500_000,
+                        help="Nombre d'enregistrements JSON à fusionner")
+    parser.add_argument('--books', type=int, default=200_000, help="Nombre de livres du XML")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Facteur appliqué à toutes les tailles (ex. 0.01 pour un essai rapide)")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des générateurs")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'exécutions par benchmark")
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), metavar='NOM',
+                        help=f"Benchmarks à exécuter (parmi : {', '.join(CASES)})")
+    parser.add_argument('--data-dir', type=Path,
+                        help="Répertoire des données générées, conservées et réutilisées "
+                             "(par défaut : répertoire temporaire supprimé à la fin)")
+    parser.add_argument('--output', type=Path,
+                        help="Fichier JSON des résultats (par défaut : benchmarks/results/bench_<date>.json)")
+    parser.add_argument('--compare', type=Path, help="Résultats de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Écart relatif toléré par --compare (défaut : 0.15)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    cases = [CASES[name] for name in args.only] if args.only else list(CASES.values())
+    
+    temporary = None
+    data_dir = args.data_dir
+    if data_dir is None:
+        temporary = tempfile.TemporaryDirectory(prefix="bench_data_")
+        data_dir = Path(temporary.name)
+    
+    try:
+        print("=" * 60)
+        print("⏱️  BENCHMARKS")
+        print("=" * 60)
+        data = prepare_datasets({case.dataset for case in cases}, data_dir, args)
+        
+        results = []
+        with tempfile.TemporaryDirectory(prefix="bench_work_") as work_root:
+            for case in cases:
+                print(f"\n▶️  {case.name} ({case.project})")
+                result = run_case(case, data, Path(work_root), args.repeat)
+                results.append(result)
+                if 'error' in result:
+                    print(f"   ❌ {result['error']}")
+                    continue
+                print(
+                    f"   {result['seconds_best']:.3f} s  |  {result['items_per_s']:,.0f} {case.unit}/s  |  "
+                    f"{result['mb_per_s']:,.1f} Mo/s  |  pic mémoire {result['peak_rss_mb']} Mo"
+                )
+    finally:
+        if temporary is not None:
+            temporary.cleanup()
+    
+    regressions = compare_results(results, args.compare, args.tolerance) if args.compare else []
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+        'regressions': regressions,
+    }
+    output = args.output or RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    print(f"\n💾 Résultats : {output}")
+    
+    for regression in regressions:
+        print(
+            f"📉 Régression {regression['name']} ({regression['metric']}) : "
+            f"{regression['reference']} → {regression['current']}"
+        )
+    failed = [result['name'] for result in results if 'error' in result]
+    if failed:
+        print(f"❌ Échec : {', '.join(failed)}")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())